@@ -1,7 +1,14 @@
+import os
+import sys
 import pygame
 import button
 import pickle
 
+# El formato de niveles vive en el paquete del juego
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from src.world.level_format import Level, LevelFile, level_from_text, save_level
+from src.graphics.asset_loader import AssetLoader
+
 pygame.init()
 
 clock = pygame.time.Clock()
@@ -28,21 +35,30 @@ scroll_right = False
 scroll = 0
 scroll_speed = 1
 
-# load images
-pine1_img = pygame.image.load('img/Background/pine1.png').convert_alpha()
-pine2_img = pygame.image.load('img/Background/pine2.png').convert_alpha()
-mountain_img = pygame.image.load('img/Background/mountain.png').convert_alpha()
-sky_img = pygame.image.load('img/Background/sky_cloud.png').convert_alpha()
+# load images (se decodifican en paralelo y se convierten aquí)
+loader = AssetLoader()
+pine1_future = loader.load_async('img/Background/pine1.png')
+pine2_future = loader.load_async('img/Background/pine2.png')
+mountain_future = loader.load_async('img/Background/mountain.png')
+sky_future = loader.load_async('img/Background/sky_cloud.png')
+tile_futures = loader.load_all(f'img/tile/{x}.png' for x in range(TILE_TYPES))
+save_future = loader.load_async('img/save_btn.png')
+load_future = loader.load_async('img/load_btn.png')
+loader.wait()
+
+pine1_img = pine1_future.result()
+pine2_img = pine2_future.result()
+mountain_img = mountain_future.result()
+sky_img = sky_future.result()
 
 # store tiles in a list
 img_list = []
-for x in range(TILE_TYPES):
-    img = pygame.image.load(f'img/tile/{x}.png').convert_alpha()
-    img = pygame.transform.scale(img, (TILE_SIZE, TILE_SIZE))
+for future in tile_futures:
+    img = pygame.transform.scale(future.result(), (TILE_SIZE, TILE_SIZE))
     img_list.append(img)
 
-save_img = pygame.image.load('img/save_btn.png').convert_alpha()
-load_img = pygame.image.load('img/load_btn.png').convert_alpha()
+save_img = save_future.result()
+load_img = load_future.result()
 
 # define colours
 GREEN = (144, 201, 120)
@@ -53,45 +69,110 @@ RED = (200, 25, 25)
 font = pygame.font.SysFont('Futura', 30)
 
 # create empty tile list
-world_data = []
-for row in range(ROWS):
-    r = [0] * MAX_COLS  # Cambia -1 a 0
-    world_data.append(r)
+def create_world(cols):
+    data = []
+    for row in range(ROWS):
+        r = [0] * cols  # Cambia -1 a 0
+        data.append(r)
+
+    # create ground
+    for tile in range(0, cols):
+        data[ROWS - 1][tile] = 3  # Cambia 2 a 0
+    return data
 
-# create ground
-for tile in range(0, MAX_COLS):
-    world_data[ROWS - 1][tile] = 3  # Cambia 2 a 0
+world_data = create_world(MAX_COLS)
 
 # function for outputting text onto the screen
 def draw_text(text, font, text_col, x, y):
     img = font.render(text, True, text_col)
     screen.blit(img, (x, y))
 
+# columnas de tiles visibles con el scroll actual (solo se dibujan esas)
+def visible_columns():
+    first = max(0, scroll // TILE_SIZE)
+    last = min(MAX_COLS, (scroll + SCREEN_WIDTH) // TILE_SIZE + 1)
+    return first, last
+
+# fondo ya compuesto en una sola superficie que se reutiliza; solo se
+# recompone (en el sitio) si cambia el scroll o el tamaño de la pantalla
+bg_cache = {'key': None, 'surface': None}
+
 # create function for drawing background
 def draw_bg():
-    screen.fill(GREEN)
+    size = screen.get_size()
+    key = (scroll, size)
+    if bg_cache['key'] != key:
+        surface = bg_cache['surface']
+        if surface is None or surface.get_size() != size:
+            surface = bg_cache['surface'] = pygame.Surface(size).convert()
+        bg_cache['key'] = key
+        compose_bg(surface)
+    screen.blit(bg_cache['surface'], (0, 0))
+
+def compose_bg(surface):
+    surface.fill(GREEN)
+    screen_width = surface.get_width()
     width = sky_img.get_width()
+    layers = ((sky_img, 0.5, 0),
+              (mountain_img, 0.6, SCREEN_HEIGHT - mountain_img.get_height() - 300),
+              (pine1_img, 0.7, SCREEN_HEIGHT - pine1_img.get_height() - 150),
+              (pine2_img, 0.8, SCREEN_HEIGHT - pine2_img.get_height()))
     for x in range(4):
-        screen.blit(sky_img, ((x * width) - scroll * 0.5, 0))
-        screen.blit(mountain_img, ((x * width) - scroll * 0.6, SCREEN_HEIGHT - mountain_img.get_height() - 300))
-        screen.blit(pine1_img, ((x * width) - scroll * 0.7, SCREEN_HEIGHT - pine1_img.get_height() - 150))
-        screen.blit(pine2_img, ((x * width) - scroll * 0.8, SCREEN_HEIGHT - pine2_img.get_height()))
+        for img, factor, y in layers:
+            # solo las copias que caen dentro de la pantalla
+            left = (x * width) - scroll * factor
+            if left < screen_width and left + img.get_width() > 0:
+                surface.blit(img, (left, y))
+    return surface
+
+# rejilla de una pantalla más una columna; se desplaza según el scroll
+grid_cache = {'key': None, 'surface': None}
 
 # draw grid
 def draw_grid():
+    key = (SCREEN_WIDTH, SCREEN_HEIGHT, TILE_SIZE)
+    if grid_cache['key'] != key:
+        grid_cache['key'] = key
+        grid_cache['surface'] = compose_grid()
+    # no hay líneas antes de la columna 0 ni después de la última
+    left = max(0, -scroll)
+    right = min(SCREEN_WIDTH, MAX_COLS * TILE_SIZE - scroll) + 1
+    if right <= left:
+        return
+    offset = scroll % TILE_SIZE
+    area = pygame.Rect(left + offset, 0, right - left, SCREEN_HEIGHT + 1)
+    screen.blit(grid_cache['surface'], (left, 0), area)
+
+def compose_grid():
+    width = SCREEN_WIDTH + 2 * TILE_SIZE + 1
+    surface = pygame.Surface((width, SCREEN_HEIGHT + 1)).convert()
+    surface.set_colorkey((0, 0, 0))
+    surface.fill((0, 0, 0))
     # vertical lines
-    for c in range(MAX_COLS + 1):
-        pygame.draw.line(screen, WHITE, (c * TILE_SIZE - scroll, 0), (c * TILE_SIZE - scroll, SCREEN_HEIGHT))
+    for c in range(width // TILE_SIZE + 1):
+        pygame.draw.line(surface, WHITE, (c * TILE_SIZE, 0), (c * TILE_SIZE, SCREEN_HEIGHT))
     # horizontal lines
     for c in range(ROWS + 1):
-        pygame.draw.line(screen, WHITE, (0, c * TILE_SIZE), (SCREEN_WIDTH, c * TILE_SIZE))
+        pygame.draw.line(surface, WHITE, (0, c * TILE_SIZE), (width, c * TILE_SIZE))
+    return surface
 
 # function for drawing the world tiles
 def draw_world():
+    first, last = visible_columns()
+    blits = []
     for y, row in enumerate(world_data):
-        for x, tile in enumerate(row):
+        for x in range(first, last):
+            tile = row[x]
             if tile >= 0 and tile < len(img_list):  # Asegura que el índice esté en el rango
-                screen.blit(img_list[tile], (x * TILE_SIZE - scroll, y * TILE_SIZE))
+                blits.append((img_list[tile], (x * TILE_SIZE - scroll, y * TILE_SIZE)))
+    screen.blits(blits, doreturn=False)
+
+# copia un Level en world_data; lo que no cubre el nivel queda vacío
+def load_world(level_in):
+    rows = level_in.rows()
+    for y in range(ROWS):
+        row = next(rows, []) if y < level_in.height else []
+        world_data[y] = (row + [0] * MAX_COLS)[:MAX_COLS]
 
 # create buttons
 save_button = button.Button(SCREEN_WIDTH // 2, SCREEN_HEIGHT + LOWER_MARGIN - 50, save_img, 1)
@@ -108,91 +189,101 @@ for i in range(len(img_list)):
         button_row += 1
         button_col = 0
 
-run = True
-while run:
-    clock.tick(FPS)
-
-    draw_bg()
-    draw_grid()
-    draw_world()
-
-    draw_text(f'Level: {level}', font, WHITE, 10, SCREEN_HEIGHT + LOWER_MARGIN - 90)
-    draw_text('Press UP or DOWN to change level', font, WHITE, 10, SCREEN_HEIGHT + LOWER_MARGIN - 60)
-
-    # save and load data
-    if save_button.draw(screen):
-        # save level data
-        with open(f'map.txt', 'w') as txtfile:
-            for row in world_data:
-                txtfile.write(''.join(map(str, row)) + '\n')
-
-    if load_button.draw(screen):
-        # load in level data
-        # reset scroll back to the start of the level
-        scroll = 0
-        with open(f'map.txt', 'r') as txtfile:
-            for x, line in enumerate(txtfile):
-                world_data[x] = list(map(int, line.strip()))
-
-    # draw tile panel and tiles
-    pygame.draw.rect(screen, GREEN, (SCREEN_WIDTH, 0, SIDE_MARGIN, SCREEN_HEIGHT))
-
-    # choose a tile
-    button_count = 0
-    for button_count, i in enumerate(button_list):
-        if i.draw(screen):
-            current_tile = button_count
-
-    # highlight the selected tile
-    pygame.draw.rect(screen, RED, button_list[current_tile].rect, 3)
-
-    # scroll the map
-    if scroll_left and scroll > 0:
-        scroll -= 5 * scroll_speed
-    if scroll_right and scroll < (MAX_COLS * TILE_SIZE) - SCREEN_WIDTH:
-        scroll += 5 * scroll_speed
-
-    # add new tiles to the screen
-    # get mouse position
-    pos = pygame.mouse.get_pos()
-    x = (pos[0] + scroll) // TILE_SIZE
-    y = pos[1] // TILE_SIZE
-
-    # check that the coordinates are within the tile area
-    if pos[0] < SCREEN_WIDTH and pos[1] < SCREEN_HEIGHT:
-        # check if x and y are within valid range
-        if 0 <= x < MAX_COLS and 0 <= y < ROWS:
-            # update tile value
-            if pygame.mouse.get_pressed()[0] == 1:
-                if world_data[y][x] != current_tile:
-                    world_data[y][x] = current_tile
-            if pygame.mouse.get_pressed()[2] == 1:
-                world_data[y][x] = 0  # Cambia -1 a 0
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            run = False
-        # keyboard presses
-        if event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_UP:
-                level += 1
-            if event.key == pygame.K_DOWN and level > 0:
-                level -= 1
-            if event.key == pygame.K_LEFT:
-                scroll_left = True
-            if event.key == pygame.K_RIGHT:
-                scroll_right = True
-            if event.key == pygame.K_RSHIFT:
-                scroll_speed = 5
-
-        if event.type == pygame.KEYUP:
-            if event.key == pygame.K_LEFT:
-                scroll_left = False
-            if event.key == pygame.K_RIGHT:
-                scroll_right = False
-            if event.key == pygame.K_RSHIFT:
-                scroll_speed = 1
-
-    pygame.display.update()
-
-pygame.quit()
-
+def main():
+    global level, current_tile, scroll_left, scroll_right, scroll, scroll_speed
+    run = True
+    while run:
+        clock.tick(FPS)
+
+        draw_bg()
+        draw_grid()
+        draw_world()
+
+        draw_text(f'Level: {level}', font, WHITE, 10, SCREEN_HEIGHT + LOWER_MARGIN - 90)
+        draw_text('Press UP or DOWN to change level', font, WHITE, 10, SCREEN_HEIGHT + LOWER_MARGIN - 60)
+
+        # save and load data
+        if save_button.draw(screen):
+            # save level data (binario: admite ids de tile de más de una cifra)
+            level_out = Level(MAX_COLS, ROWS)
+            for y, row in enumerate(world_data):
+                for x, tile in enumerate(row):
+                    level_out.set_tile(x, y, tile)
+            save_level(level_out, f'level{level}.lvl')
+
+        if load_button.draw(screen):
+            # load in level data
+            # reset scroll back to the start of the level
+            scroll = 0
+            if os.path.exists(f'level{level}.lvl'):
+                # los tiles se copian a world_data, así que el mmap se cierra al terminar
+                with LevelFile(f'level{level}.lvl') as level_file:
+                    load_world(level_file.to_level())
+            else:
+                # Niveles antiguos guardados como texto
+                load_world(level_from_text('map.txt'))
+
+        # draw tile panel and tiles
+        pygame.draw.rect(screen, GREEN, (SCREEN_WIDTH, 0, SIDE_MARGIN, SCREEN_HEIGHT))
+
+        # choose a tile
+        button_count = 0
+        for button_count, i in enumerate(button_list):
+            if i.draw(screen):
+                current_tile = button_count
+
+        # highlight the selected tile
+        pygame.draw.rect(screen, RED, button_list[current_tile].rect, 3)
+
+        # scroll the map
+        if scroll_left and scroll > 0:
+            scroll -= 5 * scroll_speed
+        if scroll_right and scroll < (MAX_COLS * TILE_SIZE) - SCREEN_WIDTH:
+            scroll += 5 * scroll_speed
+
+        # add new tiles to the screen
+        # get mouse position
+        pos = pygame.mouse.get_pos()
+        x = (pos[0] + scroll) // TILE_SIZE
+        y = pos[1] // TILE_SIZE
+
+        # check that the coordinates are within the tile area
+        if pos[0] < SCREEN_WIDTH and pos[1] < SCREEN_HEIGHT:
+            # check if x and y are within valid range
+            if 0 <= x < MAX_COLS and 0 <= y < ROWS:
+                # update tile value
+                if pygame.mouse.get_pressed()[0] == 1:
+                    if world_data[y][x] != current_tile:
+                        world_data[y][x] = current_tile
+                if pygame.mouse.get_pressed()[2] == 1:
+                    world_data[y][x] = 0  # Cambia -1 a 0
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                run = False
+            # keyboard presses
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_UP:
+                    level += 1
+                if event.key == pygame.K_DOWN and level > 0:
+                    level -= 1
+                if event.key == pygame.K_LEFT:
+                    scroll_left = True
+                if event.key == pygame.K_RIGHT:
+                    scroll_right = True
+                if event.key == pygame.K_RSHIFT:
+                    scroll_speed = 5
+
+            if event.type == pygame.KEYUP:
+                if event.key == pygame.K_LEFT:
+                    scroll_left = False
+                if event.key == pygame.K_RIGHT:
+                    scroll_right = False
+                if event.key == pygame.K_RSHIFT:
+                    scroll_speed = 1
+
+        pygame.display.update()
+
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
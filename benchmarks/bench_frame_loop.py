@@ -0,0 +1,265 @@
+"""Benchmark sin ventana del bucle de frame de Game.
+
+Arranca Game con los drivers SDL "dummy" de vídeo y audio, genera mapas
+sintéticos de varios tamaños, añade widgets y entidades, ejecuta un número fijo
+de frames con entrada simulada y mide cada fase (eventos, update, render y
+present). El resultado se puede guardar en JSON y comparar con una ejecución
+anterior para detectar regresiones en CI.
+
+Uso:
+    python benchmarks/bench_frame_loop.py --frames 300 --output bench.json
+    python benchmarks/bench_frame_loop.py --baseline bench.json --threshold 0.2
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+# Las rutas de los recursos son relativas a la raíz del proyecto
+os.chdir(ROOT)
+
+import pygame
+from src.core.game import Game
+from src.core.game_object import GameObject
+from src.graphics.particles import ParticleEmitter
+from src.graphics.renderer import ScaleMode
+from src.graphics.UI.button import Button
+from src.graphics.UI.label import Label
+
+DEFAULT_SIZES = ["100x12", "1500x12", "5000x50"]
+PHASES = ("events", "update", "render", "present", "frame")
+
+def parse_size(text):
+    cols, rows = text.lower().split("x")
+    return int(cols), int(rows)
+
+def generate_map(path, cols, rows, seed=0):
+    """Mapa sintético: suelo continuo, plataformas y columnas al azar"""
+    rng = random.Random(seed)
+    grid = [["0"] * cols for _ in range(rows)]
+    for col in range(cols):
+        grid[rows - 1][col] = "3"
+    for _ in range(cols // 8):
+        row = rng.randrange(max(1, rows - 1))
+        start = rng.randrange(cols)
+        for col in range(start, min(cols, start + rng.randint(2, 6))):
+            grid[row][col] = rng.choice("12")
+    with open(path, "w") as file:
+        for row in grid:
+            file.write("".join(row) + "\n")
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+def summarize(samples):
+    """p50/p95/p99/media en milisegundos"""
+    values = sorted(samples)
+    return {
+        "p50": percentile(values, 0.50) * 1000,
+        "p95": percentile(values, 0.95) * 1000,
+        "p99": percentile(values, 0.99) * 1000,
+        "mean": (sum(values) / len(values)) * 1000 if values else 0.0,
+    }
+
+def scripted_events(frame, size):
+    """Entrada simulada: el ratón recorre la ventana, clics y teclas periódicas"""
+    width, height = size
+    x = (frame * 7) % width
+    y = (frame * 3) % height
+    events = [pygame.event.Event(pygame.MOUSEMOTION, pos=(x, y), rel=(7, 3), buttons=(0, 0, 0))]
+    if frame % 30 == 0:
+        events.append(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=(x, y), button=1))
+        events.append(pygame.event.Event(pygame.MOUSEBUTTONUP, pos=(x, y), button=1))
+    if frame % 10 == 0:
+        events.append(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_a, unicode="a", mod=0, scancode=0))
+    return events
+
+def run_scenario(map_path, frames, widgets, entities, scale_mode, dirty_rects, seed=0, profile=False,
+                 streaming=False, ecs=False, particles=0):
+    game = Game(world_data=map_path)
+    game.streaming_world = streaming
+    game.profiler.reset()
+    game.profiler.set_enabled(profile)
+    game.renderer.set_scale_mode(scale_mode)
+    game.renderer.dirty_rects = dirty_rects
+
+    start = time.perf_counter()
+    game.build_world()
+    build_time = time.perf_counter() - start
+
+    rng = random.Random(seed)
+    for i in range(widgets):
+        position = (rng.randrange(0, 700), rng.randrange(0, 560))
+        if i % 2:
+            game.renderer.add(Button(position, (80, 30), f"B{i}", (40, 40, 160)))
+        else:
+            game.renderer.add(Label(f"L{i}: ", position, font_size=20,
+                                    variable=lambda i=i: game.tick_count + i, update_interval=0))
+
+    level = game.tilemap.get_pixel_rect()
+    movers = []
+    for _ in range(entities if not ecs else 0):
+        entity = GameObject((rng.uniform(level.left, level.right), rng.uniform(level.top, level.bottom)),
+                            (rng.randrange(256), rng.randrange(256), rng.randrange(256)), size=(16, 16))
+        game.spawn_entity(entity)
+        movers.append((entity, rng.uniform(-2, 2), rng.uniform(-2, 2)))
+    if ecs:
+        # Las mismas entidades en el almacén de arrays; las mueve movement_system
+        for _ in range(entities):
+            game.spawn_batch_entity(
+                (rng.uniform(level.left, level.right), rng.uniform(level.top, level.bottom)),
+                (rng.randrange(256), rng.randrange(256), rng.randrange(256)), size=(16, 16),
+                velocity=(rng.uniform(-2, 2) / game.fixed_dt, rng.uniform(-2, 2) / game.fixed_dt))
+
+    if particles:
+        # Emisor continuo que mantiene unas particles partículas vivas
+        lifetime = 1.0
+        emitter = ParticleEmitter(level.center, (400, 300), rate=particles / lifetime,
+                                  lifetime=(lifetime * 0.5, lifetime * 1.5), gravity=100,
+                                  capacity=particles * 2, z_index=2, seed=seed)
+        game.renderer.add(emitter)
+
+    def move_entities(dt):
+        for entity, dx, dy in movers:
+            x, y = entity.position
+            entity.position = (x + dx, y + dy)
+
+    update = game.update
+    def scripted_update(dt):
+        update(dt)
+        move_entities(dt)
+        # La cámara recorre el nivel para ejercitar el culling
+        camera = game.renderer.camera
+        camera.position = (camera.position[0] + 4, camera.position[1])
+        if camera.get_view_rect().right >= level.right:
+            camera.position = (level.left, camera.position[1])
+            camera.snap()
+    game.update = scripted_update
+
+    timings = {phase: [] for phase in PHASES}
+    window_size = game.screen.get_size()
+    for frame in range(frames):
+        for event in scripted_events(frame, window_size):
+            pygame.event.post(event)
+
+        frame_start = time.perf_counter()
+        game._handle_pygame_events()
+        game.renderer.update_ui()
+        events_end = time.perf_counter()
+        game.step()
+        update_end = time.perf_counter()
+        dirty = game.draw()
+        render_end = time.perf_counter()
+        game.present(dirty)
+        present_end = time.perf_counter()
+
+        timings["events"].append(events_end - frame_start)
+        timings["update"].append(update_end - events_end)
+        timings["render"].append(render_end - update_end)
+        timings["present"].append(present_end - render_end)
+        timings["frame"].append(present_end - frame_start)
+        game.profiler.end_frame()
+
+    close = getattr(game.tilemap, "close", None)
+    if close is not None:
+        close()
+    pygame.quit()
+    result = {phase: summarize(values) for phase, values in timings.items()}
+    result["build_ms"] = build_time * 1000
+    if profile:
+        # Desglose por ámbito del profiler (capas, escalado, flip...)
+        result["scopes"] = {name: game.profiler.stats(name) for name in game.profiler.names()}
+    return result
+
+def compare(results, baseline, threshold):
+    """Devuelve las fases cuyo p95 empeoró más de threshold respecto a la base"""
+    regressions = []
+    for name, scenario in results["scenarios"].items():
+        base = baseline.get("scenarios", {}).get(name)
+        if base is None:
+            continue
+        for phase in PHASES:
+            old, new = base[phase]["p95"], scenario[phase]["p95"]
+            if old > 0 and (new - old) / old > threshold:
+                regressions.append(f"{name} {phase}: p95 {old:.3f} ms -> {new:.3f} ms")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark headless del bucle de frame")
+    parser.add_argument("--sizes", nargs="+", default=DEFAULT_SIZES,
+                        help="tamaños de mapa COLUMNASxFILAS")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--widgets", type=int, default=20)
+    parser.add_argument("--entities", type=int, default=200)
+    parser.add_argument("--scale-mode", default=ScaleMode.SMOOTH.value,
+                        choices=[mode.value for mode in ScaleMode])
+    parser.add_argument("--dirty-rects", action="store_true")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--streaming", action="store_true",
+                        help="carga los chunks del mundo por streaming alrededor de la cámara")
+    parser.add_argument("--ecs", action="store_true",
+                        help="crea las entidades en el almacén de arrays (EntityStore)")
+    parser.add_argument("--particles", type=int, default=0,
+                        help="partículas vivas aproximadas de un ParticleEmitter")
+    parser.add_argument("--profile", action="store_true",
+                        help="activa el profiler y guarda el desglose por ámbito")
+    parser.add_argument("--output", help="guarda el resultado en este archivo JSON")
+    parser.add_argument("--baseline", help="JSON de una ejecución anterior para comparar")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="empeoramiento relativo del p95 que se considera regresión")
+    args = parser.parse_args(argv)
+
+    results = {
+        "config": {
+            "frames": args.frames,
+            "widgets": args.widgets,
+            "entities": args.entities,
+            "scale_mode": args.scale_mode,
+            "dirty_rects": args.dirty_rects,
+            "seed": args.seed,
+            "profile": args.profile,
+            "streaming": args.streaming,
+            "ecs": args.ecs,
+            "particles": args.particles,
+        },
+        "scenarios": {},
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            cols, rows = parse_size(size)
+            map_path = os.path.join(tmp, f"map_{cols}x{rows}.txt")
+            generate_map(map_path, cols, rows, args.seed)
+            scenario = run_scenario(map_path, args.frames, args.widgets, args.entities,
+                                    ScaleMode(args.scale_mode), args.dirty_rects, args.seed,
+                                    args.profile, args.streaming, args.ecs, args.particles)
+            results["scenarios"][size] = scenario
+            print(f"{size:>10}  build {scenario['build_ms']:8.2f} ms  " + "  ".join(
+                f"{phase} p50/p95/p99 {scenario[phase]['p50']:.2f}/{scenario[phase]['p95']:.2f}/"
+                f"{scenario[phase]['p99']:.2f}" for phase in PHASES))
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        regressions = compare(results, baseline, args.threshold)
+        for line in regressions:
+            print(f"REGRESIÓN {line}")
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+"""Benchmark sin ventana del dibujado del editor de niveles.
+
+Carga LevelCreator/level_editor_tut.py con el driver SDL "dummy", cambia
+MAX_COLS a cada tamaño pedido y mide el frame de dibujado (fondo, rejilla,
+tiles y panel) mientras el nivel se recorre con scroll y con el scroll
+quieto. Con el culling por columnas y las superficies en caché el tiempo
+debe mantenerse plano aunque el nivel tenga decenas de miles de columnas.
+
+Uso:
+    python benchmarks/bench_level_editor.py --cols 1500 10000 20000 --output editor.json
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from bench_frame_loop import ROOT, summarize
+
+EDITOR_DIR = os.path.join(ROOT, "LevelCreator")
+sys.path.insert(0, EDITOR_DIR)
+# Las imágenes del editor son relativas a su carpeta
+os.chdir(EDITOR_DIR)
+
+import pygame
+import level_editor_tut as editor
+
+DEFAULT_COLS = [1500, 5000, 10000, 20000]
+
+def draw_frame():
+    editor.draw_bg()
+    editor.draw_grid()
+    editor.draw_world()
+    pygame.draw.rect(editor.screen, editor.GREEN,
+                     (editor.SCREEN_WIDTH, 0, editor.SIDE_MARGIN, editor.SCREEN_HEIGHT))
+
+def run_scenario(cols, frames):
+    editor.MAX_COLS = cols
+    editor.world_data = editor.create_world(cols)
+    max_scroll = cols * editor.TILE_SIZE - editor.SCREEN_WIDTH
+    timings = {"scrolling": [], "idle": []}
+    for phase in timings:
+        # Se empieza a mitad del nivel para no medir solo el principio
+        editor.scroll = max_scroll // 2
+        for _ in range(frames):
+            if phase == "scrolling":
+                editor.scroll = min(max_scroll, editor.scroll + 25)
+            start = time.perf_counter()
+            draw_frame()
+            timings[phase].append(time.perf_counter() - start)
+    return {phase: summarize(values) for phase, values in timings.items()}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark del dibujado del editor de niveles")
+    parser.add_argument("--cols", nargs="+", type=int, default=DEFAULT_COLS,
+                        help="valores de MAX_COLS a medir")
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--output", help="guarda el resultado en este archivo JSON")
+    args = parser.parse_args(argv)
+
+    results = {"config": {"frames": args.frames}, "scenarios": {}}
+    for cols in args.cols:
+        scenario = run_scenario(cols, args.frames)
+        results["scenarios"][str(cols)] = scenario
+        print(f"{cols:>8} cols  " + "  ".join(
+            f"{phase} p50/p95 {scenario[phase]['p50']:.2f}/{scenario[phase]['p95']:.2f} ms"
+            for phase in scenario))
+    pygame.quit()
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1 +1,50 @@
-CLOCK = 0
\ No newline at end of file
+CLOCK = 0
+
+# Presupuesto en bytes de la caché de texturas (AssetManager)
+ASSET_CACHE_BUDGET = 64 * 1024 * 1024
+
+# Modo de escalado de salida: "smooth", "nearest", "integer" o "native"
+SCALE_MODE = "smooth"
+
+# Simulación a paso fijo (Game.run)
+SIMULATION_HZ = 120
+# Máximo de pasos de simulación por frame para ponerse al día
+MAX_CATCH_UP_STEPS = 5
+# Máximo de frames seguidos sin renderizar cuando la simulación va atrasada
+MAX_FRAME_SKIP = 5
+# Tiempo máximo (s) de un frame que se acumula; evita la "espiral de la muerte"
+MAX_FRAME_TIME = 0.25
+
+# Profiler por fases (F3 muestra el overlay, F4 graba una traza de Chrome)
+PROFILER_ENABLED = False
+# Frames que se guardan en los histogramas de cada ámbito
+PROFILER_HISTORY = 240
+# Máximo de eventos guardados para la traza (los más antiguos se descartan)
+PROFILER_MAX_TRACE_EVENTS = 200000
+PROFILER_TRACE_PATH = "profile_trace.json"
+
+# Mundo por streaming: los chunks se hornean en segundo plano alrededor de la cámara
+WORLD_STREAMING = False
+# Chunks alrededor de la vista que se cargan por adelantado
+STREAM_PREFETCH_RADIUS = 2
+# Memoria máxima (bytes) de los chunks horneados residentes
+STREAM_MEMORY_BUDGET = 32 * 1024 * 1024
+
+# Hilos que decodifican imágenes en segundo plano (AssetLoader)
+ASSET_LOADER_WORKERS = 4
+
+# Atlas de texturas (se reconstruye solo si cambian las imágenes de origen)
+USE_TEXTURE_ATLAS = True
+ATLAS_SOURCE_DIR = "./assets/textures"
+ATLAS_OUTPUT_DIR = "./assets/atlas"
+ATLAS_PAGE_SIZE = 1024
+
+# Caché de sprites rotados/escalados (GameObject)
+TRANSFORM_CACHE_BUDGET = 16 * 1024 * 1024
+# Los ángulos se redondean a múltiplos de este paso en grados (0 = sin redondeo)
+TRANSFORM_ANGLE_STEP = 1.0
+
+# Partículas (ParticleEmitter)
+PARTICLE_CAPACITY = 20000
+# Niveles de transparencia pre-renderizados con que se desvanecen
+PARTICLE_FADE_STEPS = 8
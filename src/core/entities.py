@@ -0,0 +1,420 @@
+"""Almacenamiento de entidades por componentes en arrays de NumPy.
+
+Pensado para miles de enemigos, proyectiles o restos: cada componente
+(posición, velocidad, tamaño, escala, rotación, flags) es un array contiguo
+indexado por id de entidad, los sistemas los actualizan en lotes vectorizados
+y una única EntityLayer las dibuja todas. EntityObject ofrece la interfaz de
+GameObject sobre una entidad del almacén para el código que trabaja con
+objetos sueltos.
+"""
+import math
+import numpy as np
+import pygame
+from typing import Callable, List, Optional, Tuple, Union
+from ..graphics.renderable import Renderable
+from ..graphics.asset_manager import get_asset_manager
+from ..graphics.transform_cache import get_transform_cache
+
+ALIVE = 1
+VISIBLE = 2
+# La entidad tiene sprite (sin visual no hay nada que dibujar)
+HAS_SPRITE = 4
+# Las que se dibujan tienen los tres flags
+DRAWN = ALIVE | VISIBLE | HAS_SPRITE
+
+Visual = Union[str, pygame.Surface, Tuple[int, ...], None]
+System = Callable[['EntityStore', float], None]
+
+class EntityStore:
+    """Componentes de las entidades en arrays contiguos.
+
+    Los ids son posiciones en los arrays; los de entidades destruidas se
+    reutilizan y generation permite detectar referencias a una entidad vieja.
+    Solo visual y sprite (la superficie ya escalada) son listas de Python.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self.capacity = 0
+        # Los ids en uso están en [0, count)
+        self.count = 0
+        self.render_scale = 1.0
+        # Sube al crear o destruir entidades y al cambiar sus sprites
+        self.revision = 0
+        self._free: List[int] = []
+        self.systems: List[System] = [movement_system]
+        # float32: precisión de sobra para coordenadas en píxeles y la mitad de memoria
+        self.position = np.zeros((0, 2), dtype=np.float32)
+        self.previous = np.zeros((0, 2), dtype=np.float32)
+        self.velocity = np.zeros((0, 2), dtype=np.float32)
+        self.size = np.zeros((0, 2), dtype=np.float32)
+        self.scale = np.ones((0, 2), dtype=np.float32)
+        self.rotation = np.zeros(0, dtype=np.float32)
+        # Mitad del tamaño del sprite en píxeles de salida, para centrarlo
+        self.half = np.zeros((0, 2), dtype=np.float32)
+        self.flags = np.zeros(0, dtype=np.uint8)
+        self.generation = np.zeros(0, dtype=np.uint32)
+        self.visual: List[Visual] = []
+        self.sprite: List[Optional[pygame.Surface]] = []
+        self._grow(capacity)
+
+    def _grow(self, capacity: int) -> None:
+        capacity = max(capacity, 16)
+        if capacity <= self.capacity:
+            return
+        def resized(array: np.ndarray, fill: float = 0) -> np.ndarray:
+            new = np.full((capacity,) + array.shape[1:], fill, dtype=array.dtype)
+            new[:self.capacity] = array
+            return new
+        self.position = resized(self.position)
+        self.previous = resized(self.previous)
+        self.velocity = resized(self.velocity)
+        self.size = resized(self.size)
+        self.scale = resized(self.scale, 1)
+        self.rotation = resized(self.rotation)
+        self.half = resized(self.half)
+        self.flags = resized(self.flags)
+        self.generation = resized(self.generation)
+        self.visual.extend([None] * (capacity - self.capacity))
+        self.sprite.extend([None] * (capacity - self.capacity))
+        self.capacity = capacity
+
+    def _allocate(self, amount: int) -> np.ndarray:
+        """Reserva amount ids, primero los libres"""
+        reused = [self._free.pop() for _ in range(min(amount, len(self._free)))]
+        new = amount - len(reused)
+        if self.count + new > self.capacity:
+            self._grow(max(self.capacity * 2, self.count + new))
+        ids = np.array(reused + list(range(self.count, self.count + new)), dtype=np.intp)
+        self.count += new
+        return ids
+
+    def create(self, position: Tuple[float, float], visual: Visual = None,
+               size: Tuple[float, float] = (50, 50),
+               velocity: Tuple[float, float] = (0, 0)) -> int:
+        """Crea una entidad y devuelve su id"""
+        return int(self.create_many([position], visual, size, [velocity])[0])
+
+    def create_many(self, positions, visual: Visual = None, size: Tuple[float, float] = (50, 50),
+                    velocities=None) -> np.ndarray:
+        """Crea una entidad por posición, todas con el mismo aspecto. Devuelve sus ids"""
+        positions = np.asarray(positions, dtype=np.float32).reshape(-1, 2)
+        ids = self._allocate(len(positions))
+        self.revision += 1
+        self.position[ids] = positions
+        self.previous[ids] = positions
+        self.velocity[ids] = 0 if velocities is None else np.asarray(velocities, dtype=np.float32)
+        self.size[ids] = size
+        self.scale[ids] = 1
+        self.rotation[ids] = 0
+        self.flags[ids] = ALIVE | VISIBLE
+        if len(ids):
+            # El sprite escalado es el mismo para todas
+            first = int(ids[0])
+            self.visual[first] = visual
+            self._build_sprite(first)
+            sprite, half = self.sprite[first], self.half[first]
+            for i in ids.tolist():
+                self.visual[i] = visual
+                self.sprite[i] = sprite
+            self.half[ids] = half
+            if sprite is not None:
+                self.flags[ids] |= HAS_SPRITE
+        return ids
+
+    def destroy(self, entity_id: int) -> None:
+        self.destroy_many([entity_id])
+
+    def destroy_many(self, ids) -> None:
+        ids = np.asarray(ids, dtype=np.intp)
+        ids = ids[(self.flags[ids] & ALIVE) != 0]
+        self.revision += 1
+        self.flags[ids] = 0
+        self.velocity[ids] = 0
+        self.generation[ids] += 1
+        for i in ids.tolist():
+            self.visual[i] = None
+            self.sprite[i] = None
+            self._free.append(i)
+
+    def is_alive(self, entity_id: int, generation: Optional[int] = None) -> bool:
+        if not (0 <= entity_id < self.count) or not self.flags[entity_id] & ALIVE:
+            return False
+        return generation is None or self.generation[entity_id] == generation
+
+    def alive_ids(self) -> np.ndarray:
+        return np.flatnonzero(self.flags[:self.count] & ALIVE)
+
+    def __len__(self) -> int:
+        return self.count - len(self._free)
+
+    def set_visual(self, entity_id: int, visual: Visual) -> None:
+        self.visual[entity_id] = visual
+        self._build_sprite(entity_id)
+
+    def _build_sprite(self, i: int) -> None:
+        """Prepara la superficie de la entidad a su tamaño, escala y escala de salida"""
+        visual = self.visual[i]
+        width = max(1, int(self.size[i, 0] * self.scale[i, 0] * self.render_scale))
+        height = max(1, int(self.size[i, 1] * self.scale[i, 1] * self.render_scale))
+        if isinstance(visual, str):
+            sprite = get_asset_manager().get_scaled(visual, (width, height))
+        elif isinstance(visual, pygame.Surface):
+            sprite = visual if visual.get_size() == (width, height) else \
+                pygame.transform.scale(visual, (width, height))
+        elif visual is not None:
+            sprite = get_transform_cache().rect_surface(visual, (width, height))
+        else:
+            sprite = None
+        self.sprite[i] = sprite
+        if sprite is None:
+            self.flags[i] &= ~np.uint8(HAS_SPRITE)
+        else:
+            self.flags[i] |= HAS_SPRITE
+        self.revision += 1
+        self.half[i] = (sprite.get_width() / 2, sprite.get_height() / 2) if sprite else (0, 0)
+
+    def set_render_scale(self, scale: float) -> None:
+        if scale == self.render_scale:
+            return
+        self.render_scale = scale
+        for i in self.alive_ids().tolist():
+            self._build_sprite(i)
+
+    def add_system(self, system: System) -> None:
+        self.systems.append(system)
+
+    def update(self, dt: float) -> None:
+        """Un paso de simulación: guarda las posiciones para interpolar y ejecuta los sistemas"""
+        if self.count == 0:
+            return
+        self.previous[:self.count] = self.position[:self.count]
+        for system in self.systems:
+            system(self, dt)
+
+    def query_rect(self, rect: pygame.Rect) -> np.ndarray:
+        """Ids de las entidades vivas cuyo centro está dentro del rectángulo"""
+        n = self.count
+        x, y = self.position[:n, 0], self.position[:n, 1]
+        mask = ((self.flags[:n] & ALIVE) != 0) & (x >= rect.left) & (x < rect.right) \
+            & (y >= rect.top) & (y < rect.bottom)
+        return np.flatnonzero(mask)
+
+# --- Sistemas: funciones (store, dt) que actualizan todas las entidades a la vez ---
+
+def movement_system(store: EntityStore, dt: float) -> None:
+    """Integra la velocidad (las entidades muertas tienen velocidad 0)"""
+    n = store.count
+    store.position[:n] += store.velocity[:n] * dt
+
+def make_gravity_system(gravity: float) -> System:
+    def gravity_system(store: EntityStore, dt: float) -> None:
+        n = store.count
+        store.velocity[:n, 1] += ((store.flags[:n] & ALIVE) != 0) * np.float32(gravity * dt)
+    return gravity_system
+
+def make_despawn_system(bounds: pygame.Rect) -> System:
+    """Destruye las entidades que salen de bounds (proyectiles, restos)"""
+    def despawn_system(store: EntityStore, dt: float) -> None:
+        n = store.count
+        x, y = store.position[:n, 0], store.position[:n, 1]
+        outside = (x < bounds.left) | (x >= bounds.right) | (y < bounds.top) | (y >= bounds.bottom)
+        ids = np.flatnonzero(outside & ((store.flags[:n] & ALIVE) != 0))
+        if len(ids):
+            store.destroy_many(ids)
+    return despawn_system
+
+class EntityLayer(Renderable):
+    """Dibuja todas las entidades de un almacén con un solo blits() por frame.
+
+    Sus límites son la unión de las cajas de las entidades vivas (en la
+    posición anterior y en la actual, por la interpolación) y solo se marca
+    sucia en los pasos en que algo cambió."""
+
+    def __init__(self, store: EntityStore, z_index: int = 0):
+        super().__init__((0, 0), z_index)
+        self.store = store
+        self._bounds = pygame.Rect(0, 0, 0, 0)
+        # Estado dibujado: (count, revision, posiciones, rotaciones, flags)
+        self._snapshot: Optional[Tuple[int, int, np.ndarray, np.ndarray, np.ndarray]] = None
+        self._changed = False
+
+    def update(self, dt: float) -> None:
+        """Compara el almacén con el último paso; si algo se movió o cambió
+        recalcula los límites y se marca sucia (también el paso siguiente, para
+        dibujar el final de la interpolación)"""
+        store = self.store
+        n = store.count
+        snapshot = self._snapshot
+        changed = snapshot is None or snapshot[0] != n or snapshot[1] != store.revision \
+            or not np.array_equal(snapshot[2], store.position[:n]) \
+            or not np.array_equal(snapshot[3], store.rotation[:n]) \
+            or not np.array_equal(snapshot[4], store.flags[:n])
+        if changed:
+            self._snapshot = (n, store.revision, store.position[:n].copy(),
+                              store.rotation[:n].copy(), store.flags[:n].copy())
+        if changed or self._changed:
+            self._update_bounds()
+            self.mark_dirty()
+        self._changed = changed
+
+    def _update_bounds(self) -> None:
+        store = self.store
+        n = store.count
+        ids = np.flatnonzero((store.flags[:n] & DRAWN) == DRAWN)
+        if not len(ids):
+            self._bounds = pygame.Rect(0, 0, 0, 0)
+            return
+        half = store.size[ids] * store.scale[ids] / 2
+        rotated = store.rotation[ids] != 0
+        if rotated.any():
+            # Rotadas caben en el círculo de su diagonal
+            half[rotated] = np.hypot(half[rotated, 0], half[rotated, 1])[:, None]
+        low = np.minimum(store.position[ids], store.previous[ids]) - half
+        high = np.maximum(store.position[ids], store.previous[ids]) + half
+        left, top = low.min(axis=0).tolist()
+        right, bottom = high.max(axis=0).tolist()
+        self._bounds = pygame.Rect(math.floor(left) - 1, math.floor(top) - 1,
+                                   math.ceil(right - left) + 2, math.ceil(bottom - top) + 2)
+
+    def get_bounds(self) -> pygame.Rect:
+        return self._bounds
+
+    def set_render_scale(self, scale: float) -> None:
+        super().set_render_scale(scale)
+        self.store.set_render_scale(scale)
+
+    def render(self, surface: pygame.Surface, offset: Tuple[float, float] = (0, 0),
+               alpha: float = 1.0) -> None:
+        store = self.store
+        n = store.count
+        if not self.visible or n == 0:
+            return
+        position = store.position[:n]
+        if alpha < 1.0:
+            previous = store.previous[:n]
+            position = previous + (position - previous) * alpha
+        center = position * self.render_scale + offset
+        topleft = center - store.half[:n]
+        clip = surface.get_clip()
+        size = store.half[:n] * 2
+        mask = ((store.flags[:n] & DRAWN) == DRAWN) \
+            & (topleft[:, 0] + size[:, 0] >= clip.left) & (topleft[:, 0] < clip.right) \
+            & (topleft[:, 1] + size[:, 1] >= clip.top) & (topleft[:, 1] < clip.bottom)
+        ids = np.flatnonzero(mask)
+        if not len(ids):
+            return
+
+        sprites = store.sprite
+        rotation = store.rotation[ids]
+        if not rotation.any():
+            surface.blits(list(zip([sprites[i] for i in ids.tolist()], topleft[ids].tolist())),
+                          doreturn=False)
+            return
+        cache = get_transform_cache()
+        blits = []
+        for i, angle, (x, y), (cx, cy) in zip(ids.tolist(), rotation.tolist(),
+                                              topleft[ids].tolist(), center[ids].tolist()):
+            sprite = sprites[i]
+            if angle:
+                sprite = cache.transform(sprite, angle)
+                x = cx - sprite.get_width() / 2
+                y = cy - sprite.get_height() / 2
+            blits.append((sprite, (x, y)))
+        surface.blits(blits, doreturn=False)
+
+class EntityObject:
+    """Fachada con la interfaz de GameObject sobre una entidad del almacén.
+
+    No es un Renderable: la dibuja la EntityLayer de su almacén. Game.spawn_entity
+    la acepta sin hacer nada y Renderer.add la rechaza con TypeError."""
+    __slots__ = ("store", "id", "generation")
+
+    def __init__(self, store: EntityStore, position: Tuple[float, float] = (0, 0),
+                 visual: Visual = None, size: Tuple[float, float] = (50, 50),
+                 velocity: Tuple[float, float] = (0, 0), entity_id: Optional[int] = None):
+        self.store = store
+        if entity_id is None:
+            entity_id = store.create(position, visual, size, velocity)
+        self.id = entity_id
+        self.generation = int(store.generation[entity_id])
+
+    @property
+    def alive(self) -> bool:
+        return self.store.is_alive(self.id, self.generation)
+
+    @property
+    def position(self) -> Tuple[float, float]:
+        x, y = self.store.position[self.id]
+        return (float(x), float(y))
+
+    @position.setter
+    def position(self, value: Tuple[float, float]) -> None:
+        self.store.position[self.id] = value
+
+    @property
+    def velocity(self) -> Tuple[float, float]:
+        x, y = self.store.velocity[self.id]
+        return (float(x), float(y))
+
+    @velocity.setter
+    def velocity(self, value: Tuple[float, float]) -> None:
+        self.store.velocity[self.id] = value
+
+    @property
+    def size(self) -> Tuple[float, float]:
+        return tuple(self.store.size[self.id].tolist())
+
+    @property
+    def scale(self) -> Tuple[float, float]:
+        return tuple(self.store.scale[self.id].tolist())
+
+    @property
+    def rotation(self) -> float:
+        return float(self.store.rotation[self.id])
+
+    @property
+    def visible(self) -> bool:
+        return bool(self.store.flags[self.id] & VISIBLE)
+
+    @visible.setter
+    def visible(self, value: bool) -> None:
+        if value:
+            self.store.flags[self.id] |= VISIBLE
+        else:
+            self.store.flags[self.id] &= ~np.uint8(VISIBLE)
+
+    def set_velocity(self, velocity: Tuple[float, float]) -> None:
+        self.velocity = velocity
+
+    def set_color(self, color: Tuple[int, ...]) -> None:
+        self.store.set_visual(self.id, color)
+
+    def set_texture(self, path: str) -> None:
+        self.store.set_visual(self.id, path)
+
+    def set_sprite(self, sprite: pygame.Surface) -> None:
+        self.store.set_visual(self.id, sprite)
+
+    def set_size(self, size: Tuple[float, float]) -> None:
+        self.store.size[self.id] = size
+        self.store._build_sprite(self.id)
+
+    def set_scale(self, scale: Tuple[float, float]) -> None:
+        self.store.scale[self.id] = scale
+        self.store._build_sprite(self.id)
+
+    def set_rotation(self, rotation: float) -> None:
+        self.store.rotation[self.id] = rotation
+
+    def get_bounds(self) -> pygame.Rect:
+        """Caja que contiene al objeto con cualquier rotación"""
+        width, height = self.store.size[self.id] * self.store.scale[self.id]
+        if self.store.rotation[self.id] != 0:
+            width = height = math.hypot(width, height)
+        rect = pygame.Rect(0, 0, math.ceil(width), math.ceil(height))
+        rect.center = self.position
+        return rect
+
+    def destroy(self) -> None:
+        if self.alive:
+            self.store.destroy(self.id)
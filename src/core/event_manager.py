@@ -1,5 +1,8 @@
+import weakref
+from bisect import insort
 from enum import Enum
-from typing import Callable, Dict, List
+from itertools import count
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
 
 class EventType(Enum):
     PLAYER_MOVE = "player_move"
@@ -20,27 +23,164 @@ class EventType(Enum):
     # Añade más tipos de eventos según necesites
 
 class Event:
+    __slots__ = ("type", "data", "_pooled")
+
+    # Eventos libres para reutilizar (ver Event.acquire)
+    _pool: List['Event'] = []
+    POOL_SIZE = 256
+
     def __init__(self, event_type: EventType, data: dict = None):
         self.type = event_type
         self.data = data or {}
+        self._pooled = False
+
+    @classmethod
+    def acquire(cls, event_type: EventType, data: dict = None) -> 'Event':
+        """Evento del pool, reutilizando también su diccionario de datos.
+        Lo devuelve al pool EventManager después de entregarlo"""
+        if cls._pool:
+            event = cls._pool.pop()
+            event.type = event_type
+            if data:
+                event.data.update(data)
+        else:
+            event = cls(event_type, dict(data) if data else None)
+        event._pooled = True
+        return event
+
+    def release(self) -> None:
+        if not self._pooled:
+            return
+        self._pooled = False
+        self.data.clear()
+        if len(Event._pool) < Event.POOL_SIZE:
+            Event._pool.append(self)
+
+# Tipos de alta frecuencia que se fusionan en la cola: solo se entrega el último
+# evento de cada origen (el valor de esta clave en los datos). Los eventos que
+# no traen la clave no se fusionan; con None se fusionan todos los del tipo
+DEFAULT_COALESCING: Dict[EventType, Optional[str]] = {
+    EventType.TEXT_CHANGED: "field",
+    EventType.PLAYER_MOVE: "player",
+}
+
+def _make_ref(listener: Callable) -> Callable[[], Optional[Callable]]:
+    """Los métodos ligados se guardan con referencia débil para no mantener vivo
+    a su dueño; funciones y lambdas se guardan tal cual"""
+    if hasattr(listener, "__self__") and hasattr(listener, "__func__"):
+        return weakref.WeakMethod(listener)
+    return lambda: listener
 
 class EventManager:
-    def __init__(self):
-        self._listeners: Dict[EventType, List[Callable]] = {}
+    """Reparte eventos entre los listeners suscritos.
+
+    En modo inmediato dispatch() llama a los listeners en el momento. En modo
+    cola (queued=True) los eventos se acumulan y se entregan todos juntos al
+    llamar a flush(); los tipos con fusión conservan solo el último evento de
+    cada origen. Los listeners se llaman por prioridad (mayor primero) y, a
+    igual prioridad, por orden de suscripción.
+    """
+
+    def __init__(self, queued: bool = False,
+                 coalescing: Optional[Dict[EventType, Optional[str]]] = None):
+        self._listeners: Dict[EventType, List[Tuple[int, int, Callable[[], Optional[Callable]]]]] = {}
+        self._sequence = count()
+        self.queued = queued
+        self.coalescing = dict(DEFAULT_COALESCING if coalescing is None else coalescing)
+        self._queue: List[Event] = []
+        # Posición en la cola del último evento de cada (tipo, origen) fusionable
+        self._coalesce_index: Dict[Tuple[EventType, Hashable], int] = {}
         
-    def subscribe(self, event_type: EventType, listener: Callable) -> None:
+    def subscribe(self, event_type: EventType, listener: Callable, priority: int = 0) -> None:
         """Suscribe un listener a un tipo de evento específico"""
         if event_type not in self._listeners:
             self._listeners[event_type] = []
-        self._listeners[event_type].append(listener)
+        insort(self._listeners[event_type], (-priority, next(self._sequence), _make_ref(listener)),
+               key=lambda entry: entry[:2])
         
     def unsubscribe(self, event_type: EventType, listener: Callable) -> None:
         """Desuscribe un listener de un tipo de evento específico"""
-        if event_type in self._listeners and listener in self._listeners[event_type]:
-            self._listeners[event_type].remove(listener)
+        entries = self._listeners.get(event_type)
+        if not entries:
+            return
+        for i, (_, _, ref) in enumerate(entries):
+            if ref() == listener:
+                del entries[i]
+                return
             
     def dispatch(self, event: Event) -> None:
-        """Dispara un evento y notifica a todos los listeners suscritos"""
-        if event.type in self._listeners:
-            for listener in self._listeners[event.type]:
-                listener(event)
\ No newline at end of file
+        """Dispara un evento; en modo cola lo guarda hasta el siguiente flush()"""
+        if self.queued:
+            self._enqueue(event)
+        else:
+            self._deliver(event)
+
+    def post(self, event_type: EventType, **data) -> None:
+        """Como dispatch, pero con un evento del pool (no guardarlo tras recibirlo)"""
+        self.dispatch(Event.acquire(event_type, data))
+
+    def _enqueue(self, event: Event) -> None:
+        if event.type in self.coalescing:
+            field = self.coalescing[event.type]
+            if field is None:
+                # Sin campo de origen se fusionan todos los eventos del tipo
+                source = None
+            elif field in event.data:
+                # Se indexa por el propio valor (que la cola mantiene vivo hasta
+                # el flush): id() podría repetirse en un objeto nuevo
+                source = event.data[field]
+            else:
+                # Sin origen no hay con qué fusionarlo
+                self._queue.append(event)
+                return
+            key = (event.type, source)
+            try:
+                index = self._coalesce_index.get(key)
+            except TypeError:
+                # Origen no hashable (también una tupla que contiene listas)
+                self._queue.append(event)
+                return
+            if index is not None:
+                # Conserva la posición del primero con los datos del último
+                self._queue[index].release()
+                self._queue[index] = event
+                return
+            self._coalesce_index[key] = len(self._queue)
+        self._queue.append(event)
+
+    def flush(self) -> int:
+        """Entrega en un lote los eventos en cola. Los que se disparen durante la
+        entrega quedan para el siguiente flush. Devuelve cuántos se entregaron"""
+        if not self._queue:
+            return 0
+        queue = self._queue
+        self._queue = []
+        self._coalesce_index.clear()
+        for event in queue:
+            self._deliver(event)
+        return len(queue)
+
+    def pending(self) -> int:
+        return len(self._queue)
+
+    def clear(self) -> None:
+        """Descarta los eventos en cola sin entregarlos"""
+        for event in self._queue:
+            event.release()
+        self._queue.clear()
+        self._coalesce_index.clear()
+
+    def _deliver(self, event: Event) -> None:
+        entries = self._listeners.get(event.type)
+        if entries:
+            dead = False
+            # Copia: un listener puede suscribir o desuscribir durante la entrega
+            for _, _, ref in tuple(entries):
+                listener = ref()
+                if listener is None:
+                    dead = True
+                    continue
+                listener(event)
+            if dead:
+                entries[:] = [entry for entry in entries if entry[2]() is not None]
+        event.release()
@@ -1,23 +1,54 @@
+import time
 import pygame
 from src.core.event_manager import EventManager, Event, EventType
+from src.core.profiler import get_profiler
 from config.constants import *
-from src.graphics.renderer import Renderer
+from src.graphics.renderer import Renderer, ScaleMode
+from src.graphics.renderable import Renderable
+from src.graphics.asset_manager import get_asset_manager
+from src.graphics.asset_loader import AssetLoader
+from src.graphics.texture_atlas import TextureAtlas, in_atlas, page_paths, prepare_atlas
 from src.graphics.UI.button import Button
 from src.graphics.UI.text_field import TextField
 from src.core.game_object import GameObject
+from src.core.entities import EntityLayer, EntityObject, EntityStore
 from src.world.world_manager import World
+from src.world.tilemap import TileMap
+from src.world.streaming_tilemap import StreamingTileMap
+from src.world.collision import TileCollider
 from src.graphics.UI.label import Label
+from src.graphics.UI.profiler_overlay import ProfilerOverlay
+from src.graphics.UI.progress_bar import ProgressBar
 
 class Game:
-    def __init__(self):
+    def __init__(self, simulation_only: bool = False, world_data: str = "./src/world/map.txt"):
         pygame.init()
         self.screen = pygame.display.set_mode((800, 600), pygame.RESIZABLE)
         pygame.display.set_caption("Game Title")
         self.clock = pygame.time.Clock()
         self.running = True
         
+        # Simulación a paso fijo, independiente de la velocidad de renderizado
+        self.fixed_dt = 1.0 / SIMULATION_HZ
+        self.max_catch_up_steps = MAX_CATCH_UP_STEPS
+        self.max_frame_skip = MAX_FRAME_SKIP
+        self.tick_count = 0
+        # Sin renderizado: los pasos se ejecutan tan rápido como sea posible
+        self.simulation_only = simulation_only
+        
         # Inicializar el renderer
-        self.renderer = Renderer(self.screen)
+        self.renderer = Renderer(self.screen, scale_mode=ScaleMode(SCALE_MODE))
+        self.asset_manager = get_asset_manager()
+        # Manifiesto del atlas cuyas páginas aún no se han cargado (ver load_assets)
+        self.atlas_manifest = None
+        if USE_TEXTURE_ATLAS:
+            # Las texturas sueltas se sirven como subsuperficies de pocas páginas
+            try:
+                self.atlas_manifest = prepare_atlas()
+            except (OSError, pygame.error) as error:
+                print(f"Atlas de texturas no disponible: {error}")
+        # Decodifica texturas en segundo plano (ver load_assets)
+        self.asset_loader = AssetLoader(self.asset_manager)
         
         # Crear botones con sus callbacks
         start_button = Button(
@@ -56,30 +87,131 @@ class Game:
             text_color=(255, 255, 255),
             variable=self.clock.get_fps,  # Pasamos la función directamente
             format_func=lambda fps: f"{fps:.1f}",  # Formatear a 1 decimal
-            update_interval=0.1  # Actualizar cada 0.1 segundos
+            update_interval=0.1,  # Actualizar cada 0.1 segundos
+            use_glyph_atlas=True  # El valor cambia constantemente
         )
         self.renderer.add(self.label)
+
+        # Profiler por fases; F3 muestra el overlay y F4 graba una traza
+        self.profiler = get_profiler()
+        self.profiler_overlay = ProfilerOverlay((500, 10), self.profiler)
+        self.renderer.add(self.profiler_overlay)
         
-        # Inicializar el gestor de eventos
-        self.event_manager = EventManager()
+        # Inicializar el gestor de eventos: los eventos del frame se entregan en
+        # un solo lote tras la simulación (ver flush en run)
+        self.event_manager = EventManager(queued=True)
         self._setup_event_handlers()
         
+        # Entidades numerosas (proyectiles, enemigos) en arrays: se mueven en
+        # lote y se dibujan con una sola capa
+        self.entity_store = EntityStore()
+        self.renderer.add(EntityLayer(self.entity_store, z_index=1))
+        
         # Inicializar el gestor de mundos
-        self.world_manager = World("E", "./src/world/map.txt")
+        self.world_manager = World("E", world_data)
+        # Con streaming solo se hornean los chunks cercanos a la cámara
+        self.streaming_world = WORLD_STREAMING
+        # Colisiones contra la rejilla de tiles (se crea en build_world)
+        self.collision = None
         
     def build_world(self):
-        for row, block in enumerate(self.world_manager.get_world_data()):
-            for col, char in enumerate(block.strip()):
-                if char != '0':
-                    self.renderer.add(GameObject((col * 50, row * 50), 
-                    pygame.image.load("./assets/textures/bricks.png"), z_index=0,
-                    size=(50, 50)))
+        """Hornea los tiles del nivel en chunks estáticos (o los prepara para streaming)"""
+        self.load_assets(["./assets/textures/bricks.png"])
+        options = {}
+        if self.streaming_world:
+            tilemap_class = StreamingTileMap
+            options["camera"] = self.renderer.camera
+        else:
+            tilemap_class = TileMap
+        self.tilemap = tilemap_class.from_level(
+            self.world_manager.get_world_data(),
+            tile_size=50,
+            default_texture="./assets/textures/bricks.png",
+            # Los ladrillos se dibujaban centrados en (col * 50, row * 50)
+            position=(-25, -25),
+            z_index=0,
+            **options
+        )
+        self.renderer.add(self.tilemap)
+        # Las colisiones usan la misma rejilla que se dibuja
+        self.collision = TileCollider(self.world_manager.get_world_data(),
+                                      tile_size=self.tilemap.tile_size,
+                                      origin=self.tilemap.position,
+                                      event_manager=self.event_manager)
+        # La cámara no puede salirse del nivel
+        self.renderer.camera.bounds = self.tilemap.get_pixel_rect()
         
+    def load_assets(self, paths):
+        """Carga las texturas en segundo plano mostrando una pantalla de carga.
+        La primera vez carga también las páginas del atlas; las texturas que
+        están en él no se leen por separado"""
+        manifest = self.atlas_manifest
+        if manifest is not None:
+            pages = page_paths(manifest)
+            for page in pages:
+                # Se guardan fijadas (fuera del LRU) en cuanto se decodifican
+                self.asset_manager.pin(page)
+            paths = pages + [path for path in paths if not in_atlas(manifest, path)]
+        self.asset_loader.load_all(paths)
+        if not self.asset_loader.is_done():
+            self._show_loading_screen()
+        if manifest is not None:
+            self.atlas_manifest = None
+            try:
+                # Las páginas ya están en la caché: solo se recortan los sprites
+                self.asset_manager.register_atlas(
+                    TextureAtlas.from_manifest(manifest, source_dir=ATLAS_SOURCE_DIR))
+            except (OSError, pygame.error) as error:
+                print(f"Atlas de texturas no disponible: {error}")
+
+    def _show_loading_screen(self):
+        """Espera al AssetLoader dibujando el progreso"""
+        loading_label = Label(
+            text="Cargando... ",
+            position=(300, 260),
+            font_size=30,
+            variable=self.asset_loader.get_progress,
+            format_func=lambda progress: f"{progress:.0%}",
+            update_interval=0
+        )
+        progress_bar = ProgressBar((250, 300), (300, 24), self.asset_loader.get_progress)
+
+        def draw_loading_screen(progress):
+            # La ventana sigue respondiendo mientras se decodifican las imágenes
+            if pygame.event.get(pygame.QUIT):
+                self.running = False
+            pygame.event.pump()
+            loading_label.update()
+            progress_bar.update()
+            self.screen.fill((0, 0, 0))
+            loading_label.render(self.screen)
+            progress_bar.render(self.screen)
+            pygame.display.flip()
+            self.clock.tick(60)
+
+        self.asset_loader.wait(on_progress=draw_loading_screen)
+
+    def set_tile(self, col: int, row: int, tile: int) -> None:
+        """Edita un tile del nivel: re-hornea su chunk y rehace sus colisiones"""
+        # El tilemap va primero: comparte el array del Level y solo marca el
+        # chunk para re-hornear si el valor aún no ha cambiado
+        self.tilemap.set_tile(col, row, tile)
+        if self.collision is not None:
+            self.collision.set_tile(col, row, tile)
+
     def spawn_entity(self, entity):
-        """Añade una entidad al juego y la renderiza"""
+        """Añade una entidad al juego y la renderiza.
+        Las EntityObject ya viven en entity_store, las dibuja su EntityLayer y se
+        consultan con entity_store.query_rect, así que no se registran de nuevo"""
+        if isinstance(entity, EntityObject):
+            return
         self.renderer.add(entity)
         self.world_manager.add_entity(entity)
 
+    def spawn_batch_entity(self, position, visual=None, size=(50, 50), velocity=(0, 0)) -> EntityObject:
+        """Crea una entidad en el almacén de arrays y devuelve su fachada"""
+        return EntityObject(self.entity_store, position, visual, size, velocity)
+
     def _setup_event_handlers(self):
         """Configura los manejadores de eventos básicos"""
         self.event_manager.subscribe(EventType.GAME_OVER, self._handle_game_over)
@@ -131,9 +263,27 @@ class Game:
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 self.running = False
+            elif event.type == pygame.VIDEORESIZE:
+                # Escala y recursos pre-escalados se recalculan solo aquí
+                self.renderer.resize(pygame.display.get_surface())
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                self.profiler_overlay.toggle()
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F4:
+                self.toggle_trace()
                 
             # Propagar eventos a elementos UI
-            self.renderer.handle_ui_event(event)
+            ui_event = self.renderer.handle_ui_event(event)
+            if ui_event is not None:
+                self.event_manager.dispatch(ui_event)
+
+    def toggle_trace(self, path: str = PROFILER_TRACE_PATH):
+        """Empieza a grabar una traza o la termina y la exporta a path"""
+        if self.profiler.recording:
+            self.profiler.stop_trace()
+            count = self.profiler.export_chrome_trace(path)
+            print(f"Traza guardada en {path} ({count} eventos)")
+        elif self.profiler.enabled:
+            self.profiler.start_trace()
 
     def start_game(self):
         print("Juego iniciado!")
@@ -152,25 +302,99 @@ class Game:
         # Implementa la lógica cuando se envía el nombre
 
     def run(self):
+        if self.simulation_only:
+            self.run_simulation()
+            self.close()
+            return
+
+        accumulator = 0.0
+        skipped_frames = 0
+        previous = time.perf_counter()
         while self.running:
-            self._handle_pygame_events()
-            
-            # Actualiza el estado del juego
-            self.update()
-            
-            # Renderiza
-            self.render()
+            now = time.perf_counter()
+            # Limitar el tiempo acumulado tras una pausa larga
+            accumulator += min(now - previous, MAX_FRAME_TIME)
+            previous = now
+
+            with self.profiler.scope("frame"):
+                with self.profiler.scope("events"):
+                    self._handle_pygame_events()
+                    self.renderer.update_ui()
+
+                # Actualiza el estado del juego en pasos fijos
+                steps = 0
+                while accumulator >= self.fixed_dt and steps < self.max_catch_up_steps:
+                    self.step()
+                    accumulator -= self.fixed_dt
+                    steps += 1
+                behind = accumulator >= self.fixed_dt
+                if behind:
+                    # No se alcanza el ritmo: descartar el retraso en vez de acumularlo
+                    accumulator %= self.fixed_dt
+
+                with self.profiler.scope("dispatch"):
+                    self.event_manager.flush()
+
+                # Bajo carga se saltan frames (con un máximo) para dar tiempo a la simulación
+                if behind and skipped_frames < self.max_frame_skip:
+                    skipped_frames += 1
+                else:
+                    skipped_frames = 0
+                    # Renderiza interpolando entre el paso anterior y el actual
+                    self.render(accumulator / self.fixed_dt)
+            self.profiler.end_frame()
             
             # Mantén el framerate constante
             self.clock.tick(CLOCK)
 
+        self.close()
+
+    def close(self):
+        """Detiene los hilos de fondo (streaming de chunks) y cierra pygame"""
+        close_tilemap = getattr(getattr(self, "tilemap", None), "close", None)
+        if close_tilemap is not None:
+            close_tilemap()
         pygame.quit()
 
-    def update(self):
+    def run_simulation(self, steps: int = None):
+        """Ejecuta pasos de simulación sin renderizar, tan rápido como sea posible.
+        El resultado es determinista: no depende de la velocidad de la pantalla"""
+        count = 0
+        while self.running and (steps is None or count < steps):
+            self.step()
+            self.event_manager.flush()
+            count += 1
+
+    def step(self):
+        """Avanza la simulación un paso fijo"""
+        Renderable.advance_tick()
+        with self.profiler.scope("update"):
+            self.update(self.fixed_dt)
+        self.tick_count += 1
+
+    def update(self, dt: float):
         # Actualiza la lógica del juego
-        pass
+        self.entity_store.update(dt)
+        if self.collision is not None:
+            self.collision.step(dt)
+        self.renderer.update(dt)
+        self.renderer.camera.update()
+
+    def render(self, alpha: float = 1.0):
+        self.present(self.draw(alpha))
+
+    def draw(self, alpha: float = 1.0):
+        """Dibuja el frame; en modo de rectángulos sucios devuelve las áreas cambiadas"""
+        if not self.renderer.dirty_rects:
+            self.screen.fill((0, 0, 0))
+        return self.renderer.render(alpha)
 
-    def render(self):
-        self.screen.fill((0, 0, 0))
-        self.renderer.render()
-        pygame.display.flip()
+    def present(self, dirty=None):
+        """Envía el frame dibujado a la ventana"""
+        with self.profiler.scope("flip"):
+            if self.renderer.dirty_rects:
+                # Solo se envían a la pantalla las áreas que cambiaron
+                if dirty:
+                    pygame.display.update(dirty)
+                return
+            pygame.display.flip()
@@ -1,10 +1,13 @@
+import math
 import pygame
 from ..graphics.renderable import Renderable
+from ..graphics.asset_manager import get_asset_manager
+from ..graphics.transform_cache import get_transform_cache
 from typing import Tuple, Optional, Union
 
 class GameObject(Renderable):
     def __init__(self, position: Tuple[float, float], 
-                 visual: Union[pygame.Surface, Tuple[int, int, int], Tuple[int, int, int, int]] = None, 
+                 visual: Union[str, pygame.Surface, Tuple[int, int, int], Tuple[int, int, int, int]] = None, 
                  size: Tuple[int, int] = (50, 50),
                  z_index: int = 0,
                  keep_aspect_ratio: bool = True):
@@ -12,13 +15,19 @@ class GameObject(Renderable):
         self.sprite = None
         self.color = None
         self.original_sprite = None  # Guardamos la sprite original
+        self.texture = None  # Ruta de la textura si proviene del AssetManager
         self.size = size
         self.scale = (1.0, 1.0)
         self.rotation = 0.0
         self.keep_aspect_ratio = keep_aspect_ratio
+        # Última superficie rotada y (origen, rotación) con que se obtuvo
+        self._rotated = None
+        self._rotated_key = None
         
-        # Determinar si es un sprite o un color
-        if isinstance(visual, pygame.Surface):
+        # Determinar si es una textura, un sprite o un color
+        if isinstance(visual, str):
+            self.set_texture(visual)
+        elif isinstance(visual, pygame.Surface):
             self.set_sprite(visual)
         elif isinstance(visual, tuple):
             self.set_color(visual)
@@ -26,20 +35,45 @@ class GameObject(Renderable):
     def set_sprite(self, sprite: pygame.Surface) -> None:
         """Establece un sprite como visual del objeto y lo ajusta al tamaño"""
         self.original_sprite = sprite
+        self.texture = None
         self._update_sprite()
+        self.mark_dirty()
+
+    def set_color(self, color: Union[Tuple[int, int, int], Tuple[int, int, int, int]]) -> None:
+        """Usa un rectángulo de color como visual del objeto"""
+        self.color = color
+        self.sprite = None
+        self.original_sprite = None
+        self.texture = None
+        self.mark_dirty()
+
+    def set_texture(self, path: str) -> None:
+        """Usa una textura compartida del AssetManager en lugar de una copia propia.
+        Si la imagen está en un atlas registrado se dibuja desde su subsuperficie"""
+        self.texture = path
+        self.original_sprite = get_asset_manager().load(path)
+        self._update_sprite()
+        self.mark_dirty()
 
     def set_size(self, size: Tuple[int, int]) -> None:
         """Actualiza el tamaño del objeto y ajusta el sprite si existe"""
         self.size = size
         self._update_sprite()
+        self.mark_dirty()
+
+    def set_scale(self, scale: Tuple[float, float]) -> None:
+        """Actualiza la escala del objeto y reajusta el sprite"""
+        self.scale = scale
+        self._update_sprite()
+        self.mark_dirty()
 
     def _update_sprite(self) -> None:
         """Actualiza el sprite aplicando el tamaño y la escala"""
         if self.original_sprite is None:
             return
 
-        target_width = int(self.size[0] * self.scale[0])
-        target_height = int(self.size[1] * self.scale[1])
+        target_width = max(1, int(self.size[0] * self.scale[0] * self.render_scale))
+        target_height = max(1, int(self.size[1] * self.scale[1] * self.render_scale))
 
         if self.keep_aspect_ratio:
             # Mantener aspect ratio
@@ -53,6 +87,16 @@ class GameObject(Renderable):
                 # Ajustar por ancho
                 target_height = int(target_width / original_ratio)
 
+        if self.texture is not None:
+            # Las variantes escaladas se comparten entre todos los objetos
+            self.sprite = get_asset_manager().get_scaled(
+                self.texture, (target_width, target_height))
+            return
+
+        if self.original_sprite.get_size() == (target_width, target_height):
+            self.sprite = self.original_sprite
+            return
+
         try:
             self.sprite = pygame.transform.smoothscale(
                 self.original_sprite, 
@@ -65,32 +109,75 @@ class GameObject(Renderable):
                 (target_width, target_height)
             )
 
-    def render(self, surface: pygame.Surface) -> None:
+    def set_render_scale(self, scale: float) -> None:
+        """Pre-escala el sprite a la resolución de salida"""
+        if scale != self.render_scale:
+            self.render_scale = scale
+            self._update_sprite()
+
+    def set_rotation(self, rotation: float) -> None:
+        """Cambia la rotación en grados"""
+        if rotation != self.rotation:
+            self.rotation = rotation
+            self.mark_dirty()
+
+    def _get_rotated(self, source: pygame.Surface) -> pygame.Surface:
+        """Versión rotada de source; solo se busca de nuevo si cambian origen o rotación"""
+        key = (source, self.rotation)
+        if key != self._rotated_key:
+            self._rotated = get_transform_cache().transform(source, self.rotation)
+            self._rotated_key = key
+        return self._rotated
+
+    def get_bounds(self) -> pygame.Rect:
+        """Caja que contiene al objeto con cualquier rotación"""
+        width = self.size[0] * self.scale[0]
+        height = self.size[1] * self.scale[1]
+        if self.rotation != 0:
+            width = height = math.hypot(width, height)
+        rect = pygame.Rect(0, 0, math.ceil(width), math.ceil(height))
+        rect.center = self.position
+        return rect
+
+    def get_blit(self, offset: Tuple[float, float] = (0, 0),
+                 alpha: float = 1.0) -> Optional[Tuple[pygame.Surface, pygame.Rect]]:
+        """Los sprites sin rotar se dibujan con un solo blit y pueden ir en lote"""
+        if not self.visible or self.sprite is None or self.rotation != 0:
+            return None
+        render_scale = self.render_scale
+        x, y = self.get_interpolated_position(alpha)
+        center = (x * render_scale + offset[0], y * render_scale + offset[1])
+        return (self.sprite, self.sprite.get_rect(center=center))
+
+    def render(self, surface: pygame.Surface, offset: Tuple[float, float] = (0, 0),
+               alpha: float = 1.0) -> None:
         if not self.visible:
             return
 
+        render_scale = self.render_scale
+        x, y = self.get_interpolated_position(alpha)
+        center = (x * render_scale + offset[0], y * render_scale + offset[1])
         if self.sprite is not None:
             # Aplicar rotación si es necesario
             if self.rotation != 0:
-                rotated_sprite = pygame.transform.rotate(self.sprite, self.rotation)
-                rect = rotated_sprite.get_rect(center=self.position)
+                rotated_sprite = self._get_rotated(self.sprite)
+                rect = rotated_sprite.get_rect(center=center)
                 surface.blit(rotated_sprite, rect)
             else:
-                rect = self.sprite.get_rect(center=self.position)
+                rect = self.sprite.get_rect(center=center)
                 surface.blit(self.sprite, rect)
         
         elif self.color is not None:
             # Renderizado de forma coloreada
-            scaled_size = (int(self.size[0] * self.scale[0]), 
-                         int(self.size[1] * self.scale[1]))
+            scaled_size = (int(self.size[0] * self.scale[0] * render_scale), 
+                         int(self.size[1] * self.scale[1] * render_scale))
             rect = pygame.Rect(0, 0, *scaled_size)
-            rect.center = self.position
+            rect.center = center
             
             if self.rotation != 0:
-                surf = pygame.Surface(scaled_size, pygame.SRCALPHA)
-                pygame.draw.rect(surf, self.color, surf.get_rect())
-                rotated = pygame.transform.rotate(surf, self.rotation)
-                rot_rect = rotated.get_rect(center=self.position)
+                surf = get_transform_cache().rect_surface(self.color, scaled_size)
+                rotated = self._get_rotated(surf)
+                rot_rect = rotated.get_rect(center=center)
                 surface.blit(rotated, rot_rect)
             else:
                 pygame.draw.rect(surface, self.color, rect)
\ No newline at end of file
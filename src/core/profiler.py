@@ -0,0 +1,162 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+from config.constants import PROFILER_ENABLED, PROFILER_HISTORY, PROFILER_MAX_TRACE_EVENTS
+
+class _NullScope:
+    """Ámbito vacío que se devuelve con el profiler desactivado"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+_NULL_SCOPE = _NullScope()
+
+class _Scope:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler: 'Profiler', name: str):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.profiler._record(self.name, self.start, time.perf_counter())
+        return False
+
+class Profiler:
+    """Mide ámbitos con nombre (eventos, update, render por capa, escalado, flip).
+
+    Cada ámbito acumula su tiempo dentro del frame y end_frame() guarda el total
+    en un histórico circular de PROFILER_HISTORY frames. Con recording activo se
+    guardan además los eventos individuales para exportarlos como traza de
+    Chrome (chrome://tracing o Perfetto).
+
+    Desactivado, scope() devuelve siempre el mismo objeto vacío: el coste es una
+    llamada y una comprobación, así que puede quedarse en producción.
+    """
+
+    def __init__(self, enabled: bool = PROFILER_ENABLED, history: int = PROFILER_HISTORY,
+                 max_trace_events: int = PROFILER_MAX_TRACE_EVENTS):
+        self.enabled = enabled
+        self.history_size = history
+        self.recording = False
+        # Tiempo total (s) de cada ámbito en el frame en curso
+        self._frame: Dict[str, float] = {}
+        # Totales por frame en milisegundos, los más recientes al final
+        self._history: Dict[str, Deque[float]] = {}
+        self._trace: Deque[Tuple[str, float, float, int]] = deque(maxlen=max_trace_events)
+        self._origin = time.perf_counter()
+        self.frame_count = 0
+
+    def scope(self, name: str):
+        """Context manager que mide el bloque con el nombre dado"""
+        if not self.enabled:
+            return _NULL_SCOPE
+        return _Scope(self, name)
+
+    def _record(self, name: str, start: float, end: float) -> None:
+        frame = self._frame
+        frame[name] = frame.get(name, 0.0) + (end - start)
+        if self.recording:
+            self._trace.append((name, start, end, threading.get_ident()))
+
+    def end_frame(self) -> None:
+        """Cierra el frame: pasa los tiempos acumulados al histórico"""
+        if not self.enabled:
+            return
+        for name, total in self._frame.items():
+            samples = self._history.get(name)
+            if samples is None:
+                samples = self._history[name] = deque(maxlen=self.history_size)
+            samples.append(total * 1000)
+        self._frame.clear()
+        self.frame_count += 1
+
+    def set_enabled(self, enabled: bool) -> None:
+        self.enabled = enabled
+        self._frame.clear()
+        if not enabled:
+            self.recording = False
+
+    def names(self) -> List[str]:
+        return list(self._history)
+
+    def samples(self, name: str) -> List[float]:
+        """Histórico de tiempos por frame (ms) del ámbito"""
+        return list(self._history.get(name, ()))
+
+    def stats(self, name: str) -> Optional[Dict[str, float]]:
+        """Último valor, media, p50, p95 y máximo (ms) del histórico del ámbito"""
+        samples = self._history.get(name)
+        if not samples:
+            return None
+        ordered = sorted(samples)
+        count = len(ordered)
+        return {
+            "last": samples[-1],
+            "mean": sum(ordered) / count,
+            "p50": ordered[count // 2],
+            "p95": ordered[min(count - 1, int(count * 0.95))],
+            "max": ordered[-1],
+        }
+
+    def histogram(self, name: str, bins: int = 10, max_ms: Optional[float] = None) -> List[int]:
+        """Cuenta de frames por intervalo de tiempo, de 0 a max_ms (por defecto el máximo)"""
+        samples = self._history.get(name)
+        counts = [0] * bins
+        if not samples:
+            return counts
+        top = max_ms or max(samples) or 1.0
+        for value in samples:
+            counts[min(bins - 1, int(value / top * bins))] += 1
+        return counts
+
+    def reset(self) -> None:
+        self._frame.clear()
+        self._history.clear()
+        self._trace.clear()
+        self.frame_count = 0
+
+    def start_trace(self) -> None:
+        """Empieza a guardar eventos individuales para export_chrome_trace"""
+        self._trace.clear()
+        self.recording = self.enabled
+
+    def stop_trace(self) -> None:
+        self.recording = False
+
+    def export_chrome_trace(self, path: str) -> int:
+        """Escribe los eventos grabados en formato Trace Event de Chrome.
+        Devuelve el número de eventos escritos"""
+        pid = os.getpid()
+        events = [{
+            "name": name,
+            "cat": "frame",
+            "ph": "X",
+            "ts": (start - self._origin) * 1e6,
+            "dur": (end - start) * 1e6,
+            "pid": pid,
+            "tid": tid,
+        } for name, start, end, tid in self._trace]
+        with open(path, "w") as file:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, file)
+        return len(events)
+
+_default_profiler: Optional[Profiler] = None
+
+def get_profiler() -> Profiler:
+    """Profiler compartido por todo el proceso"""
+    global _default_profiler
+    if _default_profiler is None:
+        _default_profiler = Profiler()
+    return _default_profiler
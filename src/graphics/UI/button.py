@@ -1,6 +1,7 @@
 import pygame
 from typing import Optional
 from .ui_element import UIElement
+from .font_cache import get_font, render_text
 from ...core.event_manager import Event, EventType
 
 class Button(UIElement):
@@ -8,12 +9,19 @@ class Button(UIElement):
         super().__init__(position, size)
         self.text = text
         self.color = color
-        self.font = pygame.font.Font(None, 36)
+        self.font = get_font(None, 36)
         self.hovered = False
         self.pressed = False
         self.on_click = on_click
 
     def _handle_self_event(self, event: pygame.event.Event) -> Optional[Event]:
+        state = (self.hovered, self.pressed)
+        result = self._handle_button_event(event)
+        if (self.hovered, self.pressed) != state:
+            self.mark_dirty()
+        return result
+
+    def _handle_button_event(self, event: pygame.event.Event) -> Optional[Event]:
         if event.type == pygame.MOUSEMOTION:
             self.hovered = self.rect.collidepoint(event.pos)
             
@@ -35,17 +43,20 @@ class Button(UIElement):
         """Establece el callback para cuando se hace clic en el botón"""
         self.on_click = callback
 
-    def _render_self(self, surface):
-        # Calcular color basado en estado
+    def _visual_state(self):
+        return (self.hovered, self.pressed, self.text, self.color, self.rect.size)
+
+    def _draw(self, surface, rect):
+        # Calcular color basado en estado (solo cuando el estado cambia)
         color = self.color
         if self.pressed:
             color = tuple(max(0, c - 40) for c in self.color)
         elif self.hovered:
             color = tuple(min(255, c + 20) for c in self.color)
 
-        pygame.draw.rect(surface, color, self.rect)
+        pygame.draw.rect(surface, color, rect)
         
         # Renderizar texto
-        text_surface = self.font.render(self.text, True, (255, 255, 255))
-        text_rect = text_surface.get_rect(center=self.rect.center)
-        surface.blit(text_surface, text_rect)
\ No newline at end of file
+        text_surface = render_text(self.font, self.text, (255, 255, 255))
+        text_rect = text_surface.get_rect(center=rect.center)
+        surface.blit(text_surface, text_rect)
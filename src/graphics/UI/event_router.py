@@ -0,0 +1,166 @@
+import pygame
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from .ui_element import UIElement
+from ...core.event_manager import Event
+from ...world.spatial_hash import SpatialHash
+
+POINTER_EVENTS = (pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP)
+KEYBOARD_EVENTS = (pygame.KEYDOWN, pygame.KEYUP, pygame.TEXTINPUT)
+
+class UIEventRouter:
+    """Reparte los eventos de pygame solo a los elementos de interfaz implicados.
+
+    Los eventos de puntero van al elemento bajo el cursor (buscado en un índice
+    espacial de los rectángulos de la UI, hijos incluidos), al que tenía el
+    hover o el foco antes y al que tenga capturado el puntero. Los de teclado
+    van solo al elemento con el foco.
+    """
+
+    def __init__(self, to_virtual: Optional[Callable[[Tuple[int, int]], Tuple[int, int]]] = None,
+                 cell_size: int = 128):
+        # Convierte posiciones de la ventana a coordenadas virtuales de la UI
+        self.to_virtual = to_virtual
+        self.spatial_index = SpatialHash(cell_size)
+        self._roots: Dict[UIElement, int] = {}
+        self._next_order = 0
+        # Elementos registrados (raíces e hijos) con su raíz
+        self._elements: Dict[UIElement, UIElement] = {}
+        # Elementos con update(), que se llaman una vez por frame en tick()
+        self._updatable: Dict[UIElement, Callable[[], None]] = {}
+        self.focused: Optional[UIElement] = None
+        self.hovered: Optional[UIElement] = None
+        self.captured: Optional[UIElement] = None
+
+    def add(self, root: UIElement) -> None:
+        """Registra un elemento de primer nivel y todo su árbol de hijos"""
+        if root in self._roots:
+            return
+        self._roots[root] = self._next_order
+        self._next_order += 1
+        root.add_change_listener(self._on_root_changed)
+        self._sync(root)
+
+    def remove(self, root: UIElement) -> None:
+        if self._roots.pop(root, None) is None:
+            return
+        root.remove_change_listener(self._on_root_changed)
+        for element in [e for e, r in self._elements.items() if r is root]:
+            self._unregister(element)
+
+    def _unregister(self, element: UIElement) -> None:
+        del self._elements[element]
+        self._updatable.pop(element, None)
+        self.spatial_index.remove(element)
+        if self.focused is element:
+            self.focused = None
+        if self.hovered is element:
+            self.hovered = None
+        if self.captured is element:
+            self.captured = None
+
+    @staticmethod
+    def _walk(element: UIElement) -> Iterator[UIElement]:
+        yield element
+        for child in element.children:
+            yield from UIEventRouter._walk(child)
+
+    def _sync(self, root: UIElement) -> None:
+        """Actualiza los rectángulos del árbol (los hijos avisan a través de la raíz)"""
+        current = set()
+        for element in self._walk(root):
+            current.add(element)
+            self._elements[element] = root
+            self.spatial_index.move(element, element.rect)
+            update = getattr(element, 'update', None)
+            if update is not None:
+                self._updatable[element] = update
+        for element in [e for e, r in self._elements.items() if r is root and e not in current]:
+            self._unregister(element)
+
+    def _on_root_changed(self, root: UIElement) -> None:
+        self._sync(root)
+
+    def _draw_order(self, element: UIElement) -> Tuple:
+        """Clave de orden de dibujo: los hijos se dibujan encima de su padre"""
+        path: List[int] = []
+        while element.parent is not None:
+            path.append(element.parent.children.index(element))
+            element = element.parent
+        return (element.z_index, self._roots.get(element, 0), *reversed(path))
+
+    @staticmethod
+    def _is_reachable(element: UIElement) -> bool:
+        while element is not None:
+            if not element.is_interactable():
+                return False
+            element = element.parent
+        return True
+
+    def element_at(self, pos: Tuple[int, int]) -> Optional[UIElement]:
+        """Elemento interactivo superior bajo la posición (coordenadas virtuales)"""
+        candidates = [e for e in self.spatial_index.query_point(pos) if self._is_reachable(e)]
+        if not candidates:
+            return None
+        return max(candidates, key=self._draw_order)
+
+    def set_focus(self, element: Optional[UIElement]) -> None:
+        self.focused = element
+
+    def capture_pointer(self, element: UIElement) -> None:
+        """Envía todos los eventos de puntero al elemento hasta release_pointer"""
+        self.captured = element
+
+    def release_pointer(self) -> None:
+        self.captured = None
+
+    def _to_virtual_event(self, event: pygame.event.Event) -> pygame.event.Event:
+        if self.to_virtual is None:
+            return event
+        data = dict(event.dict)
+        data['pos'] = self.to_virtual(event.pos)
+        return pygame.event.Event(event.type, data)
+
+    def handle_event(self, event: pygame.event.Event) -> Optional[Event]:
+        """Reparte el evento y devuelve el primer evento del sistema generado"""
+        if event.type in POINTER_EVENTS:
+            return self._handle_pointer(self._to_virtual_event(event))
+        if event.type in KEYBOARD_EVENTS:
+            if self.focused is not None:
+                return self.focused.dispatch_event(event)
+        return None
+
+    def _handle_pointer(self, event: pygame.event.Event) -> Optional[Event]:
+        if self.captured is not None:
+            targets = [self.captured]
+            hit = self.captured
+        else:
+            hit = self.element_at(event.pos)
+            targets = [hit] if hit is not None else []
+
+        if event.type == pygame.MOUSEMOTION:
+            # El elemento que pierde el hover también recibe el movimiento
+            if self.hovered is not None and self.hovered is not hit:
+                targets.append(self.hovered)
+            self.hovered = hit
+        elif event.type == pygame.MOUSEBUTTONDOWN:
+            # El elemento que pierde el foco también recibe el clic
+            if self.focused is not None and self.focused is not hit:
+                targets.append(self.focused)
+            self.focused = hit if hit is not None and hit.focusable else None
+
+        result = None
+        for target in targets:
+            target_result = target.dispatch_event(event)
+            if result is None:
+                result = target_result
+
+        if event.type == pygame.MOUSEBUTTONDOWN and hit is not None and self.captured is None:
+            self.captured = hit
+        elif event.type == pygame.MOUSEBUTTONUP:
+            self.captured = None
+        return result
+
+    def tick(self) -> None:
+        """Actualiza una vez por frame los elementos que tienen update()"""
+        for update in list(self._updatable.values()):
+            update()
@@ -0,0 +1,122 @@
+import pygame
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+Color = Tuple[int, ...]
+
+# Registro de fuentes compartido por todo el proceso
+_fonts: Dict[Tuple[Optional[str], int], pygame.font.Font] = {}
+
+def get_font(name: Optional[str], size: int) -> pygame.font.Font:
+    """Devuelve la fuente (name, size), creándola solo la primera vez"""
+    key = (name, size)
+    font = _fonts.get(key)
+    if font is None:
+        if not _fonts:
+            # pygame olvida sus callbacks de salida tras cada quit()
+            pygame.register_quit(clear_font_cache)
+        font = _fonts[key] = pygame.font.Font(name, size)
+    return font
+
+class TextCache:
+    """Caché LRU de textos ya rasterizados.
+
+    La clave es (fuente, texto, color, antialias, fondo), así que los widgets que
+    redibujan el mismo texto cada frame reutilizan la misma superficie.
+    """
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._cache: "OrderedDict[tuple, pygame.Surface]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font: pygame.font.Font, text: str, color: Color,
+               antialias: bool = True, background: Optional[Color] = None) -> pygame.Surface:
+        key = (font, text, tuple(color), antialias,
+               tuple(background) if background is not None else None)
+        surface = self._cache.get(key)
+        if surface is not None:
+            self.hits += 1
+            self._cache.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color, background)
+        self._cache[key] = surface
+        if len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+        return surface
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+_text_cache = TextCache()
+
+def render_text(font: pygame.font.Font, text: str, color: Color,
+                antialias: bool = True, background: Optional[Color] = None) -> pygame.Surface:
+    """Rasteriza el texto usando la caché compartida"""
+    return _text_cache.render(font, text, color, antialias, background)
+
+def get_text_cache() -> TextCache:
+    return _text_cache
+
+class GlyphAtlas:
+    """Glifos pre-rasterizados de una fuente y un color.
+
+    Pensado para textos que cambian cada frame (contadores, FPS): en vez de
+    rasterizar la cadena completa se componen glifos ya renderizados con un
+    único blits().
+    """
+
+    def __init__(self, font: pygame.font.Font, color: Color, antialias: bool = True,
+                 charset: str = "0123456789.,:-+%/ "):
+        self.font = font
+        self.color = color
+        self.antialias = antialias
+        self.height = font.get_linesize()
+        self._glyphs: Dict[str, pygame.Surface] = {}
+        for char in charset:
+            self._glyph(char)
+
+    def _glyph(self, char: str) -> pygame.Surface:
+        glyph = self._glyphs.get(char)
+        if glyph is None:
+            glyph = self._glyphs[char] = self.font.render(char, self.antialias, self.color)
+        return glyph
+
+    def size(self, text: str) -> Tuple[int, int]:
+        return sum(self._glyph(char).get_width() for char in text), self.height
+
+    def render(self, text: str, background: Optional[Color] = None) -> pygame.Surface:
+        """Compone el texto a partir de los glifos (sin kerning)"""
+        surface = pygame.Surface(self.size(text), pygame.SRCALPHA)
+        if background is not None:
+            surface.fill(background)
+        x = 0
+        blits = []
+        for char in text:
+            glyph = self._glyph(char)
+            blits.append((glyph, (x, 0)))
+            x += glyph.get_width()
+        surface.blits(blits, doreturn=False)
+        return surface
+
+_atlases: Dict[Tuple[pygame.font.Font, Color, bool], GlyphAtlas] = {}
+
+def get_glyph_atlas(font: pygame.font.Font, color: Color, antialias: bool = True) -> GlyphAtlas:
+    """Devuelve el atlas compartido para (fuente, color, antialias)"""
+    key = (font, tuple(color), antialias)
+    atlas = _atlases.get(key)
+    if atlas is None:
+        atlas = _atlases[key] = GlyphAtlas(font, color, antialias)
+    return atlas
+
+def clear_font_cache() -> None:
+    """Descarta fuentes, textos y atlas (dejan de ser válidos tras pygame.quit())"""
+    _fonts.clear()
+    _text_cache.clear()
+    _atlases.clear()
@@ -1,5 +1,6 @@
 import pygame
 from src.graphics.UI.ui_element import UIElement
+from src.graphics.UI.font_cache import get_font, get_glyph_atlas, render_text
 from typing import Tuple, Optional, Any, Callable, Union
 
 class Label(UIElement):
@@ -13,14 +14,16 @@ class Label(UIElement):
                  z_index: int = 100,
                  variable: Union[Any, Callable[[], Any]] = None,
                  format_func: Callable[[Any], str] = str,
-                 update_interval: float = 1.0):  # Intervalo en segundos
+                 update_interval: float = 1.0,  # Intervalo en segundos
+                 use_glyph_atlas: bool = False):  # Para textos que cambian muy a menudo
         # Inicializar el tamaño en 0,0 - se actualizará en _render
         super().__init__(position, (0, 0), z_index)
         
         self.base_text = text
         self.text = text
-        self.font = pygame.font.Font(font_name, font_size)
+        self.font = get_font(font_name, font_size)
         self.text_color = text_color
+        self.glyph_atlas = get_glyph_atlas(self.font, text_color) if use_glyph_atlas else None
         self.background_color = background_color
         self.variable = variable
         self.format_func = format_func
@@ -54,11 +57,16 @@ class Label(UIElement):
 
     def _render(self):
         """Render the text to a surface"""
-        self.surface = self.font.render(self.text, True, self.text_color, self.background_color)
+        if self.glyph_atlas is not None:
+            self.surface = self.glyph_atlas.render(self.text, self.background_color)
+        else:
+            self.surface = render_text(self.font, self.text, self.text_color, True,
+                                       self.background_color)
         self.rect = self.surface.get_rect()
         self.rect.topleft = self.position
         # Actualizar el tamaño basado en la superficie renderizada
         self.size = self.surface.get_size()
+        self.mark_dirty()
 
     def set_text(self, new_text: str) -> None:
         """Update the text content"""
@@ -66,11 +74,9 @@ class Label(UIElement):
             self.text = new_text
             self._render()
 
-    def _render_self(self, surface: pygame.Surface) -> None:
-        """Implementación del método abstracto de UIElement"""
-        if not self.visible:
-            return
-        surface.blit(self.surface, self.rect)
+    def _draw(self, surface: pygame.Surface, rect: pygame.Rect) -> None:
+        """Implementación del método abstracto de UIElement (la superficie ya está retenida)"""
+        surface.blit(self.surface, rect)
 
     def is_interactable(self) -> bool:
         """Implementación del método abstracto de Interactive"""
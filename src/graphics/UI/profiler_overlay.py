@@ -0,0 +1,103 @@
+import pygame
+from typing import Dict, List, Optional, Sequence, Tuple
+from .ui_element import UIElement
+from .label import Label
+from ...core.profiler import Profiler, get_profiler
+
+class ProfilerOverlay(UIElement):
+    """Panel con los tiempos por ámbito del profiler y una gráfica del frame.
+
+    Cada línea es un Label (no se añade al renderer, el panel compone sus
+    superficies). El contenido se rehace cada update_interval segundos y solo
+    mientras el panel está visible.
+    """
+
+    def __init__(self, position: Tuple[float, float] = (10, 10),
+                 profiler: Optional[Profiler] = None,
+                 scopes: Optional[Sequence[str]] = None,
+                 graph_scope: str = "frame",
+                 graph_size: Tuple[int, int] = (240, 60),
+                 budget_ms: float = 1000 / 60,
+                 font_size: int = 18,
+                 update_interval: float = 0.25,
+                 z_index: int = 1000):
+        super().__init__(position, graph_size, z_index)
+        self.profiler = profiler or get_profiler()
+        # Ámbitos a mostrar; None muestra todos los que tengan datos
+        self.scopes = list(scopes) if scopes is not None else None
+        self.graph_scope = graph_scope
+        self.graph_size = graph_size
+        # Línea de referencia de la gráfica (presupuesto de un frame a 60 Hz)
+        self.budget_ms = budget_ms
+        self.font_size = font_size
+        self.update_interval = update_interval
+        self.visible = False
+        self._labels: Dict[str, Label] = {}
+        self._lines: List[Label] = []
+        self._graph: List[float] = []
+        self._version = 0
+        self._last_update_time = -update_interval
+
+    def toggle(self) -> None:
+        """Muestra u oculta el panel y activa el profiler mientras se ve"""
+        self.visible = not self.visible
+        self.profiler.set_enabled(self.visible)
+        self._last_update_time = -self.update_interval
+        self.mark_dirty()
+
+    def update(self) -> None:
+        if not self.visible:
+            return
+        current_time = pygame.time.get_ticks() / 1000
+        if current_time - self._last_update_time < self.update_interval:
+            return
+        self._last_update_time = current_time
+
+        names = self.scopes if self.scopes is not None else sorted(self.profiler.names())
+        lines = []
+        for name in names:
+            stats = self.profiler.stats(name)
+            if stats is None:
+                continue
+            label = self._labels.get(name)
+            if label is None:
+                label = self._labels[name] = Label(font_size=self.font_size, z_index=self.z_index)
+            label.set_text(f"{name:<10} {stats['last']:6.2f} p95 {stats['p95']:6.2f} ms")
+            lines.append(label)
+        self._lines = lines
+        self._graph = self.profiler.samples(self.graph_scope)[-self.graph_size[0]:]
+
+        width = max([self.graph_size[0]] + [label.rect.width for label in lines]) + 8
+        height = sum(label.rect.height for label in lines) + self.graph_size[1] + 12
+        self.size = (width, height)
+        self.rect.size = self.size
+        self._version += 1
+        self.mark_dirty()
+
+    def _visual_state(self):
+        return (self._version, self.rect.size)
+
+    def _draw(self, surface: pygame.Surface, rect: pygame.Rect) -> None:
+        surface.fill((0, 0, 0, 170), rect)
+        y = rect.top + 4
+        for label in self._lines:
+            surface.blit(label.surface, (rect.left + 4, y))
+            y += label.rect.height
+
+        # Gráfica de barras de los últimos frames; la línea marca el presupuesto
+        graph = pygame.Rect(rect.left + 4, y + 4, self.graph_size[0], self.graph_size[1])
+        pygame.draw.rect(surface, (60, 60, 60), graph, 1)
+        if not self._graph:
+            return
+        top = max(max(self._graph), self.budget_ms * 1.5)
+        scale = graph.height / top
+        for i, value in enumerate(self._graph):
+            bar = max(1, int(value * scale))
+            color = (90, 200, 90) if value <= self.budget_ms else (220, 80, 60)
+            x = graph.left + i
+            pygame.draw.line(surface, color, (x, graph.bottom - 1), (x, graph.bottom - bar))
+        budget_y = graph.bottom - int(self.budget_ms * scale)
+        pygame.draw.line(surface, (200, 200, 80), (graph.left, budget_y), (graph.right - 1, budget_y))
+
+    def is_interactable(self) -> bool:
+        return False
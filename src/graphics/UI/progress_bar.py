@@ -0,0 +1,51 @@
+import pygame
+from typing import Any, Callable, Tuple, Union
+from .ui_element import UIElement
+
+class ProgressBar(UIElement):
+    """Barra de progreso ligada a un valor entre 0 y 1 (o a una función que lo
+    devuelve, como AssetLoader.get_progress). Solo se redibuja cuando el
+    relleno cambia de píxel"""
+
+    def __init__(self, position: Tuple[float, float], size: Tuple[int, int],
+                 variable: Union[float, Callable[[], float]] = 0.0,
+                 color: Tuple[int, int, int] = (90, 200, 90),
+                 background_color: Tuple[int, int, int] = (40, 40, 40),
+                 border_color: Tuple[int, int, int] = (200, 200, 200),
+                 z_index: int = 100):
+        super().__init__(position, size, z_index)
+        self.variable = variable
+        self.color = color
+        self.background_color = background_color
+        self.border_color = border_color
+        self.value = 0.0
+        self.update()
+
+    def update(self) -> None:
+        value = self.variable() if callable(self.variable) else self.variable
+        value = min(1.0, max(0.0, float(value)))
+        if self._fill_width(value) != self._fill_width(self.value):
+            self.value = value
+            self.mark_dirty()
+        else:
+            self.value = value
+
+    def set_value(self, variable: Union[float, Callable[[], Any]]) -> None:
+        self.variable = variable
+        self.update()
+
+    def _fill_width(self, value: float) -> int:
+        return int((self.rect.width - 4) * value)
+
+    def _visual_state(self):
+        return (self._fill_width(self.value), self.color, self.rect.size)
+
+    def _draw(self, surface: pygame.Surface, rect: pygame.Rect) -> None:
+        pygame.draw.rect(surface, self.background_color, rect)
+        fill = self._fill_width(self.value)
+        if fill > 0:
+            pygame.draw.rect(surface, self.color, (rect.left + 2, rect.top + 2, fill, rect.height - 4))
+        pygame.draw.rect(surface, self.border_color, rect, 1)
+
+    def is_interactable(self) -> bool:
+        return False
@@ -2,14 +2,17 @@
 import pygame
 from typing import Optional
 from .ui_element import UIElement
+from .font_cache import get_font, render_text
 from ...core.event_manager import Event, EventType
 
 class TextField(UIElement):
+    focusable = True
+
     def __init__(self, position, size, placeholder="", max_length=20, color=(255, 255, 255), font_size=24):
         super().__init__(position, size, z_index=100)
         self.placeholder = placeholder
         self.color = color
-        self.font = pygame.font.Font(None, font_size)
+        self.font = get_font(None, font_size)
         self.text = ""
         self.active = False
         self.cursor_visible = False
@@ -19,6 +22,20 @@ class TextField(UIElement):
         self.on_submit = None
 
     def _handle_self_event(self, event: pygame.event.Event) -> Optional[Event]:
+        state = (self.active, self.text)
+        result = self._handle_text_event(event)
+        if (self.active, self.text) != state:
+            self.mark_dirty()
+        return result
+
+    def update(self) -> None:
+        """Marca el campo para redibujar cuando el cursor cambia de fase"""
+        cursor_visible = self.active and pygame.time.get_ticks() % 1000 < 500
+        if cursor_visible != self.cursor_visible:
+            self.cursor_visible = cursor_visible
+            self.mark_dirty()
+
+    def _handle_text_event(self, event: pygame.event.Event) -> Optional[Event]:
         if event.type == pygame.MOUSEBUTTONDOWN:
             was_active = self.active
             self.active = self.rect.collidepoint(event.pos)
@@ -71,27 +88,31 @@ class TextField(UIElement):
         """Establece el callback para cuando se envía el texto"""
         self.on_submit = callback
 
-    def _render_self(self, surface):
+    def _visual_state(self):
+        # cursor_visible se actualiza una vez por frame en update()
+        return (self.active, self.text, self.cursor_visible, self.placeholder, self.rect.size)
+
+    def _draw(self, surface, rect):
         # Dibuja el fondo
         border_color = (0, 255, 0) if self.active else (128, 128, 128)
-        pygame.draw.rect(surface, border_color, self.rect, 2)
-        pygame.draw.rect(surface, (255, 255, 255), self.rect.inflate(-4, -4))
+        pygame.draw.rect(surface, border_color, rect, 2)
+        pygame.draw.rect(surface, (255, 255, 255), rect.inflate(-4, -4))
 
         # Renderiza el texto o placeholder
         display_text = self.text or self.placeholder
         text_color = (0, 0, 0) if self.text else (128, 128, 128)
-        text_surface = self.font.render(display_text, True, text_color)
+        text_surface = render_text(self.font, display_text, text_color)
         
         # Centra el texto verticalmente y alinea a la izquierda
         text_rect = text_surface.get_rect(
-            midleft=(self.rect.left + 5, self.rect.centery)
+            midleft=(rect.left + 5, rect.centery)
         )
         surface.blit(text_surface, text_rect)
 
         # Dibuja el cursor si está activo
         if self.active:
             cursor_x = text_rect.right + 2
-            if pygame.time.get_ticks() % 1000 < 500:  # Parpadeo del cursor
+            if self.cursor_visible:  # Parpadeo del cursor
                 pygame.draw.line(surface, (0, 0, 0),
-                               (cursor_x, self.rect.top + 5),
-                               (cursor_x, self.rect.bottom - 5))
\ No newline at end of file
+                               (cursor_x, rect.top + 5),
+                               (cursor_x, rect.bottom - 5))
@@ -5,6 +5,9 @@ from typing import Tuple, Optional
 from ...core.event_manager import Event
 
 class UIElement(Renderable, Interactive):
+    # Si puede recibir el foco del teclado al hacer clic
+    focusable = False
+
     def __init__(self, position: Tuple[float, float], size: Tuple[int, int], z_index: int = 100):
         super().__init__(position, z_index)
         self.size = size
@@ -12,6 +15,14 @@ class UIElement(Renderable, Interactive):
         self.enabled = True
         self.parent = None
         self.children = []
+        # Superficie retenida del propio elemento y estado con el que se dibujó
+        self._cached_surface: Optional[pygame.Surface] = None
+        self._cached_state: Optional[tuple] = None
+        # Con cache_subtree el elemento y sus hijos se componen en una sola superficie
+        self.cache_subtree = False
+        self._subtree_surface: Optional[pygame.Surface] = None
+        self._subtree_rect: Optional[pygame.Rect] = None
+        self._subtree_dirty = True
 
     def is_interactable(self) -> bool:
         return self.enabled and self.visible
@@ -28,6 +39,12 @@ class UIElement(Renderable, Interactive):
                 
         return self._handle_self_event(event)
 
+    def dispatch_event(self, event: pygame.event.Event) -> Optional[Event]:
+        """Entrega el evento solo a este elemento (sin recorrer los hijos)"""
+        if not self.is_interactable():
+            return None
+        return self._handle_self_event(event)
+
     def _handle_self_event(self, event: pygame.event.Event) -> Optional[Event]:
         """Implementado por las subclases para manejar sus propios eventos"""
         return None
@@ -35,10 +52,25 @@ class UIElement(Renderable, Interactive):
     def update_rect(self):
         """Actualiza el rectángulo de colisión cuando la posición cambia"""
         self.rect.topleft = self.get_absolute_position()
+        self.mark_dirty()
 
     def add_child(self, child: 'UIElement') -> None:
         child.parent = self
         self.children.append(child)
+        self.mark_dirty()
+
+    def mark_dirty(self) -> None:
+        self._subtree_dirty = True
+        super().mark_dirty()
+        # Los hijos se dibujan dentro del render del padre
+        if self.parent is not None:
+            self.parent.mark_dirty()
+
+    def get_bounds(self) -> pygame.Rect:
+        """Área ocupada por el elemento y todos sus hijos"""
+        if not self.children:
+            return self.rect.copy()
+        return self.rect.unionall([child.get_bounds() for child in self.children])
 
     def get_absolute_position(self) -> Tuple[float, float]:
         if self.parent is None:
@@ -50,11 +82,55 @@ class UIElement(Renderable, Interactive):
     def render(self, surface: pygame.Surface) -> None:
         if not self.visible:
             return
+        self._render_tree(surface, (0, 0))
+
+    def _render_tree(self, surface: pygame.Surface, offset: Tuple[int, int]) -> None:
+        """Dibuja el elemento y sus hijos desplazados por offset"""
+        if self.cache_subtree:
+            cached, bounds = self._get_subtree_surface()
+            surface.blit(cached, bounds.move(offset))
+            return
         # Renderiza primero este elemento
-        self._render_self(surface)
+        self._render_self(surface, self.rect.move(offset))
         # Luego renderiza los hijos
         for child in self.children:
-            child.render(surface)
+            if child.visible:
+                child._render_tree(surface, offset)
+
+    def _get_subtree_surface(self) -> Tuple[pygame.Surface, pygame.Rect]:
+        """Composición cacheada del subárbol; se rehace cuando algo en él marca dirty"""
+        bounds = self.get_bounds()
+        if self._subtree_surface is None or self._subtree_surface.get_size() != bounds.size:
+            self._subtree_surface = pygame.Surface(bounds.size, pygame.SRCALPHA)
+            self._subtree_dirty = True
+        elif self._subtree_rect != bounds:
+            self._subtree_dirty = True
+        if self._subtree_dirty:
+            self._subtree_surface.fill((0, 0, 0, 0))
+            offset = (-bounds.x, -bounds.y)
+            self._render_self(self._subtree_surface, self.rect.move(offset))
+            for child in self.children:
+                if child.visible:
+                    child._render_tree(self._subtree_surface, offset)
+            self._subtree_rect = bounds
+            self._subtree_dirty = False
+        return self._subtree_surface, bounds
+
+    def _render_self(self, surface: pygame.Surface, rect: pygame.Rect) -> None:
+        """Dibuja este elemento en rect, reutilizando su superficie si el estado no cambió"""
+        state = self._visual_state()
+        if state is None:
+            self._draw(surface, rect)
+            return
+        if state != self._cached_state or self._cached_surface is None:
+            self._cached_surface = pygame.Surface(rect.size, pygame.SRCALPHA)
+            self._draw(self._cached_surface, self._cached_surface.get_rect())
+            self._cached_state = state
+        surface.blit(self._cached_surface, rect)
+
+    def _visual_state(self) -> Optional[tuple]:
+        """Todo lo que afecta al aspecto del elemento. None desactiva la caché"""
+        return None
 
-    def _render_self(self, surface: pygame.Surface) -> None:
-        pass  # Implementado por las subclases
\ No newline at end of file
+    def _draw(self, surface: pygame.Surface, rect: pygame.Rect) -> None:
+        pass  # Implementado por las subclases
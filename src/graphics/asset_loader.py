@@ -0,0 +1,97 @@
+import os
+import time
+import pygame
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from config.constants import ASSET_LOADER_WORKERS
+from .asset_manager import AssetManager, get_asset_manager
+
+class AssetLoader:
+    """Carga texturas en segundo plano y las registra en el AssetManager.
+
+    Los PNG se decodifican en un pool de hilos; la conversión al formato de la
+    pantalla y el registro en la caché se hacen en el hilo principal al llamar
+    a process() (una vez por frame o en el bucle de la pantalla de carga).
+    load_async devuelve un Future que se completa con la superficie convertida.
+    """
+
+    def __init__(self, asset_manager: Optional[AssetManager] = None,
+                 max_workers: int = ASSET_LOADER_WORKERS):
+        self.asset_manager = asset_manager or get_asset_manager()
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="asset-loader")
+        # ruta -> (decodificación en el pool, Future que ve quien pidió la carga)
+        self._in_flight: Dict[str, Tuple[Future, Future]] = {}
+        self.total = 0
+        self.completed = 0
+        self.failed: List[Tuple[str, BaseException]] = []
+
+    def load_async(self, path: str) -> Future:
+        """Pide la textura; si ya estaba cargada el Future se devuelve completado"""
+        path = os.path.normpath(path)
+        in_flight = self._in_flight.get(path)
+        if in_flight is not None:
+            return in_flight[1]
+        result: Future = Future()
+        if self.asset_manager.contains(path):
+            result.set_result(self.asset_manager.load(path))
+            return result
+        self.total += 1
+        self._in_flight[path] = (self._executor.submit(pygame.image.load, path), result)
+        return result
+
+    def load_all(self, paths: Iterable[str]) -> List[Future]:
+        return [self.load_async(path) for path in paths]
+
+    def process(self, time_budget: Optional[float] = None) -> int:
+        """Convierte y registra las texturas ya decodificadas (hilo principal).
+        time_budget limita los segundos dedicados por llamada. Devuelve cuántas terminó"""
+        start = time.perf_counter()
+        finished = 0
+        for path, (decoding, result) in list(self._in_flight.items()):
+            if not decoding.done():
+                continue
+            del self._in_flight[path]
+            error = decoding.exception()
+            if error is not None:
+                self.failed.append((path, error))
+                result.set_exception(error)
+            else:
+                surface = self.asset_manager.to_display_format(decoding.result())
+                self.asset_manager.put(path, surface)
+                result.set_result(surface)
+            self.completed += 1
+            finished += 1
+            if time_budget is not None and time.perf_counter() - start >= time_budget:
+                break
+        return finished
+
+    def wait(self, timeout: Optional[float] = None,
+             on_progress: Optional[Callable[[float], None]] = None) -> bool:
+        """Procesa hasta que no quede nada pendiente; on_progress se llama en cada
+        vuelta (por ejemplo para dibujar la pantalla de carga). False si vence timeout"""
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        while self._in_flight:
+            self.process()
+            if on_progress is not None:
+                on_progress(self.get_progress())
+            if deadline is not None and time.perf_counter() >= deadline:
+                return False
+            if self._in_flight:
+                time.sleep(0.001)
+        return True
+
+    def get_progress(self) -> float:
+        """Fracción completada (0 a 1) de todo lo pedido hasta ahora"""
+        if self.total == 0:
+            return 1.0
+        return self.completed / self.total
+
+    def is_done(self) -> bool:
+        return not self._in_flight
+
+    @property
+    def pending(self) -> int:
+        return len(self._in_flight)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
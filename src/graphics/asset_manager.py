@@ -0,0 +1,245 @@
+import os
+import threading
+import pygame
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from config.constants import ASSET_CACHE_BUDGET
+
+# Flags para las variantes escaladas
+SCALE_SMOOTH = 1
+
+class AssetManager:
+    """Caché compartida de texturas: decodifica cada archivo una sola vez y
+    guarda variantes escaladas indexadas por (ruta, tamaño, flags) con
+    expulsión LRU según un presupuesto de bytes."""
+
+    def __init__(self, budget_bytes: int = ASSET_CACHE_BUDGET):
+        self.budget_bytes = budget_bytes
+        self._cache: "OrderedDict[Tuple[str, Optional[Tuple[int, int]], int], pygame.Surface]" = OrderedDict()
+        self._bytes = 0
+        # Bytes contados por entrada; las variantes que son la propia
+        # original (mismo tamaño) comparten superficie y cuentan 0
+        self._entry_bytes: Dict[Tuple[str, Optional[Tuple[int, int]], int], int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # Los chunks del mundo se hornean también desde un hilo de fondo
+        self._lock = threading.RLock()
+        # Ruta normalizada de la imagen original -> (atlas, nombre del sprite)
+        self._atlas_sprites: Dict[str, Tuple[object, str]] = {}
+        # Texturas fijadas (páginas del atlas): fuera del LRU y del presupuesto.
+        # None indica que está fijada pero aún no se ha cargado
+        self._pinned: Dict[str, Optional[pygame.Surface]] = {}
+
+    @staticmethod
+    def _normalize(path: str) -> str:
+        return os.path.normpath(path)
+
+    @staticmethod
+    def _surface_bytes(surface: pygame.Surface) -> int:
+        return surface.get_pitch() * surface.get_height()
+
+    def _get(self, key) -> Optional[pygame.Surface]:
+        surface = self._cache.get(key)
+        if surface is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._cache.move_to_end(key)
+        return surface
+
+    def _put(self, key, surface: pygame.Surface, shared: bool = False) -> None:
+        """Guarda la superficie; shared indica que ya está contada en otra entrada"""
+        if self._cache.pop(key, None) is not None:
+            self._bytes -= self._entry_bytes.pop(key)
+        size = 0 if shared else self._surface_bytes(surface)
+        self._cache[key] = surface
+        self._entry_bytes[key] = size
+        self._bytes += size
+        self._evict()
+
+    def _evict(self) -> None:
+        """Expulsa las entradas menos usadas hasta respetar el presupuesto"""
+        # Siempre se conserva al menos la última entrada insertada
+        while self._bytes > self.budget_bytes and len(self._cache) > 1:
+            key, surface = self._cache.popitem(last=False)
+            self._bytes -= self._entry_bytes.pop(key)
+            self.evictions += 1
+            if key[1] is None:
+                self._recount_shared(key[0], surface)
+
+    def _recount_shared(self, path: str, surface: pygame.Surface) -> None:
+        """Al expulsar una original, su memoria pasa a contarse en una variante
+        que comparte la misma superficie, si queda alguna"""
+        for key in self._cache:
+            if key[0] == path and self._cache[key] is surface and not self._entry_bytes[key]:
+                size = self._entry_bytes[key] = self._surface_bytes(surface)
+                self._bytes += size
+                return
+
+    def _decode(self, path: str) -> pygame.Surface:
+        return self.to_display_format(pygame.image.load(path))
+
+    @staticmethod
+    def to_display_format(surface: pygame.Surface) -> pygame.Surface:
+        """Convierte la superficie al formato de la pantalla (solo en el hilo principal)"""
+        try:
+            return surface.convert_alpha()
+        except pygame.error:
+            # Sin modo de vídeo todavía no se puede convertir al formato de pantalla
+            return surface
+
+    def contains(self, path: str) -> bool:
+        """Indica si la textura original ya está decodificada en la caché"""
+        path = self._normalize(path)
+        with self._lock:
+            return (path in self._atlas_sprites or self._pinned.get(path) is not None
+                    or (path, None, 0) in self._cache)
+
+    def load(self, path: str) -> pygame.Surface:
+        """Devuelve la textura original, decodificándola solo la primera vez"""
+        key = (self._normalize(path), None, 0)
+        with self._lock:
+            in_atlas = self._atlas_sprites.get(key[0])
+            if in_atlas is not None:
+                # Subsuperficie de una página del atlas, sin copia propia;
+                # el atlas ya está en memoria, así que cuenta como acierto
+                self.hits += 1
+                atlas, name = in_atlas
+                return atlas.get(name)
+            if key[0] in self._pinned:
+                surface = self._pinned[key[0]]
+                if surface is None:
+                    self.misses += 1
+                    surface = self._pinned[key[0]] = self._decode(key[0])
+                else:
+                    self.hits += 1
+                return surface
+            surface = self._get(key)
+            if surface is None:
+                surface = self._decode(key[0])
+                self._put(key, surface)
+            return surface
+
+    def pin(self, path: str) -> None:
+        """Fija la textura: no se expulsa ni cuenta en el presupuesto del LRU.
+        Puede llamarse antes de cargarla (load, put o un AssetLoader la guardan fijada)"""
+        path = self._normalize(path)
+        with self._lock:
+            if path in self._pinned:
+                return
+            key = (path, None, 0)
+            surface = self._cache.pop(key, None)
+            if surface is not None:
+                self._bytes -= self._entry_bytes.pop(key)
+            self._pinned[path] = surface
+
+    def unpin(self, path: str) -> None:
+        """Devuelve la textura al LRU"""
+        path = self._normalize(path)
+        with self._lock:
+            surface = self._pinned.pop(path, None)
+            if surface is not None:
+                self._put((path, None, 0), surface)
+
+    def _original(self, path: str) -> Tuple[pygame.Surface, bool]:
+        """Textura original para crear una variante, sin tocar hits/misses (la
+        consulta ya se contó en la variante). Indica si su memoria ya está
+        contada en la caché o en un atlas"""
+        in_atlas = self._atlas_sprites.get(path)
+        if in_atlas is not None:
+            atlas, name = in_atlas
+            return atlas.get(name), True
+        if path in self._pinned:
+            surface = self._pinned[path]
+            if surface is None:
+                surface = self._pinned[path] = self._decode(path)
+            return surface, True
+        key = (path, None, 0)
+        surface = self._cache.get(key)
+        if surface is not None:
+            self._cache.move_to_end(key)
+            return surface, True
+        surface = self._decode(path)
+        self._put(key, surface)
+        # Si la propia original se expulsó al guardarla no está contada
+        return surface, key in self._cache
+
+    def register_atlas(self, atlas) -> None:
+        """Sirve desde el atlas las imágenes de su directorio de origen (ver TextureAtlas)"""
+        with self._lock:
+            for name in atlas.sprites:
+                path = self._normalize(os.path.join(atlas.source_dir, name))
+                self._atlas_sprites[path] = (atlas, name)
+
+    def get_scaled(self, path: str, size: Tuple[int, int], flags: int = SCALE_SMOOTH) -> pygame.Surface:
+        """Devuelve una variante escalada compartida de la textura"""
+        size = (max(1, int(size[0])), max(1, int(size[1])))
+        key = (self._normalize(path), size, flags)
+        with self._lock:
+            surface = self._get(key)
+            if surface is not None:
+                return surface
+
+            original, counted = self._original(key[0])
+            if original.get_size() == size:
+                # Misma superficie que la original: no se cuenta dos veces
+                self._put(key, original, shared=counted)
+                return original
+            if flags & SCALE_SMOOTH:
+                try:
+                    surface = pygame.transform.smoothscale(original, size)
+                except ValueError:
+                    # smoothscale solo acepta superficies de 24 o 32 bits
+                    surface = pygame.transform.scale(original, size)
+            else:
+                surface = pygame.transform.scale(original, size)
+            self._put(key, surface)
+            return surface
+
+    def put(self, path: str, surface: pygame.Surface) -> None:
+        """Registra una textura ya decodificada (por ejemplo, desde otro cargador)"""
+        path = self._normalize(path)
+        with self._lock:
+            if path in self._pinned:
+                self._pinned[path] = surface
+            else:
+                self._put((path, None, 0), surface)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+            self._entry_bytes.clear()
+            self._bytes = 0
+            self._pinned.clear()
+
+    @property
+    def used_bytes(self) -> int:
+        return self._bytes
+
+    def stats(self) -> Dict[str, int]:
+        """Devuelve los contadores de aciertos/fallos y el uso de memoria"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._cache),
+            "bytes": self._bytes,
+            "budget_bytes": self.budget_bytes,
+            "pinned": len(self._pinned),
+            "pinned_bytes": sum(self._surface_bytes(surface)
+                                for surface in self._pinned.values() if surface is not None),
+        }
+
+    def __str__(self):
+        return (f"AssetManager: {len(self._cache)} entradas, {self._bytes} bytes, "
+                f"hits={self.hits}, misses={self.misses}")
+
+_default_asset_manager: Optional[AssetManager] = None
+
+def get_asset_manager() -> AssetManager:
+    """Devuelve la caché de texturas compartida por todo el proceso"""
+    global _default_asset_manager
+    if _default_asset_manager is None:
+        _default_asset_manager = AssetManager()
+    return _default_asset_manager
@@ -0,0 +1,97 @@
+import pygame
+from typing import Optional, Tuple
+from .renderable import Renderable
+
+class Camera:
+    """Vista sobre el mundo: posición (esquina superior izquierda), zoom,
+    objetivo a seguir y límites opcionales."""
+
+    def __init__(self, viewport_size: Tuple[int, int],
+                 position: Tuple[float, float] = (0, 0),
+                 zoom: float = 1.0,
+                 bounds: Optional[pygame.Rect] = None):
+        self.viewport_size = viewport_size
+        self.position = position
+        # Posición al empezar el último paso, para interpolar entre pasos
+        self.previous_position = position
+        self.zoom = zoom
+        self.bounds = bounds
+        self.target: Optional[Renderable] = None
+        self.follow_speed = 1.0  # 1.0 = seguir al objetivo sin suavizado
+
+    def follow(self, target: Optional[Renderable], follow_speed: float = 1.0) -> None:
+        """Hace que la cámara centre al objetivo en cada update"""
+        self.target = target
+        self.follow_speed = follow_speed
+
+    def set_zoom(self, zoom: float) -> None:
+        # Mantener el centro de la vista al cambiar el zoom
+        center = self.get_view_rect().center
+        self.zoom = max(0.01, zoom)
+        self.center_on(center)
+
+    def snap(self) -> None:
+        """La posición actual se dibuja tal cual, sin interpolar desde la anterior"""
+        self.previous_position = self.position
+
+    def get_interpolated_position(self, alpha: float = 1.0) -> Tuple[float, float]:
+        """Posición entre la del paso anterior (alpha 0) y la actual (alpha 1)"""
+        if alpha >= 1.0:
+            return self.position
+        px, py = self.previous_position
+        x, y = self.position
+        return (px + (x - px) * alpha, py + (y - py) * alpha)
+
+    def get_view_size(self) -> Tuple[int, int]:
+        """Tamaño en coordenadas del mundo de la zona visible"""
+        return (max(1, int(self.viewport_size[0] / self.zoom)),
+                max(1, int(self.viewport_size[1] / self.zoom)))
+
+    def get_view_rect(self, alpha: float = 1.0) -> pygame.Rect:
+        x, y = self.get_interpolated_position(alpha)
+        return pygame.Rect((int(x), int(y)), self.get_view_size())
+
+    def center_on(self, point: Tuple[float, float]) -> None:
+        """Salta a centrar el punto (sin interpolar desde la posición anterior)"""
+        width, height = self.get_view_size()
+        self.position = (point[0] - width / 2, point[1] - height / 2)
+        self._clamp()
+        self.snap()
+
+    def _clamp(self) -> None:
+        if self.bounds is None:
+            return
+        width, height = self.get_view_size()
+        x, y = self.position
+        # Si el nivel es más pequeño que la vista se alinea a su esquina
+        x = max(self.bounds.left, min(x, self.bounds.right - width))
+        y = max(self.bounds.top, min(y, self.bounds.bottom - height))
+        self.position = (x, y)
+
+    def update(self) -> None:
+        """Un paso fijo de simulación: sigue al objetivo"""
+        self.previous_position = self.position
+        if self.target is None:
+            self._clamp()
+            return
+        width, height = self.get_view_size()
+        goal_x = self.target.position[0] - width / 2
+        goal_y = self.target.position[1] - height / 2
+        x, y = self.position
+        self.position = (x + (goal_x - x) * self.follow_speed,
+                         y + (goal_y - y) * self.follow_speed)
+        self._clamp()
+
+    def get_offset(self, alpha: float = 1.0) -> Tuple[int, int]:
+        """Traslación que se aplica a los objetos del mundo al dibujarlos, con la
+        posición interpolada igual que la de los objetos"""
+        x, y = self.get_interpolated_position(alpha)
+        return (-int(x), -int(y))
+
+    def world_to_screen(self, point: Tuple[float, float]) -> Tuple[float, float]:
+        return ((point[0] - self.position[0]) * self.zoom,
+                (point[1] - self.position[1]) * self.zoom)
+
+    def screen_to_world(self, point: Tuple[float, float]) -> Tuple[float, float]:
+        return (point[0] / self.zoom + self.position[0],
+                point[1] / self.zoom + self.position[1])
@@ -0,0 +1,225 @@
+"""Partículas en arrays de NumPy.
+
+ParticlePool guarda posición, velocidad, edad, vida y color de cada
+partícula en arrays contiguos; las vivas ocupan siempre [0, count), así que
+la actualización es una sola pasada vectorizada y las muertas se compactan
+moviendo las últimas a sus huecos. ParticleEmitter es un Renderable que
+genera partículas en una zona y las dibuja con un solo blits() a partir de
+unos pocos sprites pre-teñidos (un círculo por color y nivel de desvanecido).
+"""
+import math
+import numpy as np
+import pygame
+from typing import Optional, Sequence, Tuple
+from config.constants import PARTICLE_CAPACITY, PARTICLE_FADE_STEPS
+from .renderable import Renderable
+
+class ParticlePool:
+    """Partículas de tamaño fijo; si el pool está lleno las nuevas se descartan"""
+
+    def __init__(self, capacity: int = PARTICLE_CAPACITY):
+        self.capacity = capacity
+        self.count = 0
+        self.position = np.zeros((capacity, 2), dtype=np.float32)
+        self.previous = np.zeros((capacity, 2), dtype=np.float32)
+        self.velocity = np.zeros((capacity, 2), dtype=np.float32)
+        self.age = np.zeros(capacity, dtype=np.float32)
+        self.lifetime = np.ones(capacity, dtype=np.float32)
+        # Índice en la paleta del emisor
+        self.color = np.zeros(capacity, dtype=np.uint8)
+
+    def emit(self, positions: np.ndarray, velocities: np.ndarray, lifetimes: np.ndarray,
+             colors: np.ndarray) -> int:
+        """Añade partículas; devuelve cuántas cupieron"""
+        amount = min(len(positions), self.capacity - self.count)
+        if amount <= 0:
+            return 0
+        new = slice(self.count, self.count + amount)
+        self.position[new] = positions[:amount]
+        self.previous[new] = positions[:amount]
+        self.velocity[new] = velocities[:amount]
+        self.age[new] = 0
+        self.lifetime[new] = lifetimes[:amount]
+        self.color[new] = colors[:amount]
+        self.count += amount
+        return amount
+
+    def update(self, dt: float, gravity: float = 0.0, drag: float = 0.0) -> None:
+        n = self.count
+        if n == 0:
+            return
+        velocity = self.velocity[:n]
+        if gravity:
+            velocity[:, 1] += np.float32(gravity * dt)
+        if drag:
+            velocity *= np.float32(max(0.0, 1.0 - drag * dt))
+        self.previous[:n] = self.position[:n]
+        self.position[:n] += velocity * np.float32(dt)
+        self.age[:n] += np.float32(dt)
+        self._compact(np.flatnonzero(self.age[:n] >= self.lifetime[:n]))
+
+    def _compact(self, dead: np.ndarray) -> None:
+        """Swap-remove: las vivas del final ocupan los huecos de las muertas"""
+        if not len(dead):
+            return
+        n = self.count
+        remaining = n - len(dead)
+        holes = dead[dead < remaining]
+        if len(holes):
+            tail = np.ones(n - remaining, dtype=bool)
+            tail[dead[dead >= remaining] - remaining] = False
+            movers = np.flatnonzero(tail) + remaining
+            for array in (self.position, self.previous, self.velocity, self.age,
+                          self.lifetime, self.color):
+                array[holes] = array[movers]
+        self.count = remaining
+
+    def clear(self) -> None:
+        self.count = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+class ParticleEmitter(Renderable):
+    """Genera partículas en una zona y las dibuja como un único Renderable.
+
+    rate son partículas por segundo (0 para usar solo burst); speed, angle (en
+    grados) y lifetime son rangos de los que se sortea cada partícula. La
+    simulación avanza en update(), que el Renderer llama en cada paso fijo."""
+
+    def __init__(self, position: Tuple[float, float], zone_size: Tuple[float, float] = (0, 0),
+                 rate: float = 100.0,
+                 lifetime: Tuple[float, float] = (0.5, 1.5),
+                 speed: Tuple[float, float] = (50.0, 150.0),
+                 angle: Tuple[float, float] = (0.0, 360.0),
+                 colors: Sequence[Tuple[int, int, int]] = ((255, 200, 50),),
+                 radius: float = 3.0,
+                 gravity: float = 0.0,
+                 drag: float = 0.0,
+                 capacity: int = PARTICLE_CAPACITY,
+                 z_index: int = 0,
+                 seed: Optional[int] = None):
+        super().__init__(position, z_index)
+        self.zone_size = zone_size
+        self.rate = rate
+        self.lifetime = lifetime
+        self.speed = speed
+        self.angle = angle
+        self.colors = [tuple(color[:3]) for color in colors]
+        self.radius = radius
+        self.gravity = gravity
+        self.drag = drag
+        self.emitting = True
+        self.pool = ParticlePool(capacity)
+        self._rng = np.random.default_rng(seed)
+        self._spawn_accumulator = 0.0
+        # Array de objetos: se indexa de una vez con los índices de sprite
+        self._sprites = np.empty(0, dtype=object)
+        self._sprite_half = 0.0
+        self._bounds: Optional[pygame.Rect] = None
+        self._build_sprites()
+
+    def _build_sprites(self) -> None:
+        """Un círculo por color y nivel de desvanecido, a la escala de salida"""
+        radius = max(1, round(self.radius * self.render_scale))
+        size = radius * 2
+        sprites = []
+        for color in self.colors:
+            for step in range(PARTICLE_FADE_STEPS):
+                alpha = round(255 * (1 - step / PARTICLE_FADE_STEPS))
+                sprite = pygame.Surface((size, size), pygame.SRCALPHA)
+                pygame.draw.circle(sprite, (*color, alpha), (radius, radius), radius)
+                if pygame.display.get_surface() is not None:
+                    sprite = sprite.convert_alpha()
+                sprites.append(sprite)
+        self._sprites = np.empty(len(sprites), dtype=object)
+        self._sprites[:] = sprites
+        self._sprite_half = size / 2
+
+    def set_render_scale(self, scale: float) -> None:
+        if scale != self.render_scale:
+            super().set_render_scale(scale)
+            self._build_sprites()
+
+    def burst(self, count: int, position: Optional[Tuple[float, float]] = None) -> int:
+        """Emite count partículas de golpe (en la zona o en position)"""
+        rng = self._rng
+        if position is None:
+            x, y = self.position
+            width, height = self.zone_size
+            origin = np.column_stack((rng.uniform(x - width / 2, x + width / 2, count),
+                                      rng.uniform(y - height / 2, y + height / 2, count)))
+        else:
+            origin = np.tile(np.asarray(position, dtype=np.float32), (count, 1))
+        angles = np.radians(rng.uniform(self.angle[0], self.angle[1], count))
+        speeds = rng.uniform(self.speed[0], self.speed[1], count)
+        velocities = np.column_stack((np.cos(angles) * speeds, np.sin(angles) * speeds))
+        lifetimes = rng.uniform(self.lifetime[0], self.lifetime[1], count)
+        colors = rng.integers(0, len(self.colors), count)
+        return self.pool.emit(origin, velocities, lifetimes, colors)
+
+    def update(self, dt: float) -> None:
+        """Avanza un paso de simulación de dt segundos (el fixed_dt del juego)"""
+        had_particles = self.pool.count > 0
+        if self.emitting and self.rate > 0:
+            self._spawn_accumulator += self.rate * dt
+            count = int(self._spawn_accumulator)
+            if count:
+                self._spawn_accumulator -= count
+                self.burst(count)
+        self.pool.update(dt, self.gravity, self.drag)
+        if self.pool.count or had_particles:
+            self._update_bounds()
+            self.mark_dirty()
+
+    def _update_bounds(self) -> None:
+        """Caja de todas las partículas (y la zona), para el culling del Renderer"""
+        x, y = self.position
+        width, height = self.zone_size
+        left, top = x - width / 2, y - height / 2
+        right, bottom = x + width / 2, y + height / 2
+        n = self.pool.count
+        if n:
+            positions = self.pool.position[:n]
+            low = positions.min(axis=0)
+            high = positions.max(axis=0)
+            left, top = min(left, float(low[0])), min(top, float(low[1]))
+            right, bottom = max(right, float(high[0])), max(bottom, float(high[1]))
+        margin = self.radius + 1
+        self._bounds = pygame.Rect(math.floor(left - margin), math.floor(top - margin),
+                                   math.ceil(right - left + 2 * margin),
+                                   math.ceil(bottom - top + 2 * margin))
+
+    def get_bounds(self) -> pygame.Rect:
+        if self._bounds is None:
+            self._update_bounds()
+        return self._bounds
+
+    def render(self, surface: pygame.Surface, offset: Tuple[float, float] = (0, 0),
+               alpha: float = 1.0) -> None:
+        pool = self.pool
+        n = pool.count
+        if not self.visible or n == 0:
+            return
+        position = pool.position[:n]
+        if alpha < 1.0:
+            previous = pool.previous[:n]
+            position = previous + (position - previous) * np.float32(alpha)
+        half = self._sprite_half
+        topleft = position * np.float32(self.render_scale) + np.asarray(offset, dtype=np.float32) - half
+        clip = surface.get_clip()
+        inside = (topleft[:, 0] + 2 * half >= clip.left) & (topleft[:, 0] < clip.right) \
+            & (topleft[:, 1] + 2 * half >= clip.top) & (topleft[:, 1] < clip.bottom)
+        ids = np.flatnonzero(inside)
+        if not len(ids):
+            return
+        fade = np.minimum((pool.age[ids] / pool.lifetime[ids] * PARTICLE_FADE_STEPS).astype(np.intp),
+                          PARTICLE_FADE_STEPS - 1)
+        sprite_index = pool.color[ids].astype(np.intp) * PARTICLE_FADE_STEPS + fade
+        dest = topleft[ids].astype(np.intp)
+        batch = list(zip(self._sprites[sprite_index].tolist(),
+                         zip(dest[:, 0].tolist(), dest[:, 1].tolist())))
+        if hasattr(surface, "fblits"):
+            surface.fblits(batch)
+        else:
+            surface.blits(batch, doreturn=False)
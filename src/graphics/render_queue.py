@@ -0,0 +1,83 @@
+from bisect import bisect_left, insort
+from itertools import count
+from typing import Dict, Iterable, Iterator, List, Tuple
+from .renderable import Renderable
+
+class RenderQueue:
+    """Cola de renderizado ordenada por z-index que se mantiene de forma incremental.
+
+    Los z-index distintos se guardan ordenados (búsqueda binaria) y cada capa es
+    un dict usado como conjunto ordenado, así que añadir, quitar o cambiar el
+    z-index de un objeto no requiere reordenar nada en cada frame.
+    """
+
+    def __init__(self):
+        self._layers: Dict[int, Dict[Renderable, None]] = {}
+        self._z_order: List[int] = []
+        # (z-index, orden de inserción) de cada objeto: su posición en la cola.
+        # El z-index es el de la inserción (el del objeto puede cambiar después)
+        self._key_of: Dict[Renderable, Tuple[int, int]] = {}
+        self._sequence = count()
+
+    def __len__(self) -> int:
+        return len(self._key_of)
+
+    def __contains__(self, renderable: Renderable) -> bool:
+        return renderable in self._key_of
+
+    def __iter__(self) -> Iterator[Renderable]:
+        """Recorre los objetos de menor a mayor z-index"""
+        for z_index in self._z_order:
+            yield from self._layers[z_index]
+
+    def reversed(self) -> Iterator[Renderable]:
+        """Recorre los objetos de mayor a menor z-index (el último dibujado primero)"""
+        for z_index in reversed(self._z_order):
+            yield from reversed(self._layers[z_index])
+
+    def layers(self) -> Iterator[Tuple[int, Dict[Renderable, None]]]:
+        for z_index in self._z_order:
+            yield z_index, self._layers[z_index]
+
+    def sort(self, renderables: Iterable[Renderable]) -> List[Renderable]:
+        """Los objetos dados (de esta cola) en orden de dibujo; cuesta lo que
+        ordenar esos objetos, no lo que recorrer la cola entera"""
+        return sorted(renderables, key=self._key_of.__getitem__)
+
+    def add(self, renderable: Renderable) -> None:
+        if renderable in self._key_of:
+            return
+        z_index = renderable.z_index
+        layer = self._layers.get(z_index)
+        if layer is None:
+            layer = self._layers[z_index] = {}
+            insort(self._z_order, z_index)
+        layer[renderable] = None
+        self._key_of[renderable] = (z_index, next(self._sequence))
+
+    def remove(self, renderable: Renderable) -> bool:
+        """Quita el objeto; devuelve False si no estaba en la cola"""
+        key = self._key_of.pop(renderable, None)
+        if key is None:
+            return False
+        z_index = key[0]
+        layer = self._layers[z_index]
+        del layer[renderable]
+        if not layer:
+            del self._layers[z_index]
+            del self._z_order[bisect_left(self._z_order, z_index)]
+        return True
+
+    def update_z(self, renderable: Renderable) -> bool:
+        """Mueve el objeto a la capa de su z-index actual; devuelve True si cambió"""
+        key = self._key_of.get(renderable)
+        if key is None or key[0] == renderable.z_index:
+            return False
+        self.remove(renderable)
+        self.add(renderable)
+        return True
+
+    def clear(self) -> None:
+        self._layers.clear()
+        self._z_order.clear()
+        self._key_of.clear()
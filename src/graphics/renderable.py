@@ -1,13 +1,92 @@
 from abc import ABC, abstractmethod
 import pygame
-from typing import Tuple
+from typing import Callable, List, Optional, Tuple
 
 class Renderable(ABC):
+    # Número del paso de simulación actual (lo avanza Game en cada paso fijo)
+    simulation_tick = 0
+
     def __init__(self, position: Tuple[float, float], z_index: int = 0):
+        self._change_listeners: List[Callable[['Renderable'], None]] = []
+        # Posición al final del paso anterior, para interpolar al renderizar
+        self._previous_position = position
+        self._previous_tick = -1
         self.position = position
         self.z_index = z_index  # Para controlar el orden de renderizado
         self.visible = True
+        # Escala mundo -> pantalla con la que se dibuja (modo de escalado nativo)
+        self.render_scale = 1.0
+
+    @property
+    def position(self) -> Tuple[float, float]:
+        return self._position
+
+    @position.setter
+    def position(self, value: Tuple[float, float]) -> None:
+        if self._previous_tick != Renderable.simulation_tick:
+            # Primer movimiento de este paso: guardar de dónde venía
+            self._previous_position = getattr(self, '_position', value)
+            self._previous_tick = Renderable.simulation_tick
+        self._position = value
+        if self._change_listeners:
+            self.mark_dirty()
+
+    @property
+    def z_index(self) -> int:
+        return self._z_index
+
+    @z_index.setter
+    def z_index(self, value: int) -> None:
+        # Los renderers reordenan su cola al recibir el aviso
+        self._z_index = value
+        if self._change_listeners:
+            self.mark_dirty()
+
+    @classmethod
+    def advance_tick(cls) -> None:
+        """Marca el inicio de un nuevo paso de simulación"""
+        cls.simulation_tick += 1
+
+    def get_interpolated_position(self, alpha: float) -> Tuple[float, float]:
+        """Posición entre el paso anterior (alpha=0) y el actual (alpha=1)"""
+        if alpha >= 1.0 or self._previous_tick != Renderable.simulation_tick:
+            # No se movió en el último paso
+            return self._position
+        px, py = self._previous_position
+        x, y = self._position
+        return (px + (x - px) * alpha, py + (y - py) * alpha)
+
+    def add_change_listener(self, listener: Callable[['Renderable'], None]) -> None:
+        """Registra un callback que se llama cuando el objeto se mueve o cambia su aspecto"""
+        self._change_listeners.append(listener)
+
+    def remove_change_listener(self, listener: Callable[['Renderable'], None]) -> None:
+        if listener in self._change_listeners:
+            self._change_listeners.remove(listener)
+
+    def mark_dirty(self) -> None:
+        """Avisa de que el objeto debe redibujarse (se movió o cambió su aspecto)"""
+        for listener in self._change_listeners:
+            listener(self)
+
+    def set_render_scale(self, scale: float) -> None:
+        """Cambia la escala de salida; las subclases pre-escalan aquí sus recursos"""
+        self.render_scale = scale
+
+    def get_bounds(self) -> Optional[pygame.Rect]:
+        """Rectángulo en coordenadas del mundo que ocupa el objeto.
+        None indica que no tiene límites conocidos y siempre se renderiza"""
+        return None
+
+    def get_blit(self, offset: Tuple[float, float] = (0, 0),
+                 alpha: float = 1.0) -> Optional[Tuple[pygame.Surface, Tuple[int, int]]]:
+        """(superficie, destino) si el objeto se dibuja con un único blit, para que
+        el Renderer lo envíe junto a otros en un solo blits(). None usa render()"""
+        return None
 
     @abstractmethod
-    def render(self, surface: pygame.Surface) -> None:
-        pass
\ No newline at end of file
+    def render(self, surface: pygame.Surface, offset: Tuple[float, float] = (0, 0),
+               alpha: float = 1.0) -> None:
+        """Dibuja el objeto desplazado por offset (la traslación de la cámara).
+        alpha es la fracción de paso de simulación para interpolar el movimiento"""
+        pass
@@ -1,86 +1,453 @@
+import math
+import time
 import pygame
-from typing import List, Dict, Tuple, Optional
+from enum import Enum
+from itertools import groupby
+from operator import attrgetter
+from typing import Iterable, List, Dict, Set, Tuple, Optional
 from .renderable import Renderable
+from .render_queue import RenderQueue
+from .camera import Camera
 from .UI.ui_element import UIElement
+from .UI.event_router import UIEventRouter
 from ..core.game_object import GameObject
 from ..core.event_manager import Event
+from ..core.profiler import get_profiler
+from ..world.spatial_hash import SpatialHash
+
+class ScaleMode(Enum):
+    SMOOTH = "smooth"      # smoothscale de la superficie virtual (por defecto)
+    NEAREST = "nearest"    # vecino más cercano, escala fraccionaria
+    INTEGER = "integer"    # vecino más cercano, solo múltiplos enteros (pixel-perfect)
+    NATIVE = "native"      # recursos pre-escalados y dibujo directo a la pantalla
 
 class Renderer:
-    def __init__(self, screen: pygame.Surface, virtual_size: Tuple[int, int] = (800, 600)):
+    def __init__(self, screen: pygame.Surface, virtual_size: Tuple[int, int] = (800, 600),
+                 camera: Optional[Camera] = None, cell_size: int = 256,
+                 dirty_rects: bool = False, scale_mode: ScaleMode = ScaleMode.SMOOTH):
         self.screen = screen
         self.virtual_size = virtual_size
         # Superficie virtual con resolución base
         self.virtual_surface = pygame.Surface(virtual_size, pygame.SRCALPHA)
-        self.renderables: Dict[int, List[Renderable]] = {}
         self.ui_layer = pygame.Surface(virtual_size, pygame.SRCALPHA)
         self.game_layer = pygame.Surface(virtual_size, pygame.SRCALPHA)
+        self.camera = camera or Camera(virtual_size)
+        # Índice espacial de los objetos del mundo con límites conocidos
+        self.spatial_index = SpatialHash(cell_size)
+        # Objetos del mundo sin límites: se renderizan siempre
+        self._unbounded: Dict[Renderable, None] = {}
+        # Colas ordenadas por z-index; la interfaz no pasa por la cámara
+        self.world_queue = RenderQueue()
+        self.ui_queue = RenderQueue()
+        # Enrutado de eventos de la UI por hit-testing
+        self.ui_router = UIEventRouter(self.screen_to_virtual)
+        # Objetos del mundo con update(), llamados una vez por frame
+        self._updatable: Dict[Renderable, None] = {}
+
+        # Modo de rectángulos sucios: solo se redibuja lo que cambió
+        self.dirty_rects = dirty_rects
+        self._dirty: List[pygame.Rect] = []
+        self._full_redraw = True
+        # Último área (en coordenadas virtuales) donde se dibujó cada objeto
+        self._drawn_bounds: Dict[Renderable, pygame.Rect] = {}
+        self._last_view: Optional[pygame.Rect] = None
+        self._last_screen_size: Optional[Tuple[int, int]] = None
+
+        # Escalado de salida: se calcula una vez por cambio de tamaño
+        self.scale_mode = scale_mode
+        self._scale = 1.0
+        self._offset = (0, 0)
+        self._scaled_surface: Optional[pygame.Surface] = None
+        self._screen_size: Optional[Tuple[int, int]] = None
+        # Capa de interfaz ya escalada (modo nativo), se rehace solo si la UI cambia
+        self._scaled_ui: Optional[pygame.Surface] = None
+        self._ui_dirty = True
+        self._native_scale: Optional[float] = None
+        # Tiempos (en segundos) del último frame, para comparar modos
+        self.last_render_time = 0.0
+        self.last_present_time = 0.0
+        # Fracción del paso de simulación con la que se interpola el frame actual
+        self.alpha = 1.0
+        self.profiler = get_profiler()
+        self._layer_scopes: Dict[int, str] = {}
+        self.resize()
 
     def add(self, renderable: Renderable) -> None:
         """Añade un elemento para ser renderizado"""
-        if renderable.z_index not in self.renderables:
-            self.renderables[renderable.z_index] = []
-        self.renderables[renderable.z_index].append(renderable)
+        if not isinstance(renderable, Renderable):
+            # p. ej. EntityObject: la dibuja la EntityLayer de su almacén
+            raise TypeError(f"{type(renderable).__name__} no es un Renderable")
+        if renderable in self.ui_queue or renderable in self.world_queue:
+            return
+        if isinstance(renderable, UIElement):
+            self.ui_queue.add(renderable)
+            self.ui_router.add(renderable)
+            renderable.add_change_listener(self._on_changed)
+            self._ui_dirty = True
+        else:
+            self.world_queue.add(renderable)
+            if hasattr(renderable, 'update'):
+                self._updatable[renderable] = None
+            if self.scale_mode == ScaleMode.NATIVE:
+                renderable.set_render_scale(self._scale * self.camera.zoom)
+            self._index(renderable)
+            renderable.add_change_listener(self._on_changed)
+        self._mark_region(renderable)
 
     def remove(self, renderable: Renderable) -> None:
         """Elimina un elemento del renderizador"""
-        if renderable.z_index in self.renderables:
-            self.renderables[renderable.z_index].remove(renderable)
+        if self.ui_queue.remove(renderable):
+            self.ui_router.remove(renderable)
+            self._ui_dirty = True
+        elif self.world_queue.remove(renderable):
+            self._updatable.pop(renderable, None)
+            self.spatial_index.remove(renderable)
+            self._unbounded.pop(renderable, None)
+        else:
+            return
+        renderable.remove_change_listener(self._on_changed)
+        old = self._drawn_bounds.pop(renderable, None)
+        if old is not None:
+            self._dirty.append(old)
+        elif self.dirty_rects:
+            self._full_redraw = True
+
+    def _on_changed(self, renderable: Renderable) -> None:
+        """Callback de los objetos cuando se mueven o cambian su aspecto"""
+        if renderable in self.world_queue:
+            # Al cambiar de capa pasa a dibujarse el último de la nueva
+            self.world_queue.update_z(renderable)
+            self._index(renderable)
+        else:
+            self.ui_queue.update_z(renderable)
+            self._ui_dirty = True
+        self._mark_region(renderable)
+
+    def _get_virtual_bounds(self, renderable: Renderable) -> Optional[pygame.Rect]:
+        """Área en coordenadas virtuales que ocupa el objeto, o None si no se conoce"""
+        bounds = renderable.get_bounds()
+        if bounds is None or isinstance(renderable, UIElement):
+            return bounds
+        return bounds.move(self.camera.get_offset(self.alpha))
+
+    def _mark_region(self, renderable: Renderable) -> None:
+        """Marca como sucias el área anterior y la actual del objeto"""
+        if not self.dirty_rects or self._full_redraw:
+            return
+        bounds = self._get_virtual_bounds(renderable)
+        if bounds is None or self.camera.zoom != 1.0:
+            self._full_redraw = True
+            return
+        old = self._drawn_bounds.get(renderable)
+        if old is not None and old.width and old.height:
+            self._dirty.append(old)
+        # Un objeto sin nada que dibujar (límites vacíos) no ensucia nada
+        if bounds.width and bounds.height:
+            self._dirty.append(bounds)
+        self._drawn_bounds[renderable] = bounds
+
+    def _index(self, renderable: Renderable) -> None:
+        """Actualiza la posición del objeto en el índice espacial"""
+        bounds = renderable.get_bounds()
+        if bounds is None:
+            self.spatial_index.remove(renderable)
+            self._unbounded[renderable] = None
+        else:
+            self._unbounded.pop(renderable, None)
+            self.spatial_index.move(renderable, bounds)
+
+    def get_visible(self) -> List[Renderable]:
+        """Objetos del mundo que intersectan la vista de la cámara, en orden de dibujo"""
+        visible = self.spatial_index.query_rect(self.camera.get_view_rect(self.alpha))
+        visible.update(self._unbounded)
+        return self._in_draw_order(visible)
+
+    def _in_draw_order(self, visible: Set[Renderable]) -> List[Renderable]:
+        """Los objetos de visible en el orden de la cola (z-index y luego inserción).
+        Solo se ordenan los visibles: el coste no depende del total de objetos"""
+        return self.world_queue.sort(visible)
+
+    def _get_game_layer(self) -> pygame.Surface:
+        """Capa del mundo del tamaño de la vista (difiere de la virtual con zoom)"""
+        view_size = self.camera.get_view_size()
+        if self.game_layer.get_size() != view_size:
+            self.game_layer = pygame.Surface(view_size, pygame.SRCALPHA)
+        return self.game_layer
+
+    def render(self, alpha: float = 1.0) -> Optional[List[pygame.Rect]]:
+        """Renderiza todos los elementos manteniendo el aspect ratio.
 
-    def render(self) -> None:
-        """Renderiza todos los elementos manteniendo el aspect ratio"""
-        # Limpia las capas
+        alpha es la fracción del paso de simulación transcurrida, para interpolar.
+        En modo de rectángulos sucios devuelve las áreas de la pantalla que
+        cambiaron, para pasarlas a pygame.display.update"""
+        self.alpha = alpha
+        start = time.perf_counter()
+        try:
+            with self.profiler.scope("render"):
+                return self._render()
+        finally:
+            self.last_render_time = time.perf_counter() - start
+
+    def _render(self) -> Optional[List[pygame.Rect]]:
+        if self.screen.get_size() != self._screen_size:
+            self.resize()
+
+        if self.scale_mode == ScaleMode.NATIVE:
+            # El dibujo directo a pantalla no conserva una superficie virtual
+            # sobre la que aplicar rectángulos sucios
+            self._render_native()
+            return [self.screen.get_rect()] if self.dirty_rects else None
+
+        if not self.dirty_rects:
+            self._render_full()
+            return None
+
+        view = self.camera.get_view_rect(self.alpha)
+        screen_size = self.screen.get_size()
+        if (view != self._last_view or screen_size != self._last_screen_size
+                or self.camera.zoom != 1.0):
+            # La cámara se movió o la ventana cambió: todo está sucio
+            self._full_redraw = True
+        self._last_view = view
+        self._last_screen_size = screen_size
+
+        if self._full_redraw:
+            self._full_redraw = False
+            self._dirty.clear()
+            self._render_full()
+            self._remember_drawn_bounds()
+            return [self.screen.get_rect()]
+
+        if not self._dirty:
+            return []
+        regions = self._merge_regions(self._dirty)
+        self._dirty.clear()
+        return [self._render_region(region) for region in regions]
+
+    def _render_full(self) -> None:
+        game_layer = self._get_game_layer()
         self.virtual_surface.fill((0, 0, 0, 0))
         self.ui_layer.fill((0, 0, 0, 0))
-        self.game_layer.fill((0, 0, 0, 0))
+        game_layer.fill((0, 0, 0, 0))
+
+        # Renderiza el mundo: solo lo que ve la cámara, en orden por z-index
+        self._render_world(game_layer, self.camera.get_offset(self.alpha), self.get_visible())
 
-        # Renderiza en orden por z-index
-        for z_index in sorted(self.renderables.keys()):
-            for renderable in self.renderables[z_index]:
-                if isinstance(renderable, UIElement):
-                    renderable.render(self.ui_layer)
-                else:
-                    renderable.render(self.game_layer)
+        # La interfaz no se ve afectada por la cámara
+        with self.profiler.scope("ui"):
+            for element in self.ui_queue:
+                element.render(self.ui_layer)
 
         # Combina las capas en la superficie virtual
-        self.virtual_surface.blit(self.game_layer, (0, 0))
+        if game_layer.get_size() != self.virtual_size:
+            game_layer = pygame.transform.scale(game_layer, self.virtual_size)
+        self.virtual_surface.blit(game_layer, (0, 0))
         self.virtual_surface.blit(self.ui_layer, (0, 0))
 
         # Escala y centra en la pantalla real
-        scale, offset = self.get_scale_and_offset()
-        scaled_surface = pygame.transform.smoothscale(
-            self.virtual_surface,
-            (int(self.virtual_size[0] * scale),
-             int(self.virtual_size[1] * scale))
-        )
-        
+        with self.profiler.scope("scale"):
+            self._present()
+
+    def _render_world(self, surface: pygame.Surface, offset: Tuple[float, float],
+                      visible: List[Renderable]) -> None:
+        """Dibuja los objetos ya ordenados; con el profiler activo mide cada capa"""
+        if not self.profiler.enabled:
+            self._render_batched(surface, offset, visible)
+            return
+        for z_index, layer in groupby(visible, key=attrgetter('z_index')):
+            with self.profiler.scope(self._layer_scope(z_index)):
+                self._render_batched(surface, offset, layer)
+
+    def _render_batched(self, surface: pygame.Surface, offset: Tuple[float, float],
+                        renderables: Iterable[Renderable]) -> None:
+        """Acumula los objetos que se dibujan con un blit (get_blit) y los envía en
+        un solo blits(); el lote se vacía antes de cada objeto que necesita
+        render() para respetar el orden de dibujo"""
+        alpha = self.alpha
+        batch = []
+        for renderable in renderables:
+            blit = renderable.get_blit(offset, alpha)
+            if blit is not None:
+                batch.append(blit)
+                continue
+            if batch:
+                surface.blits(batch, doreturn=False)
+                batch = []
+            renderable.render(surface, offset, alpha)
+        if batch:
+            surface.blits(batch, doreturn=False)
+
+    def _layer_scope(self, z_index: int) -> str:
+        name = self._layer_scopes.get(z_index)
+        if name is None:
+            name = self._layer_scopes[z_index] = f"layer {z_index}"
+        return name
+
+    def _present(self) -> None:
+        """Lleva la superficie virtual a la pantalla según el modo de escalado"""
+        start = time.perf_counter()
+        self.screen.fill((0, 0, 0))
+        if self._scaled_surface is None:
+            # Escala 1: no hace falta transformar
+            self.screen.blit(self.virtual_surface, self._offset)
+        else:
+            if self.scale_mode == ScaleMode.SMOOTH:
+                pygame.transform.smoothscale(self.virtual_surface, self._scaled_surface.get_size(),
+                                             self._scaled_surface)
+            else:
+                pygame.transform.scale(self.virtual_surface, self._scaled_surface.get_size(),
+                                       self._scaled_surface)
+            self.screen.blit(self._scaled_surface, self._offset)
+        self.last_present_time = time.perf_counter() - start
+
+    def _render_native(self) -> None:
+        """Dibuja el mundo directamente en la pantalla con recursos pre-escalados"""
+        render_scale = self._scale * self.camera.zoom
+        if render_scale != self._native_scale:
+            # El zoom cambió desde el último pre-escalado
+            self._apply_render_scale()
+
+        scaled_size = (int(self.virtual_size[0] * self._scale),
+                       int(self.virtual_size[1] * self._scale))
         self.screen.fill((0, 0, 0))
-        self.screen.blit(scaled_surface, offset)
-        
+        self.screen.set_clip(pygame.Rect(self._offset, scaled_size))
+        camera_offset = self.camera.get_offset(self.alpha)
+        offset = (self._offset[0] + camera_offset[0] * render_scale,
+                  self._offset[1] + camera_offset[1] * render_scale)
+        self._render_world(self.screen, offset, self.get_visible())
+        self.screen.set_clip(None)
+
+        # La interfaz se dibuja a resolución virtual y solo se re-escala si cambia
+        start = time.perf_counter()
+        if self._ui_dirty or self._scaled_ui is None:
+            with self.profiler.scope("ui"):
+                self.ui_layer.fill((0, 0, 0, 0))
+                for element in self.ui_queue:
+                    element.render(self.ui_layer)
+            with self.profiler.scope("scale"):
+                self._scaled_ui = pygame.transform.smoothscale(self.ui_layer, scaled_size)
+            self._ui_dirty = False
+        self.screen.blit(self._scaled_ui, self._offset)
+        self.last_present_time = time.perf_counter() - start
+
+    def _apply_render_scale(self) -> None:
+        """Pre-escala los recursos del mundo a la escala de salida actual"""
+        render_scale = self._scale * self.camera.zoom if self.scale_mode == ScaleMode.NATIVE else 1.0
+        self._native_scale = render_scale if self.scale_mode == ScaleMode.NATIVE else None
+        for renderable in self.world_queue:
+            renderable.set_render_scale(render_scale)
+
+    def set_scale_mode(self, scale_mode: ScaleMode) -> None:
+        self.scale_mode = scale_mode
+        self.resize()
+
+    def resize(self, screen: Optional[pygame.Surface] = None) -> None:
+        """Recalcula escala, offset y superficies de salida (llamar en VIDEORESIZE)"""
+        if screen is not None:
+            self.screen = screen
+        screen_width, screen_height = self._screen_size = self.screen.get_size()
+        scale = min(screen_width / self.virtual_size[0], screen_height / self.virtual_size[1])
+        if self.scale_mode == ScaleMode.INTEGER and scale >= 1:
+            scale = math.floor(scale)
+        self._scale = scale
+
+        scaled_size = (int(self.virtual_size[0] * scale), int(self.virtual_size[1] * scale))
+        self._offset = ((screen_width - scaled_size[0]) // 2,
+                        (screen_height - scaled_size[1]) // 2)
+        if scaled_size == self.virtual_size or self.scale_mode == ScaleMode.NATIVE:
+            self._scaled_surface = None
+        else:
+            self._scaled_surface = pygame.Surface(scaled_size, pygame.SRCALPHA)
+
+        self._scaled_ui = None
+        self._full_redraw = True
+        if self.scale_mode == ScaleMode.NATIVE or self._native_scale is not None:
+            self._apply_render_scale()
+
+    def screen_to_virtual(self, pos: Tuple[int, int]) -> Tuple[int, int]:
+        """Convierte una posición de la ventana a coordenadas de la superficie virtual"""
+        return (int((pos[0] - self._offset[0]) / self._scale),
+                int((pos[1] - self._offset[1]) / self._scale))
+
+    def _remember_drawn_bounds(self) -> None:
+        self._drawn_bounds.clear()
+        for renderable in self.world_queue:
+            bounds = self._get_virtual_bounds(renderable)
+            if bounds is not None:
+                self._drawn_bounds[renderable] = bounds
+        for element in self.ui_queue:
+            self._drawn_bounds[element] = element.get_bounds()
+
+    def _merge_regions(self, rects: List[pygame.Rect]) -> List[pygame.Rect]:
+        """Une los rectángulos solapados y los recorta a la superficie virtual"""
+        area = self.virtual_surface.get_rect()
+        merged: List[pygame.Rect] = []
+        for rect in rects:
+            # Un margen evita costuras al escalar regiones sueltas
+            rect = rect.inflate(4, 4).clip(area)
+            if not rect.width or not rect.height:
+                continue
+            index = rect.collidelist(merged)
+            while index != -1:
+                rect.union_ip(merged.pop(index))
+                index = rect.collidelist(merged)
+            merged.append(rect)
+        return merged
+
+    def _render_region(self, region: pygame.Rect) -> pygame.Rect:
+        """Redibuja una región de la superficie virtual y la lleva a la pantalla"""
+        game_layer = self.game_layer
+        offset = self.camera.get_offset(self.alpha)
+        game_layer.set_clip(region)
+        self.ui_layer.set_clip(region)
+        game_layer.fill((0, 0, 0, 0), region)
+        self.ui_layer.fill((0, 0, 0, 0), region)
+
+        world_region = region.move(-offset[0], -offset[1])
+        visible = self.spatial_index.query_rect(world_region)
+        visible.update(self._unbounded)
+        self._render_world(game_layer, offset, self._in_draw_order(visible))
+
+        for element in self.ui_queue:
+            if element.get_bounds().colliderect(region):
+                element.render(self.ui_layer)
+
+        game_layer.set_clip(None)
+        self.ui_layer.set_clip(None)
+        self.virtual_surface.fill((0, 0, 0, 0), region)
+        self.virtual_surface.blit(game_layer, region, region)
+        self.virtual_surface.blit(self.ui_layer, region, region)
+
+        # Escala solo la región al tamaño de pantalla
+        scale, screen_offset = self.get_scale_and_offset()
+        left = int(region.left * scale) + screen_offset[0]
+        top = int(region.top * scale) + screen_offset[1]
+        right = int(region.right * scale) + screen_offset[0]
+        bottom = int(region.bottom * scale) + screen_offset[1]
+        target = pygame.Rect(left, top, max(1, right - left), max(1, bottom - top))
+        source = self.virtual_surface.subsurface(region)
+        with self.profiler.scope("scale"):
+            if self.scale_mode == ScaleMode.SMOOTH:
+                scaled = pygame.transform.smoothscale(source, target.size)
+            else:
+                scaled = pygame.transform.scale(source, target.size)
+            self.screen.fill((0, 0, 0), target)
+            self.screen.blit(scaled, target)
+        return target
+
     def get_scale_and_offset(self) -> Tuple[float, Tuple[int, int]]:
-        """Calcula la escala y el offset para mantener el aspect ratio"""
-        screen_rect = self.screen.get_rect()
-        virtual_rect = pygame.Rect((0, 0), self.virtual_size)
-        
-        scale_x = screen_rect.width / virtual_rect.width
-        scale_y = screen_rect.height / virtual_rect.height
-        scale = min(scale_x, scale_y)
-        
-        scaled_size = (int(virtual_rect.width * scale), 
-                      int(virtual_rect.height * scale))
-        offset = ((screen_rect.width - scaled_size[0]) // 2,
-                 (screen_rect.height - scaled_size[1]) // 2)
-                 
-        return scale, offset
+        """Escala y offset que mantienen el aspect ratio (calculados en resize)"""
+        return self._scale, self._offset
 
     def handle_ui_event(self, event: pygame.event.Event) -> Optional[Event]:
-        """Propaga el evento a través de todos los elementos UI en orden inverso de z-index"""
-        # Ordenar z-indices en orden inverso para que los elementos superiores reciban eventos primero
-        for z_index in sorted(self.renderables.keys(), reverse=True):
-            for renderable in self.renderables[z_index]:
-                if isinstance(renderable, UIElement):
-                    result = renderable.handle_event(event)
-                    if result is not None:
-                        return result
-                if hasattr(renderable, 'update'):
-                    renderable.update()
-        return None
\ No newline at end of file
+        """Entrega el evento solo a los elementos UI implicados (ver UIEventRouter)"""
+        return self.ui_router.handle_event(event)
+
+    def update(self, dt: float) -> None:
+        """Actualiza los objetos del mundo que tienen update(dt) (un paso de simulación)"""
+        for renderable in list(self._updatable):
+            renderable.update(dt)
+
+    def update_ui(self) -> None:
+        """Actualiza los widgets una vez por frame"""
+        self.ui_router.tick()
@@ -0,0 +1,210 @@
+"""Atlas de texturas: empaqueta los PNG sueltos en unas pocas páginas.
+
+build_atlas coloca las imágenes por estantes (de mayor a menor altura) en
+páginas de ATLAS_PAGE_SIZE y guarda las páginas junto a un manifiesto JSON que
+asocia cada sprite con su página y su rectángulo. ensure_atlas solo reconstruye
+si cambió alguna imagen de origen (nombre, tamaño o fecha de modificación).
+
+Uso como script:
+    python -m src.graphics.texture_atlas [--force]
+"""
+import json
+import os
+import sys
+import pygame
+from typing import Dict, List, Optional, Tuple
+from config.constants import ATLAS_OUTPUT_DIR, ATLAS_PAGE_SIZE, ATLAS_SOURCE_DIR
+from .asset_manager import AssetManager, get_asset_manager
+
+MANIFEST_NAME = "atlas.json"
+MANIFEST_VERSION = 1
+
+def _scan_sources(source_dir: str) -> Dict[str, Tuple[int, int]]:
+    """Ruta relativa de cada PNG -> (tamaño, fecha de modificación)"""
+    sources = {}
+    for root, _, files in os.walk(source_dir):
+        for name in files:
+            if name.lower().endswith(".png"):
+                path = os.path.join(root, name)
+                relative = os.path.relpath(path, source_dir).replace(os.sep, "/")
+                stat = os.stat(path)
+                sources[relative] = (stat.st_size, stat.st_mtime_ns)
+    return dict(sorted(sources.items()))
+
+def _pack(sizes: Dict[str, Tuple[int, int]], page_size: int,
+          padding: int) -> Tuple[Dict[str, Tuple[int, int, int, int, int]], List[Tuple[int, int]]]:
+    """Empaquetado por estantes. Devuelve nombre -> (página, x, y, w, h) y el
+    tamaño usado de cada página. Las imágenes mayores que una página van solas"""
+    placements = {}
+    # Tamaño usado de cada página
+    pages: List[Tuple[int, int]] = []
+    current: Optional[int] = None
+    shelf_x = shelf_y = shelf_height = 0
+    for name, (width, height) in sorted(sizes.items(), key=lambda item: (-item[1][1], item[0])):
+        if width > page_size or height > page_size:
+            placements[name] = (len(pages), 0, 0, width, height)
+            pages.append((width, height))
+            continue
+        if current is not None and shelf_x + width > page_size:
+            # Nuevo estante
+            shelf_y += shelf_height + padding
+            shelf_x = shelf_height = 0
+        if current is None or shelf_y + height > page_size:
+            # Nueva página
+            current = len(pages)
+            pages.append((0, 0))
+            shelf_x = shelf_y = shelf_height = 0
+        placements[name] = (current, shelf_x, shelf_y, width, height)
+        shelf_x += width + padding
+        shelf_height = max(shelf_height, height)
+        used_width, used_height = pages[current]
+        pages[current] = (max(used_width, shelf_x - padding), max(used_height, shelf_y + shelf_height))
+    return placements, pages
+
+def build_atlas(source_dir: str = ATLAS_SOURCE_DIR, output_dir: str = ATLAS_OUTPUT_DIR,
+                page_size: int = ATLAS_PAGE_SIZE, padding: int = 1) -> dict:
+    """Empaqueta todos los PNG de source_dir y escribe páginas y manifiesto"""
+    sources = _scan_sources(source_dir)
+    images = {name: pygame.image.load(os.path.join(source_dir, name)) for name in sources}
+    placements, page_sizes = _pack({name: image.get_size() for name, image in images.items()},
+                                   page_size, padding)
+
+    os.makedirs(output_dir, exist_ok=True)
+    pages = [pygame.Surface(size, pygame.SRCALPHA) for size in page_sizes]
+    for page in pages:
+        page.fill((0, 0, 0, 0))
+    for name, (page, x, y, _, _) in placements.items():
+        pages[page].blit(images[name], (x, y))
+    page_files = []
+    for i, page in enumerate(pages):
+        page_file = f"atlas_{i}.png"
+        pygame.image.save(page, os.path.join(output_dir, page_file))
+        page_files.append(page_file)
+
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "page_size": page_size,
+        "padding": padding,
+        "pages": page_files,
+        "sources": {name: list(stamp) for name, stamp in sources.items()},
+        "sprites": {name: {"page": page, "rect": [x, y, w, h]}
+                    for name, (page, x, y, w, h) in placements.items()},
+    }
+    with open(os.path.join(output_dir, MANIFEST_NAME), "w") as file:
+        json.dump(manifest, file, indent=1)
+    return manifest
+
+def _read_manifest(output_dir: str) -> Optional[dict]:
+    try:
+        with open(os.path.join(output_dir, MANIFEST_NAME)) as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+def is_up_to_date(source_dir: str = ATLAS_SOURCE_DIR, output_dir: str = ATLAS_OUTPUT_DIR,
+                  page_size: int = ATLAS_PAGE_SIZE, padding: int = 1) -> bool:
+    manifest = _read_manifest(output_dir)
+    if manifest is None or manifest.get("version") != MANIFEST_VERSION:
+        return False
+    if manifest.get("page_size") != page_size or manifest.get("padding") != padding:
+        return False
+    if any(not os.path.exists(os.path.join(output_dir, page)) for page in manifest["pages"]):
+        return False
+    current = {name: list(stamp) for name, stamp in _scan_sources(source_dir).items()}
+    return manifest["sources"] == current
+
+def prepare_atlas(source_dir: str = ATLAS_SOURCE_DIR, output_dir: str = ATLAS_OUTPUT_DIR,
+                  page_size: int = ATLAS_PAGE_SIZE, padding: int = 1) -> dict:
+    """Reconstruye el atlas solo si cambiaron las imágenes de origen y devuelve
+    su manifiesto, sin cargar las páginas (ver page_paths y TextureAtlas.from_manifest)"""
+    if not is_up_to_date(source_dir, output_dir, page_size, padding):
+        return build_atlas(source_dir, output_dir, page_size, padding)
+    return _read_manifest(output_dir)
+
+def ensure_atlas(source_dir: str = ATLAS_SOURCE_DIR, output_dir: str = ATLAS_OUTPUT_DIR,
+                 page_size: int = ATLAS_PAGE_SIZE, padding: int = 1) -> 'TextureAtlas':
+    """Como prepare_atlas, pero carga las páginas en el momento"""
+    manifest = prepare_atlas(source_dir, output_dir, page_size, padding)
+    return TextureAtlas.from_manifest(manifest, output_dir, source_dir)
+
+def page_paths(manifest: dict, output_dir: str = ATLAS_OUTPUT_DIR) -> List[str]:
+    """Archivos de las páginas, para cargarlos (por ejemplo con un AssetLoader)"""
+    return [os.path.join(output_dir, page) for page in manifest["pages"]]
+
+def _name_for_path(path: str, source_dir: str) -> str:
+    relative = os.path.relpath(os.path.normpath(path), os.path.normpath(source_dir))
+    return relative.replace(os.sep, "/")
+
+def in_atlas(manifest: dict, path: str, source_dir: str = ATLAS_SOURCE_DIR) -> bool:
+    """Indica si el archivo de source_dir se servirá desde el atlas"""
+    return _name_for_path(path, source_dir) in manifest["sprites"]
+
+class TextureAtlas:
+    """Páginas del atlas cargadas y sprites como subsuperficies de ellas"""
+
+    def __init__(self, pages: List[pygame.Surface], sprites: Dict[str, Tuple[int, pygame.Rect]],
+                 source_dir: Optional[str] = None):
+        self.pages = pages
+        self.sprites = sprites
+        # Directorio de las imágenes originales, para resolver rutas de archivo
+        self.source_dir = source_dir
+        self._subsurfaces: Dict[str, pygame.Surface] = {}
+
+    @classmethod
+    def load(cls, output_dir: str = ATLAS_OUTPUT_DIR, source_dir: Optional[str] = None,
+             asset_manager: Optional[AssetManager] = None) -> 'TextureAtlas':
+        manifest = _read_manifest(output_dir)
+        if manifest is None:
+            raise FileNotFoundError(f"No hay manifiesto de atlas en {output_dir}")
+        return cls.from_manifest(manifest, output_dir, source_dir, asset_manager)
+
+    @classmethod
+    def from_manifest(cls, manifest: dict, output_dir: str = ATLAS_OUTPUT_DIR,
+                      source_dir: Optional[str] = None,
+                      asset_manager: Optional[AssetManager] = None) -> 'TextureAtlas':
+        """Atlas del manifiesto; las páginas que ya estén en la caché no se vuelven a leer"""
+        assets = asset_manager or get_asset_manager()
+        paths = page_paths(manifest, output_dir)
+        for path in paths:
+            # Las páginas viven mientras el atlas esté registrado: no se expulsan
+            assets.pin(path)
+        pages = [assets.load(path) for path in paths]
+        sprites = {name: (entry["page"], pygame.Rect(entry["rect"]))
+                   for name, entry in manifest["sprites"].items()}
+        return cls(pages, sprites, source_dir)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.sprites
+
+    def get(self, name: str) -> pygame.Surface:
+        """Subsuperficie del sprite (comparte píxeles con la página)"""
+        surface = self._subsurfaces.get(name)
+        if surface is None:
+            page, rect = self.sprites[name]
+            surface = self._subsurfaces[name] = self.pages[page].subsurface(rect)
+        return surface
+
+    def name_for_path(self, path: str) -> Optional[str]:
+        """Nombre del sprite que corresponde a un archivo de source_dir, si lo hay"""
+        if self.source_dir is None:
+            return None
+        name = _name_for_path(path, self.source_dir)
+        return name if name in self.sprites else None
+
+def main(argv=None) -> int:
+    import argparse
+    parser = argparse.ArgumentParser(description="Empaqueta las texturas en un atlas")
+    parser.add_argument("--source", default=ATLAS_SOURCE_DIR)
+    parser.add_argument("--output", default=ATLAS_OUTPUT_DIR)
+    parser.add_argument("--page-size", type=int, default=ATLAS_PAGE_SIZE)
+    parser.add_argument("--force", action="store_true", help="reconstruye aunque no haya cambios")
+    args = parser.parse_args(argv)
+    if not args.force and is_up_to_date(args.source, args.output, args.page_size):
+        print("El atlas está al día")
+        return 0
+    manifest = build_atlas(args.source, args.output, args.page_size)
+    print(f"{len(manifest['sprites'])} sprites en {len(manifest['pages'])} páginas -> {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+import pygame
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from config.constants import TRANSFORM_ANGLE_STEP, TRANSFORM_CACHE_BUDGET
+
+class TransformCache:
+    """Caché LRU de superficies rotadas y escaladas con presupuesto de bytes.
+
+    La clave es (superficie de origen, ángulo redondeado, escala), así que los
+    objetos que giran comparten las mismas variantes en lugar de crear una
+    superficie nueva en cada frame.
+    """
+
+    def __init__(self, budget_bytes: int = TRANSFORM_CACHE_BUDGET,
+                 angle_step: float = TRANSFORM_ANGLE_STEP):
+        self.budget_bytes = budget_bytes
+        self.angle_step = angle_step
+        self._cache: "OrderedDict[tuple, pygame.Surface]" = OrderedDict()
+        # Rectángulos de color sin rotar, origen de las variantes rotadas
+        self._rects: Dict[Tuple[tuple, Tuple[int, int]], pygame.Surface] = {}
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def quantize(self, angle: float) -> float:
+        angle %= 360
+        if self.angle_step:
+            angle = round(angle / self.angle_step) * self.angle_step % 360
+        return angle
+
+    def transform(self, surface: pygame.Surface, angle: float, scale: float = 1.0) -> pygame.Surface:
+        """Superficie rotada angle grados y escalada por scale (compartida, no modificar)"""
+        angle = self.quantize(angle)
+        if angle == 0 and scale == 1.0:
+            return surface
+        key = (surface, angle, round(scale, 3))
+        result = self._cache.get(key)
+        if result is not None:
+            self.hits += 1
+            self._cache.move_to_end(key)
+            return result
+
+        self.misses += 1
+        if scale == 1.0:
+            result = pygame.transform.rotate(surface, angle)
+        else:
+            result = pygame.transform.rotozoom(surface, angle, scale)
+        self._cache[key] = result
+        self._bytes += result.get_pitch() * result.get_height()
+        self._evict()
+        return result
+
+    def rect_surface(self, color: tuple, size: Tuple[int, int]) -> pygame.Surface:
+        """Rectángulo de color como superficie, para rotarlo con transform"""
+        key = (tuple(color), size)
+        surface = self._rects.get(key)
+        if surface is None:
+            surface = pygame.Surface(size, pygame.SRCALPHA)
+            surface.fill(color)
+            if len(self._rects) >= 256:
+                self._rects.clear()
+            self._rects[key] = surface
+        return surface
+
+    def _evict(self) -> None:
+        while self._bytes > self.budget_bytes and len(self._cache) > 1:
+            _, surface = self._cache.popitem(last=False)
+            self._bytes -= surface.get_pitch() * surface.get_height()
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._cache.clear()
+        self._rects.clear()
+        self._bytes = 0
+
+    @property
+    def used_bytes(self) -> int:
+        return self._bytes
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._cache),
+            "bytes": self._bytes,
+            "budget_bytes": self.budget_bytes,
+        }
+
+_default_transform_cache: Optional[TransformCache] = None
+
+def get_transform_cache() -> TransformCache:
+    """Devuelve la caché de transformaciones compartida por todo el proceso"""
+    global _default_transform_cache
+    if _default_transform_cache is None:
+        _default_transform_cache = TransformCache()
+    return _default_transform_cache
@@ -0,0 +1,218 @@
+"""Colisiones de cuerpos móviles contra la rejilla de tiles del nivel.
+
+Los tiles no son objetos: se consulta directamente el array del Level, así
+que comprobar una celda es O(1) y el coste no depende de la longitud del
+nivel. Para mover cuerpos, los tiles contiguos del mismo tipo se fusionan
+en rectángulos (MergedTiles, con caché por chunk) y el movimiento se
+resuelve por ejes (primero x, luego y) contra los rectángulos que cruza todo
+el recorrido del paso, de modo que un objeto rápido no puede atravesar un
+tile aunque avance más de un tile por paso. Las plataformas de un solo
+sentido solo frenan a los cuerpos que caen sobre ellas desde arriba.
+"""
+import math
+from typing import Iterable, List, NamedTuple, Optional, Set, Tuple
+import pygame
+from ..core.event_manager import EventManager, EventType
+from .level_format import Level
+from .tile_merge import MergedTiles
+from .tilemap import EMPTY_TILE
+
+# Margen para que un borde apoyado justo en el límite de una celda no la ocupe
+_EPSILON = 1e-6
+
+# Tipos de los rectángulos fusionados (ver MergedTiles)
+SOLID = "solid"
+ONE_WAY = "one_way"
+
+class Contact(NamedTuple):
+    """Choque de un cuerpo con un tile durante un paso"""
+    entity: object
+    tile: int
+    cell: Tuple[int, int]
+    # Normal de la superficie golpeada: (-1, 0) pared a la derecha, (0, -1) suelo...
+    normal: Tuple[int, int]
+
+class Body:
+    """Caja (centrada en la posición de su entidad) que se mueve contra los tiles"""
+    __slots__ = ("entity", "width", "height", "velocity", "on_ground", "drop_through")
+
+    def __init__(self, entity, size: Tuple[float, float],
+                 velocity: Tuple[float, float] = (0.0, 0.0)):
+        self.entity = entity
+        self.width, self.height = size
+        self.velocity = velocity
+        self.on_ground = False
+        # Mientras sea True atraviesa las plataformas de un solo sentido
+        self.drop_through = False
+
+class TileCollider:
+    """Mueve cuerpos contra los tiles sólidos de una capa del nivel.
+
+    origin es la esquina superior izquierda del tile (0, 0) en el mundo. Son
+    sólidos todos los tiles no vacíos salvo los de one_way_tiles, o solo los
+    de solid_tiles si se indica. Cada step() envía los choques del paso en un
+    único evento COLLISION con la lista de Contact en data["contacts"].
+    """
+
+    def __init__(self, level: Level, tile_size: int = 50,
+                 origin: Tuple[float, float] = (0, 0),
+                 event_manager: Optional[EventManager] = None,
+                 solid_tiles: Optional[Iterable[int]] = None,
+                 one_way_tiles: Iterable[int] = (),
+                 gravity: float = 0.0,
+                 layer: str = "tiles"):
+        self.level = level
+        self.layer = layer
+        self.tile_size = tile_size
+        self.origin = origin
+        self.event_manager = event_manager
+        self.solid_tiles: Optional[Set[int]] = set(solid_tiles) if solid_tiles is not None else None
+        self.one_way_tiles = set(one_way_tiles)
+        self.gravity = gravity
+        self.bodies: List[Body] = []
+        # Los tiles contiguos del mismo tipo se consultan como un solo rectángulo;
+        # las plataformas de un sentido van fila a fila porque solo frena su borde superior
+        self.merged = MergedTiles(level, self.kind_of, layer, flat_kinds=(ONE_WAY,))
+
+    def add_body(self, entity, size: Optional[Tuple[float, float]] = None,
+                 velocity: Tuple[float, float] = (0.0, 0.0)) -> Body:
+        """Registra una entidad; sin size se usa el tamaño de get_bounds()"""
+        if size is None:
+            size = entity.get_bounds().size
+        body = Body(entity, size, velocity)
+        self.bodies.append(body)
+        return body
+
+    def remove_body(self, body: Body) -> None:
+        if body in self.bodies:
+            self.bodies.remove(body)
+
+    def tile_at(self, col: int, row: int) -> int:
+        level = self.level
+        if 0 <= col < level.width and 0 <= row < level.height:
+            return level.layers[self.layer][row * level.width + col]
+        return EMPTY_TILE
+
+    def kind_of(self, tile: int) -> Optional[str]:
+        if tile in self.one_way_tiles:
+            return ONE_WAY
+        return SOLID if self.is_solid(tile) else None
+
+    def is_solid(self, tile: int) -> bool:
+        if tile == EMPTY_TILE or tile in self.one_way_tiles:
+            return False
+        return self.solid_tiles is None or tile in self.solid_tiles
+
+    def cell_at(self, x: float, y: float) -> Tuple[int, int]:
+        """Celda que contiene el punto del mundo"""
+        return (math.floor((x - self.origin[0]) / self.tile_size),
+                math.floor((y - self.origin[1]) / self.tile_size))
+
+    def solid_cells(self, rect: pygame.Rect) -> List[Tuple[int, int]]:
+        """Celdas sólidas que intersectan el rectángulo"""
+        left, top = self.cell_at(rect.left, rect.top)
+        right, bottom = self.cell_at(rect.right - _EPSILON, rect.bottom - _EPSILON)
+        return [(col, row) for row in range(top, bottom + 1) for col in range(left, right + 1)
+                if self.is_solid(self.tile_at(col, row))]
+
+    def colliders(self, rect: pygame.Rect) -> List[Tuple[pygame.Rect, str]]:
+        """Rectángulos fusionados (SOLID u ONE_WAY) que intersectan rect; broad-phase"""
+        return self.merged.query(rect, self.tile_size, self.origin)
+
+    def set_tile(self, col: int, row: int, tile: int) -> None:
+        """Edita el nivel y descarta los rectángulos fusionados de ese chunk.
+        No re-hornea ningún TileMap: en el juego se edita con Game.set_tile"""
+        self.level.set_tile(col, row, tile, self.layer)
+        self.merged.invalidate(col, row)
+
+    def _contact(self, body: Body, x: float, y: float, normal: Tuple[int, int]) -> Contact:
+        """Choque con el tile que contiene el punto (x, y) del borde golpeado"""
+        cell = self.cell_at(x, y)
+        return Contact(body.entity, self.tile_at(*cell), cell, normal)
+
+    def move(self, body: Body, dx: float, dy: float,
+             contacts: Optional[List[Contact]] = None) -> Tuple[float, float]:
+        """Desplaza el cuerpo (dx, dy) parando en el primer rectángulo que barre en
+        cada eje. Devuelve el desplazamiento aplicado y añade los choques a contacts"""
+        cx, cy = body.entity.position
+        width, height = body.width, body.height
+        x, y = cx - width / 2, cy - height / 2
+        vx, vy = body.velocity
+        moved_x, moved_y = dx, dy
+        # Todo lo que el cuerpo puede tocar en este paso, en cualquier eje
+        swept = pygame.Rect(math.floor(min(x, x + dx)) - 1, math.floor(min(y, y + dy)) - 1,
+                            math.ceil(width + abs(dx)) + 3, math.ceil(height + abs(dy)) + 3)
+        candidates = self.colliders(swept)
+
+        if dx:
+            hit = None
+            for rect, kind in candidates:
+                if kind != SOLID or rect.bottom <= y + _EPSILON or rect.top >= y + height - _EPSILON:
+                    continue
+                if dx > 0:
+                    if x + width - _EPSILON <= rect.left < x + width + dx \
+                            and (hit is None or rect.left < hit.left):
+                        hit = rect
+                elif x + dx < rect.right <= x + _EPSILON and (hit is None or rect.right > hit.right):
+                    hit = rect
+            if hit is not None:
+                contact_y = min(max(cy, hit.top), hit.bottom - 1)
+                if dx > 0:
+                    moved_x = hit.left - width - x
+                    contact = self._contact(body, hit.left, contact_y, (-1, 0))
+                else:
+                    moved_x = hit.right - x
+                    contact = self._contact(body, hit.right - 1, contact_y, (1, 0))
+                vx = 0.0
+                if contacts is not None:
+                    contacts.append(contact)
+            x += moved_x
+
+        body.on_ground = False
+        if dy:
+            hit = None
+            bottom = y + height
+            # Las plataformas de un sentido solo cuentan al caer desde encima
+            one_way = dy > 0 and not body.drop_through
+            for rect, kind in candidates:
+                if kind != SOLID and not (kind == ONE_WAY and one_way):
+                    continue
+                if rect.right <= x + _EPSILON or rect.left >= x + width - _EPSILON:
+                    continue
+                if dy > 0:
+                    if bottom - _EPSILON <= rect.top < bottom + dy and (hit is None or rect.top < hit.top):
+                        hit = rect
+                elif y + dy < rect.bottom <= y + _EPSILON and (hit is None or rect.bottom > hit.bottom):
+                    hit = rect
+            if hit is not None:
+                contact_x = min(max(x + width / 2, hit.left), hit.right - 1)
+                if dy > 0:
+                    moved_y = hit.top - bottom
+                    body.on_ground = True
+                    contact = self._contact(body, contact_x, hit.top, (0, -1))
+                else:
+                    moved_y = hit.bottom - y
+                    contact = self._contact(body, contact_x, hit.bottom - 1, (0, 1))
+                vy = 0.0
+                if contacts is not None:
+                    contacts.append(contact)
+
+        body.velocity = (vx, vy)
+        if moved_x or moved_y:
+            body.entity.position = (cx + moved_x, cy + moved_y)
+        return moved_x, moved_y
+
+    def step(self, dt: float) -> List[Contact]:
+        """Integra la velocidad de todos los cuerpos y envía sus choques en un solo evento"""
+        contacts: List[Contact] = []
+        gravity = self.gravity * dt
+        for body in self.bodies:
+            vx, vy = body.velocity
+            if gravity:
+                vy += gravity
+                body.velocity = (vx, vy)
+            if vx or vy:
+                self.move(body, vx * dt, vy * dt, contacts)
+        if contacts and self.event_manager is not None:
+            self.event_manager.post(EventType.COLLISION, contacts=contacts)
+        return contacts
@@ -0,0 +1,354 @@
+"""Formato binario de niveles (.lvl) y conversores desde los formatos antiguos.
+
+Estructura del archivo (little endian):
+
+    cabecera   magic "PGLV", versión, nº de capas, ancho, alto, tamaño de chunk
+    capas      por capa: nombre, tipo del array ('b', 'h' o 'i'), compresión,
+               offset y tamaño de sus datos
+    datos      sin compresión: el array completo fila por fila (se lee con
+               mmap, sin copiar); con compresión: una tabla (offset, tamaño) por
+               chunk seguida de los chunks comprimidos con RLE o zlib
+
+Uso como script:
+    python -m src.world.level_format src/world/map.txt map.lvl [--compression zlib]
+"""
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from .tilemap import EMPTY_TILE
+
+MAGIC = b"PGLV"
+VERSION = 1
+
+COMPRESSION_NONE = 0
+COMPRESSION_RLE = 1
+COMPRESSION_ZLIB = 2
+COMPRESSION_NAMES = {"none": COMPRESSION_NONE, "rle": COMPRESSION_RLE, "zlib": COMPRESSION_ZLIB}
+
+# magic, versión, capas, ancho, alto, tamaño de chunk, reservado
+_HEADER = struct.Struct("<4sHHIIHH")
+# nombre, tipo del array, compresión, reservado, offset, tamaño
+_LAYER = struct.Struct("<16scBHQQ")
+# offset (relativo a los datos de la capa) y tamaño de cada chunk comprimido
+_CHUNK = struct.Struct("<II")
+_ALIGN = 8
+_LITTLE_ENDIAN = sys.byteorder == "little"
+
+class LevelFormatError(ValueError):
+    pass
+
+class Level:
+    """Capas de tiles de un nivel como arrays planos de enteros (fila por fila).
+
+    Las capas pueden ser array.array o memoryview sobre un mmap del archivo;
+    ambos admiten lectura y escritura por índice.
+    """
+
+    def __init__(self, width: int, height: int, layers: Optional[Dict[str, Sequence[int]]] = None,
+                 chunk_size: int = 16):
+        self.width = width
+        self.height = height
+        self.chunk_size = chunk_size
+        self.layers: Dict[str, Sequence[int]] = layers if layers is not None else {
+            "tiles": array('h', [EMPTY_TILE]) * (width * height)}
+
+    @property
+    def tiles(self) -> Sequence[int]:
+        """Capa principal de tiles"""
+        return self.layers["tiles"]
+
+    def get_tile(self, col: int, row: int, layer: str = "tiles") -> int:
+        if 0 <= col < self.width and 0 <= row < self.height:
+            return self.layers[layer][row * self.width + col]
+        return EMPTY_TILE
+
+    def set_tile(self, col: int, row: int, tile: int, layer: str = "tiles") -> None:
+        if 0 <= col < self.width and 0 <= row < self.height:
+            self.layers[layer][row * self.width + col] = tile
+
+    def rows(self, layer: str = "tiles") -> Iterable[List[int]]:
+        data = self.layers[layer]
+        for row in range(self.height):
+            yield list(data[row * self.width:(row + 1) * self.width])
+
+    def chunk_bounds(self, cx: int, cy: int) -> Tuple[int, int, int, int]:
+        """Columna y fila iniciales, ancho y alto en tiles del chunk"""
+        col0, row0 = cx * self.chunk_size, cy * self.chunk_size
+        return (col0, row0, min(self.chunk_size, self.width - col0),
+                min(self.chunk_size, self.height - row0))
+
+    def chunk_count(self) -> Tuple[int, int]:
+        return ((self.width + self.chunk_size - 1) // self.chunk_size,
+                (self.height + self.chunk_size - 1) // self.chunk_size)
+
+# --- Compresión por chunk ---
+
+def _rle_encode(values: array) -> bytes:
+    """Pares (repeticiones, valor) con el mismo tipo que el array"""
+    out = array(values.typecode)
+    limit = (1 << (8 * values.itemsize - 1)) - 1
+    i, n = 0, len(values)
+    while i < n:
+        value = values[i]
+        run = 1
+        while i + run < n and values[i + run] == value and run < limit:
+            run += 1
+        out.append(run)
+        out.append(value)
+        i += run
+    if not _LITTLE_ENDIAN:
+        out.byteswap()
+    return out.tobytes()
+
+def _rle_decode(data: bytes, typecode: str) -> array:
+    pairs = array(typecode, data)
+    if not _LITTLE_ENDIAN:
+        pairs.byteswap()
+    out = array(typecode)
+    for i in range(0, len(pairs), 2):
+        out.extend(array(typecode, [pairs[i + 1]]) * pairs[i])
+    return out
+
+def _to_bytes(values: array) -> bytes:
+    if not _LITTLE_ENDIAN:
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+def _from_bytes(data, typecode: str) -> array:
+    values = array(typecode, bytes(data))
+    if not _LITTLE_ENDIAN:
+        values.byteswap()
+    return values
+
+def _chunk_values(level: Level, data: Sequence[int], typecode: str, cx: int, cy: int) -> array:
+    col0, row0, cols, rows = level.chunk_bounds(cx, cy)
+    values = array(typecode)
+    for row in range(row0, row0 + rows):
+        base = row * level.width + col0
+        values.extend(data[base:base + cols])
+    return values
+
+def _compress(values: array, compression: int) -> bytes:
+    if compression == COMPRESSION_RLE:
+        return _rle_encode(values)
+    return zlib.compress(_to_bytes(values), 6)
+
+def _decompress(data, compression: int, typecode: str) -> array:
+    if compression == COMPRESSION_RLE:
+        return _rle_decode(bytes(data), typecode)
+    return _from_bytes(zlib.decompress(data), typecode)
+
+# --- Escritura ---
+
+def save_level(level: Level, path: str, compression: int = COMPRESSION_NONE) -> None:
+    """Guarda el nivel; compression se aplica a todas las capas"""
+    entries = []
+    blobs = []
+    offset = _HEADER.size + _LAYER.size * len(level.layers)
+    for name, data in level.layers.items():
+        typecode = data.typecode if isinstance(data, array) else data.format
+        if typecode not in ("b", "h", "i"):
+            raise LevelFormatError(f"Tipo de capa no soportado: {typecode!r}")
+        padding = -offset % _ALIGN
+        offset += padding
+        if compression == COMPRESSION_NONE:
+            blob = _to_bytes(array(typecode, data))
+        else:
+            chunks_x, chunks_y = level.chunk_count()
+            table = []
+            payload = []
+            chunk_offset = _CHUNK.size * chunks_x * chunks_y
+            for cy in range(chunks_y):
+                for cx in range(chunks_x):
+                    packed = _compress(_chunk_values(level, data, typecode, cx, cy), compression)
+                    table.append(_CHUNK.pack(chunk_offset, len(packed)))
+                    payload.append(packed)
+                    chunk_offset += len(packed)
+            blob = b"".join(table + payload)
+        encoded_name = name.encode("utf-8")
+        if len(encoded_name) > 16:
+            raise LevelFormatError(f"Nombre de capa demasiado largo: {name!r}")
+        entries.append(_LAYER.pack(encoded_name, typecode.encode(), compression, 0, offset, len(blob)))
+        blobs.append(b"\0" * padding + blob)
+        offset += len(blob)
+
+    with open(path, "wb") as file:
+        file.write(_HEADER.pack(MAGIC, VERSION, len(entries), level.width, level.height,
+                                level.chunk_size, 0))
+        file.writelines(entries)
+        file.writelines(blobs)
+
+# --- Lectura ---
+
+class LevelFile:
+    """Nivel .lvl abierto con mmap.
+
+    Las capas sin compresión se exponen como memoryview sobre el mapa (copy on
+    write: se pueden editar en memoria sin tocar el archivo). Las comprimidas
+    se pueden leer chunk a chunk con read_chunk o completas con read_layer.
+    close() (o usarlo con with) libera el mapa; las memoryview que se hayan
+    entregado dejan de ser válidas.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY)
+        # Vistas sobre el mapa por capa; se liberan en close()
+        self._views: Dict[str, memoryview] = {}
+        if len(self._map) < _HEADER.size:
+            raise LevelFormatError(f"{path}: archivo demasiado corto")
+        magic, version, layer_count, width, height, chunk_size, _ = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise LevelFormatError(f"{path}: no es un nivel binario")
+        if version > VERSION:
+            raise LevelFormatError(f"{path}: versión {version} no soportada")
+        self.version = version
+        self.width = width
+        self.height = height
+        self.chunk_size = chunk_size
+        # nombre -> (tipo, compresión, offset, tamaño)
+        self.layers: Dict[str, Tuple[str, int, int, int]] = {}
+        for i in range(layer_count):
+            name, typecode, compression, _, offset, size = _LAYER.unpack_from(
+                self._map, _HEADER.size + i * _LAYER.size)
+            if offset + size > len(self._map):
+                raise LevelFormatError(f"{path}: capa truncada")
+            self.layers[name.rstrip(b"\0").decode("utf-8")] = (typecode.decode(), compression,
+                                                               offset, size)
+        self._geometry = Level(width, height, {}, chunk_size)
+
+    def read_layer(self, name: str = "tiles") -> Sequence[int]:
+        typecode, compression, offset, size = self.layers[name]
+        if compression == COMPRESSION_NONE:
+            if not _LITTLE_ENDIAN:
+                return _from_bytes(self._map[offset:offset + size], typecode)
+            view = self._views.get(name)
+            if view is None:
+                view = self._views[name] = memoryview(self._map)[offset:offset + size].cast(typecode)
+            return view
+
+        data = array(typecode, [EMPTY_TILE]) * (self.width * self.height)
+        chunks_x, chunks_y = self._geometry.chunk_count()
+        for cy in range(chunks_y):
+            for cx in range(chunks_x):
+                col0, row0, cols, rows = self._geometry.chunk_bounds(cx, cy)
+                values = self.read_chunk(cx, cy, name)
+                for row in range(rows):
+                    base = (row0 + row) * self.width + col0
+                    data[base:base + cols] = values[row * cols:(row + 1) * cols]
+        return data
+
+    def read_chunk(self, cx: int, cy: int, name: str = "tiles") -> array:
+        """Tiles del chunk fila por fila (ancho real del chunk, recortado en los bordes)"""
+        typecode, compression, offset, size = self.layers[name]
+        col0, row0, cols, rows = self._geometry.chunk_bounds(cx, cy)
+        if compression == COMPRESSION_NONE:
+            layer = self.read_layer(name)
+            values = array(typecode)
+            for row in range(row0, row0 + rows):
+                base = row * self.width + col0
+                values.extend(layer[base:base + cols])
+            return values
+        chunks_x = self._geometry.chunk_count()[0]
+        chunk_offset, chunk_size = _CHUNK.unpack_from(self._map, offset + (cy * chunks_x + cx) * _CHUNK.size)
+        start = offset + chunk_offset
+        return _decompress(self._map[start:start + chunk_size], compression, typecode)
+
+    def to_level(self) -> Level:
+        return Level(self.width, self.height,
+                     {name: self.read_layer(name) for name in self.layers}, self.chunk_size)
+
+    @property
+    def mapped(self) -> bool:
+        """True si alguna capa entregada sigue apuntando al mapa del archivo"""
+        return bool(self._views)
+
+    def close(self) -> None:
+        for view in self._views.values():
+            view.release()
+        self._views.clear()
+        self._map.close()
+
+    def __enter__(self) -> "LevelFile":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+def load_level(path: str) -> Level:
+    """Abre un nivel .lvl; las capas sin compresión no se copian a memoria.
+    Si todas las capas se han copiado (comprimidas) el archivo se cierra"""
+    level_file = LevelFile(path)
+    level = level_file.to_level()
+    if not level_file.mapped:
+        level_file.close()
+    return level
+
+# --- Formatos antiguos ---
+
+def level_from_rows(rows: Iterable[str], chunk_size: int = 16) -> Level:
+    """Filas de texto con un dígito por tile (map.txt); las filas cortas se rellenan"""
+    rows = [row.strip() for row in rows]
+    width = max((len(row) for row in rows), default=0)
+    level = Level(width, len(rows), chunk_size=chunk_size)
+    tiles = level.tiles
+    for y, row in enumerate(rows):
+        base = y * width
+        for x, char in enumerate(row):
+            if char != '0':
+                tiles[base + x] = int(char) if char.isdigit() else 1
+    return level
+
+def level_from_text(path: str, chunk_size: int = 16) -> Level:
+    with open(path, "r") as file:
+        return level_from_rows(file.read().splitlines(), chunk_size)
+
+def level_from_csv(path: str, empty: int = -1, id_offset: int = 1, chunk_size: int = 16) -> Level:
+    """CSV del editor antiguo (level0_data.csv), donde empty marca una celda vacía.
+    Sus ids empiezan en 0, así que se desplazan id_offset para dejar libre EMPTY_TILE"""
+    with open(path, "r") as file:
+        rows = [[int(value) for value in line.strip().split(",") if value.strip()]
+                for line in file if line.strip()]
+    width = max((len(row) for row in rows), default=0)
+    level = Level(width, len(rows), chunk_size=chunk_size)
+    tiles = level.tiles
+    for y, row in enumerate(rows):
+        base = y * width
+        for x, value in enumerate(row):
+            if value != empty:
+                tiles[base + x] = value + id_offset
+    return level
+
+def load_any(path: str) -> Level:
+    """Carga un nivel según su extensión: .lvl (binario), .csv o texto"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".lvl":
+        return load_level(path)
+    if extension == ".csv":
+        return level_from_csv(path)
+    return level_from_text(path)
+
+def main(argv=None) -> int:
+    import argparse
+    parser = argparse.ArgumentParser(description="Convierte un nivel de texto o CSV a .lvl")
+    parser.add_argument("source")
+    parser.add_argument("target")
+    parser.add_argument("--compression", choices=list(COMPRESSION_NAMES), default="none")
+    parser.add_argument("--chunk-size", type=int, default=16)
+    args = parser.parse_args(argv)
+
+    level = load_any(args.source)
+    level.chunk_size = args.chunk_size
+    save_level(level, args.target, COMPRESSION_NAMES[args.compression])
+    print(f"{args.source} -> {args.target}: {level.width}x{level.height}, "
+          f"{os.path.getsize(args.target)} bytes")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
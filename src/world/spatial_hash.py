@@ -0,0 +1,190 @@
+import math
+import pygame
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+Cell = Tuple[int, int]
+
+def _intersects(rect: pygame.Rect, area: pygame.Rect) -> bool:
+    # Los objetos sin tamaño (puntos) no colisionan con colliderect
+    if rect.width and rect.height:
+        return rect.colliderect(area)
+    return area.collidepoint(rect.topleft)
+
+def _distance_to_rect(point: Tuple[float, float], rect: pygame.Rect) -> float:
+    """Distancia de un punto al punto más cercano del rectángulo (0 si está dentro)"""
+    dx = max(rect.left - point[0], 0, point[0] - rect.right)
+    dy = max(rect.top - point[1], 0, point[1] - rect.bottom)
+    return math.hypot(dx, dy)
+
+class SpatialHash:
+    """Índice espacial de rejilla uniforme.
+
+    Cada objeto se registra en todas las celdas que cubre su rectángulo, de modo
+    que las consultas por región solo recorren las celdas afectadas en vez de
+    todos los objetos.
+    """
+
+    def __init__(self, cell_size: int = 256):
+        self.cell_size = cell_size
+        self._cells: Dict[Cell, Set[Hashable]] = {}
+        self._objects: Dict[Hashable, Tuple[pygame.Rect, Tuple[int, int, int, int]]] = {}
+
+    def _cell_range(self, rect: pygame.Rect) -> Tuple[int, int, int, int]:
+        size = self.cell_size
+        # right/bottom son exclusivos en pygame.Rect
+        return (rect.left // size, rect.top // size,
+                (rect.right - 1) // size if rect.width else rect.left // size,
+                (rect.bottom - 1) // size if rect.height else rect.top // size)
+
+    @staticmethod
+    def _iter_cells(cell_range: Tuple[int, int, int, int]) -> Iterable[Cell]:
+        x0, y0, x1, y1 = cell_range
+        for cy in range(y0, y1 + 1):
+            for cx in range(x0, x1 + 1):
+                yield cx, cy
+
+    def __len__(self) -> int:
+        return len(self._objects)
+
+    def __contains__(self, obj: Hashable) -> bool:
+        return obj in self._objects
+
+    def insert(self, obj: Hashable, rect: pygame.Rect) -> None:
+        """Registra un objeto con su rectángulo"""
+        if obj in self._objects:
+            self.move(obj, rect)
+            return
+        rect = pygame.Rect(rect)
+        cell_range = self._cell_range(rect)
+        self._objects[obj] = (rect, cell_range)
+        cells = self._cells
+        for cell in self._iter_cells(cell_range):
+            bucket = cells.get(cell)
+            if bucket is None:
+                cells[cell] = bucket = set()
+            bucket.add(obj)
+
+    def remove(self, obj: Hashable) -> None:
+        """Elimina un objeto del índice (no hace nada si no estaba)"""
+        entry = self._objects.pop(obj, None)
+        if entry is None:
+            return
+        cells = self._cells
+        for cell in self._iter_cells(entry[1]):
+            bucket = cells.get(cell)
+            if bucket is not None:
+                bucket.discard(obj)
+                if not bucket:
+                    del cells[cell]
+
+    def move(self, obj: Hashable, rect: pygame.Rect) -> None:
+        """Actualiza el rectángulo de un objeto tocando solo las celdas que cambian"""
+        entry = self._objects.get(obj)
+        if entry is None:
+            self.insert(obj, rect)
+            return
+        rect = pygame.Rect(rect)
+        old_range = entry[1]
+        new_range = self._cell_range(rect)
+        self._objects[obj] = (rect, new_range)
+        if old_range == new_range:
+            return
+        cells = self._cells
+        old_cells = set(self._iter_cells(old_range))
+        new_cells = set(self._iter_cells(new_range))
+        for cell in old_cells - new_cells:
+            bucket = cells.get(cell)
+            if bucket is not None:
+                bucket.discard(obj)
+                if not bucket:
+                    del cells[cell]
+        for cell in new_cells - old_cells:
+            bucket = cells.get(cell)
+            if bucket is None:
+                cells[cell] = bucket = set()
+            bucket.add(obj)
+
+    def get_rect(self, obj: Hashable) -> pygame.Rect:
+        return self._objects[obj][0]
+
+    def query_rect(self, rect: pygame.Rect) -> Set[Hashable]:
+        """Devuelve los objetos cuyo rectángulo intersecta el dado"""
+        rect = pygame.Rect(rect)
+        objects = self._objects
+        found: Set[Hashable] = set()
+        for cell in self._iter_cells(self._cell_range(rect)):
+            bucket = self._cells.get(cell)
+            if bucket:
+                found.update(bucket)
+        return {obj for obj in found if _intersects(objects[obj][0], rect)}
+
+    def query_point(self, point: Tuple[float, float]) -> List[Hashable]:
+        """Devuelve los objetos que contienen el punto"""
+        size = self.cell_size
+        bucket = self._cells.get((int(point[0] // size), int(point[1] // size)))
+        if not bucket:
+            return []
+        objects = self._objects
+        return [obj for obj in bucket if objects[obj][0].collidepoint(point)]
+
+    def query_radius(self, center: Tuple[float, float], radius: float) -> List[Hashable]:
+        """Devuelve los objetos a una distancia menor o igual que radius del centro"""
+        area = pygame.Rect(int(center[0] - radius), int(center[1] - radius),
+                           int(radius * 2) + 2, int(radius * 2) + 2)
+        objects = self._objects
+        return [obj for obj in self.query_rect(area)
+                if _distance_to_rect(center, objects[obj][0]) <= radius]
+
+    def nearest(self, point: Tuple[float, float],
+                max_distance: Optional[float] = None,
+                predicate: Optional[Callable[[Hashable], bool]] = None) -> Optional[Hashable]:
+        """Devuelve el objeto más cercano al punto recorriendo anillos de celdas"""
+        if not self._objects:
+            return None
+        size = self.cell_size
+        px, py = int(point[0] // size), int(point[1] // size)
+        if max_distance is not None:
+            max_ring = int(max_distance // size) + 1
+        else:
+            max_ring = max(max(abs(cx - px), abs(cy - py)) for cx, cy in self._cells)
+
+        objects = self._objects
+        best, best_distance = None, math.inf
+        seen: Set[Hashable] = set()
+        for ring in range(max_ring + 1):
+            for cell in self._iter_ring(px, py, ring):
+                bucket = self._cells.get(cell)
+                if not bucket:
+                    continue
+                for obj in bucket:
+                    if obj in seen:
+                        continue
+                    seen.add(obj)
+                    if predicate is not None and not predicate(obj):
+                        continue
+                    distance = _distance_to_rect(point, objects[obj][0])
+                    if distance < best_distance:
+                        best, best_distance = obj, distance
+            # Cualquier objeto en anillos más lejanos está al menos a ring * size
+            if best is not None and best_distance <= ring * size:
+                break
+
+        if max_distance is not None and best_distance > max_distance:
+            return None
+        return best
+
+    @staticmethod
+    def _iter_ring(cx: int, cy: int, ring: int) -> Iterable[Cell]:
+        if ring == 0:
+            yield cx, cy
+            return
+        for x in range(cx - ring, cx + ring + 1):
+            yield x, cy - ring
+            yield x, cy + ring
+        for y in range(cy - ring + 1, cy + ring):
+            yield cx - ring, y
+            yield cx + ring, y
+
+    def clear(self) -> None:
+        self._cells.clear()
+        self._objects.clear()
@@ -0,0 +1,206 @@
+import queue
+import threading
+import pygame
+from itertools import count
+from typing import Dict, FrozenSet, Optional, Set, Tuple
+from config.constants import STREAM_MEMORY_BUDGET, STREAM_PREFETCH_RADIUS
+from .tilemap import TileMap
+from ..graphics.camera import Camera
+
+ChunkKey = Tuple[int, int]
+
+class StreamingTileMap(TileMap):
+    """TileMap que solo mantiene horneados los chunks cercanos a la cámara.
+
+    Cada frame se piden los chunks de la vista más prefetch_radius chunks
+    alrededor; un hilo de fondo los hornea (los más cercanos primero) y el
+    hilo principal los recoge en render() sin esperar. Los chunks que quedan
+    más lejos que prefetch_radius + 1 se liberan. Solo se piden los chunks que
+    caben en memory_budget (los más cercanos primero, los visibles siempre) y,
+    si los residentes lo superan, se liberan primero los más lejanos que ya no
+    se piden.
+    """
+    bake_on_load = False
+
+    def __init__(self, width: int, height: int,
+                 camera: Optional[Camera] = None,
+                 prefetch_radius: int = STREAM_PREFETCH_RADIUS,
+                 memory_budget: int = STREAM_MEMORY_BUDGET,
+                 **kwargs):
+        super().__init__(width, height, **kwargs)
+        # Sin cámara se usa el área de dibujo de cada render como vista
+        self.camera = camera
+        self.prefetch_radius = prefetch_radius
+        self.memory_budget = memory_budget
+        self.resident_bytes = 0
+        self.loads = 0
+        self.unloads = 0
+        self._chunk_bytes: Dict[ChunkKey, int] = {}
+        # Chunks pedidos al hilo de fondo que aún no han llegado
+        self._pending: Set[ChunkKey] = set()
+        # Chunks que interesan ahora; el hilo descarta las peticiones que ya no están
+        self._wanted: FrozenSet[ChunkKey] = frozenset()
+        # Cambia al re-escalar: los resultados de otra generación se ignoran
+        self._generation = 0
+        self._sequence = count()
+        self._requests: "queue.PriorityQueue" = queue.PriorityQueue()
+        self._results: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._worker = threading.Thread(target=self._work, name="chunk-streamer", daemon=True)
+        self._worker.start()
+
+    def _work(self) -> None:
+        """Hilo de fondo: hornea los chunks pedidos por orden de distancia"""
+        while True:
+            _, _, key, generation = self._requests.get()
+            if key is None:
+                return
+            if generation != self._generation or key not in self._wanted:
+                self._results.put((key, generation, None, False))
+                continue
+            self._results.put((key, generation, self._bake_chunk(*key), True))
+
+    def close(self) -> None:
+        """Detiene el hilo de fondo"""
+        self._requests.put((-1, -1, None, 0))
+
+    def _visible_range(self, view: pygame.Rect) -> Optional[Tuple[int, int, int, int]]:
+        visible = list(self.get_visible_chunks(view))
+        if not visible:
+            return None
+        (cx0, cy0), (cx1, cy1) = visible[0], visible[-1]
+        return cx0, cy0, cx1, cy1
+
+    @staticmethod
+    def _distance(key: ChunkKey, visible: Tuple[int, int, int, int]) -> int:
+        """Distancia en chunks al rectángulo visible (0 si es visible)"""
+        cx0, cy0, cx1, cy1 = visible
+        return max(cx0 - key[0], key[0] - cx1, cy0 - key[1], key[1] - cy1, 0)
+
+    def stream(self, view: pygame.Rect) -> None:
+        """Recoge los chunks ya horneados, pide los que faltan y libera los lejanos"""
+        self._collect()
+        visible = self._visible_range(view)
+        if visible is None:
+            return
+        cx0, cy0, cx1, cy1 = visible
+        radius = self.prefetch_radius
+        wanted: Dict[ChunkKey, int] = {}
+        for cy in range(max(0, cy0 - radius), min(self.chunks_y - 1, cy1 + radius) + 1):
+            for cx in range(max(0, cx0 - radius), min(self.chunks_x - 1, cx1 + radius) + 1):
+                wanted[(cx, cy)] = self._distance((cx, cy), visible)
+        wanted = self._trim_to_budget(wanted)
+        self._wanted = frozenset(wanted)
+
+        for key, distance in wanted.items():
+            if key not in self._chunks and key not in self._pending:
+                self._pending.add(key)
+                self._requests.put((distance, next(self._sequence), key, self._generation))
+
+        # Margen de un chunk para no cargar y liberar en bucle en el borde
+        for key in [key for key in self._chunks if self._distance(key, visible) > radius + 1]:
+            self._unload(key)
+
+        if self.resident_bytes > self.memory_budget:
+            # Solo se liberan los que ya no se piden: los pedidos caben en el presupuesto
+            by_distance = sorted((key for key in self._chunks if key not in wanted),
+                                 key=lambda key: self._distance(key, visible), reverse=True)
+            for key in by_distance:
+                if self.resident_bytes <= self.memory_budget:
+                    break
+                self._unload(key)
+
+    def _trim_to_budget(self, wanted: Dict[ChunkKey, int]) -> Dict[ChunkKey, int]:
+        """Los chunks pedidos que caben en memory_budget, los más cercanos primero.
+        Los visibles se piden siempre. Sin este recorte un chunk liberado por el
+        presupuesto se volvería a pedir en el frame siguiente"""
+        # Los que no están horneados cuentan como un chunk lleno (cota superior)
+        edge = self._edge(self.chunk_size)
+        estimate = edge * edge * 4
+        kept: Dict[ChunkKey, int] = {}
+        total = 0
+        for key, distance in sorted(wanted.items(), key=lambda item: item[1]):
+            cost = self._chunk_bytes.get(key, 0) if key in self._chunks else estimate
+            if distance > 0 and total + cost > self.memory_budget:
+                break
+            kept[key] = distance
+            total += cost
+        return kept
+
+    def _collect(self) -> None:
+        while True:
+            try:
+                key, generation, chunk, baked = self._results.get_nowait()
+            except queue.Empty:
+                return
+            if generation != self._generation:
+                continue
+            self._pending.discard(key)
+            if baked:
+                self._store(key, chunk)
+                self.loads += 1
+
+    def _store(self, key: ChunkKey, chunk) -> None:
+        self.resident_bytes -= self._chunk_bytes.pop(key, 0)
+        self._chunks[key] = chunk
+        if chunk is not None:
+            surface = chunk[0]
+            self._chunk_bytes[key] = surface.get_pitch() * surface.get_height()
+            self.resident_bytes += self._chunk_bytes[key]
+
+    def _unload(self, key: ChunkKey) -> None:
+        del self._chunks[key]
+        self.resident_bytes -= self._chunk_bytes.pop(key, 0)
+        self.unloads += 1
+
+    def _rebake_dirty(self) -> None:
+        """Solo se re-hornean los chunks residentes; los que están en camino se
+        re-hornean al llegar (pueden traer los tiles de antes de la edición)"""
+        still_dirty = set()
+        for key in self._dirty_chunks:
+            if key in self._pending:
+                still_dirty.add(key)
+            elif key in self._chunks:
+                self._store(key, self._bake_chunk(*key))
+        self._dirty_chunks = still_dirty
+
+    def set_render_scale(self, scale: float) -> None:
+        """Descarta los chunks horneados; se vuelven a pedir a la nueva escala"""
+        if scale == self.render_scale:
+            return
+        super().set_render_scale(scale)
+        self._generation += 1
+        self._chunks.clear()
+        self._chunk_bytes.clear()
+        self._pending.clear()
+        self._dirty_chunks.clear()
+        self.resident_bytes = 0
+
+    def wait_until_loaded(self, timeout: float = 5.0) -> bool:
+        """Espera a que lleguen los chunks pedidos (pantallas de carga, pruebas)"""
+        try:
+            while self._pending:
+                key, generation, chunk, baked = self._results.get(timeout=timeout)
+                self._results.put((key, generation, chunk, baked))
+                self._collect()
+        except queue.Empty:
+            return False
+        return True
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "resident_chunks": len(self._chunks),
+            "resident_bytes": self.resident_bytes,
+            "pending": len(self._pending),
+            "loads": self.loads,
+            "unloads": self.unloads,
+        }
+
+    def render(self, surface: pygame.Surface, offset: Tuple[float, float] = (0, 0),
+               alpha: float = 1.0) -> None:
+        if not self.visible:
+            return
+        if self.camera is not None:
+            self.stream(self.camera.get_view_rect())
+        else:
+            self.stream(self._get_drawn_view(surface, offset))
+        super().render(surface, offset, alpha)
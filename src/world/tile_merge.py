@@ -0,0 +1,202 @@
+"""Fusión de tiles en el menor número de rectángulos (greedy meshing).
+
+Cada chunk del nivel se reduce a rectángulos de tiles del mismo tipo: se
+recorre fila a fila, cada tile libre se extiende primero a lo ancho y luego
+hacia abajo mientras la fila completa siga siendo del mismo tipo. El
+resultado se guarda por chunk y se invalida al editar uno de sus tiles;
+después los rectángulos que continúan en el chunk vecino con el mismo alto
+(o ancho) se unen, así que un suelo de 1500 tiles queda en un solo
+rectángulo. Una edición solo vuelve a fusionar su chunk y los rectángulos
+unidos que lo tocan.
+"""
+import math
+from typing import Callable, Collection, Dict, Hashable, List, NamedTuple, Optional, Set, Tuple
+import pygame
+from .level_format import Level
+from .spatial_hash import SpatialHash
+from .tilemap import EMPTY_TILE
+
+class TileRect(NamedTuple):
+    """Rectángulo de tiles del mismo tipo, en celdas"""
+    col: int
+    row: int
+    width: int
+    height: int
+    kind: Hashable
+
+def _default_kind(tile: int) -> Optional[Hashable]:
+    # Sin clasificador, cualquier tile no vacío es sólido
+    return None if tile == EMPTY_TILE else "solid"
+
+def merge_tiles(tiles, level_width: int, col0: int, row0: int, width: int, height: int,
+                kind: Callable[[int], Optional[Hashable]] = _default_kind,
+                flat_kinds: Collection[Hashable] = ()) -> List[TileRect]:
+    """Rectángulos mínimos (greedy) que cubren los tiles de la región.
+    kind da el tipo de cada tile; los de tipo None no se incluyen. Los tipos
+    de flat_kinds (plataformas de un sentido) no se unen en vertical: cada
+    fila conserva su borde superior"""
+    kinds = [[kind(tiles[(row0 + y) * level_width + col0 + x]) for x in range(width)]
+             for y in range(height)]
+    used = [[False] * width for _ in range(height)]
+    rects = []
+    for y in range(height):
+        row_kinds, row_used = kinds[y], used[y]
+        x = 0
+        while x < width:
+            current = row_kinds[x]
+            if current is None or row_used[x]:
+                x += 1
+                continue
+            end = x + 1
+            while end < width and row_kinds[end] == current and not row_used[end]:
+                end += 1
+            bottom = y + 1
+            while current not in flat_kinds and bottom < height and all(
+                    kinds[bottom][i] == current and not used[bottom][i] for i in range(x, end)):
+                bottom += 1
+            for i in range(y, bottom):
+                used[i][x:end] = [True] * (end - x)
+            rects.append(TileRect(col0 + x, row0 + y, end - x, bottom - y, current))
+            x = end
+    return rects
+
+def _stitch(rects: List[TileRect], flat_kinds: Collection[Hashable] = ()) -> List[TileRect]:
+    """Une los rectángulos contiguos que cortaron los bordes de chunk"""
+    merged: List[TileRect] = []
+    for rect in sorted(rects, key=lambda r: (str(r.kind), r.row, r.height, r.col)):
+        last = merged[-1] if merged else None
+        if (last is not None and last.kind == rect.kind and last.row == rect.row
+                and last.height == rect.height and last.col + last.width == rect.col):
+            merged[-1] = last._replace(width=last.width + rect.width)
+        else:
+            merged.append(rect)
+    stitched: List[TileRect] = []
+    for rect in sorted(merged, key=lambda r: (str(r.kind), r.col, r.width, r.row)):
+        last = stitched[-1] if stitched else None
+        if (last is not None and last.kind == rect.kind and rect.kind not in flat_kinds
+                and last.col == rect.col and last.width == rect.width and last.row + last.height == rect.row):
+            stitched[-1] = last._replace(height=last.height + rect.height)
+        else:
+            stitched.append(rect)
+    return stitched
+
+def _subtract(rect: TileRect, col0: int, row0: int, width: int, height: int) -> List[TileRect]:
+    """Las partes de rect fuera del área dada (hasta cuatro rectángulos)"""
+    col1, row1 = col0 + width, row0 + height
+    right, bottom = rect.col + rect.width, rect.row + rect.height
+    if rect.col >= col1 or right <= col0 or rect.row >= row1 or bottom <= row0:
+        return [rect]
+    pieces = []
+    if rect.col < col0:
+        pieces.append(rect._replace(width=col0 - rect.col))
+    if right > col1:
+        pieces.append(rect._replace(col=col1, width=right - col1))
+    left, inner_right = max(rect.col, col0), min(right, col1)
+    if rect.row < row0:
+        pieces.append(TileRect(left, rect.row, inner_right - left, row0 - rect.row, rect.kind))
+    if bottom > row1:
+        pieces.append(TileRect(left, row1, inner_right - left, bottom - row1, rect.kind))
+    return pieces
+
+def _tile_area(rect: TileRect) -> pygame.Rect:
+    return pygame.Rect(rect.col, rect.row, rect.width, rect.height)
+
+class MergedTiles:
+    """Rectángulos fusionados de una capa del nivel con caché por chunk.
+
+    invalidate(col, row) descarta solo el chunk editado. En la siguiente
+    consulta se vuelve a fusionar ese chunk y solo los rectángulos unidos que
+    lo tocan se recortan y se vuelven a unir con él; el índice espacial (en
+    tiles) se actualiza únicamente para esos rectángulos.
+    """
+
+    def __init__(self, level: Level, kind: Callable[[int], Optional[Hashable]] = _default_kind,
+                 layer: str = "tiles", flat_kinds: Collection[Hashable] = ()):
+        self.level = level
+        self.kind = kind
+        self.flat_kinds = frozenset(flat_kinds)
+        self.layer = layer
+        self._chunks: Dict[Tuple[int, int], List[TileRect]] = {}
+        # Rectángulos unidos (dict como conjunto ordenado) y su índice en tiles
+        self._rects: Optional[Dict[TileRect, None]] = None
+        self._index = SpatialHash(level.chunk_size)
+        self._dirty: Set[Tuple[int, int]] = set()
+
+    def chunk_rects(self, cx: int, cy: int) -> List[TileRect]:
+        """Rectángulos del chunk (sin unir con los vecinos), calculados una vez"""
+        rects = self._chunks.get((cx, cy))
+        if rects is None:
+            level = self.level
+            col0, row0, width, height = level.chunk_bounds(cx, cy)
+            rects = self._chunks[(cx, cy)] = merge_tiles(
+                level.layers[self.layer], level.width, col0, row0, width, height, self.kind,
+                self.flat_kinds)
+        return rects
+
+    def _update(self) -> Dict[TileRect, None]:
+        """Construye los rectángulos unidos o aplica las ediciones pendientes"""
+        if self._rects is None:
+            chunks_x, chunks_y = self.level.chunk_count()
+            self._rects = dict.fromkeys(_stitch(
+                [rect for cy in range(chunks_y) for cx in range(chunks_x)
+                 for rect in self.chunk_rects(cx, cy)], self.flat_kinds))
+            self._index.clear()
+            for rect in self._rects:
+                self._index.insert(rect, _tile_area(rect))
+            self._dirty.clear()
+        while self._dirty:
+            self._rebuild_chunk(*self._dirty.pop())
+        return self._rects
+
+    def _rebuild_chunk(self, cx: int, cy: int) -> None:
+        """Sustituye lo que había en el chunk por sus rectángulos nuevos y vuelve
+        a unir solo los rectángulos que lo tocan (también los adyacentes)"""
+        col0, row0, width, height = self.level.chunk_bounds(cx, cy)
+        touching = self._index.query_rect(pygame.Rect(col0 - 1, row0 - 1, width + 2, height + 2))
+        pieces = list(self.chunk_rects(cx, cy))
+        for rect in touching:
+            del self._rects[rect]
+            self._index.remove(rect)
+            pieces.extend(_subtract(rect, col0, row0, width, height))
+        for rect in _stitch(pieces, self.flat_kinds):
+            self._rects[rect] = None
+            self._index.insert(rect, _tile_area(rect))
+
+    def rects(self) -> List[TileRect]:
+        """Todos los rectángulos del nivel, unidos a través de los bordes de chunk"""
+        return list(self._update())
+
+    def invalidate(self, col: int, row: int) -> None:
+        """Llamar tras editar el tile (col, row)"""
+        size = self.level.chunk_size
+        key = (col // size, row // size)
+        self._chunks.pop(key, None)
+        if self._rects is not None:
+            self._dirty.add(key)
+
+    def invalidate_all(self) -> None:
+        self._chunks.clear()
+        self._rects = None
+        self._dirty.clear()
+
+    def query(self, rect: pygame.Rect, tile_size: int,
+              origin: Tuple[float, float] = (0, 0)) -> List[Tuple[pygame.Rect, Hashable]]:
+        """Rectángulos del mundo (y su tipo) que intersectan rect; para broad-phase"""
+        self._update()
+        left = math.floor((rect.left - origin[0]) / tile_size)
+        top = math.floor((rect.top - origin[1]) / tile_size)
+        right = math.ceil((rect.right - origin[0]) / tile_size)
+        bottom = math.ceil((rect.bottom - origin[1]) / tile_size)
+        found = []
+        for tile_rect in self._index.query_rect(pygame.Rect(left, top, right - left, bottom - top)):
+            world = self.to_world(tile_rect, tile_size, origin)
+            if world.colliderect(rect):
+                found.append((world, tile_rect.kind))
+        return found
+
+    @staticmethod
+    def to_world(tile_rect: TileRect, tile_size: int,
+                 origin: Tuple[float, float] = (0, 0)) -> pygame.Rect:
+        return pygame.Rect(round(origin[0] + tile_rect.col * tile_size),
+                           round(origin[1] + tile_rect.row * tile_size),
+                           tile_rect.width * tile_size, tile_rect.height * tile_size)
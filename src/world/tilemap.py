@@ -0,0 +1,186 @@
+import pygame
+from array import array
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from ..graphics.renderable import Renderable
+from ..graphics.asset_manager import get_asset_manager
+
+EMPTY_TILE = 0
+
+class TileMap(Renderable):
+    """Capa de tiles estáticos horneados en chunks.
+
+    Los tiles se guardan en un array plano (fila por fila) y se pintan una sola
+    vez en superficies de chunk_size x chunk_size tiles. Al renderizar solo se
+    hace un blit por chunk visible; editar un tile re-hornea únicamente su chunk.
+    """
+    # from_level hornea todo el mapa al crearlo
+    bake_on_load = True
+
+    def __init__(self, width: int, height: int,
+                 tile_size: int = 50,
+                 tileset: Optional[Dict[int, str]] = None,
+                 default_texture: Optional[str] = None,
+                 chunk_size: int = 16,
+                 position: Tuple[float, float] = (0, 0),
+                 z_index: int = 0,
+                 tiles: Optional[array] = None):
+        super().__init__(position, z_index)
+        self.width = width
+        self.height = height
+        self.tile_size = tile_size
+        self.tileset = tileset or {}
+        self.default_texture = default_texture
+        self.chunk_size = chunk_size
+        if tiles is None:
+            tiles = array('h', [EMPTY_TILE]) * (width * height)
+        self.tiles = tiles
+        self.chunks_x = (width + chunk_size - 1) // chunk_size
+        self.chunks_y = (height + chunk_size - 1) // chunk_size
+        # Cada chunk guarda su superficie recortada a los tiles ocupados y el
+        # desplazamiento de ese recorte; None indica un chunk vacío
+        self._chunks: Dict[Tuple[int, int], Optional[Tuple[pygame.Surface, Tuple[int, int]]]] = {}
+        self._dirty_chunks: Set[Tuple[int, int]] = set()
+
+    @classmethod
+    def from_level(cls, level, layer: str = "tiles", **kwargs) -> 'TileMap':
+        """Crea el mapa sobre una capa de un Level (comparte su array, sin copiarlo)"""
+        kwargs.setdefault("chunk_size", level.chunk_size)
+        tilemap = cls(level.width, level.height, tiles=level.layers[layer], **kwargs)
+        if tilemap.bake_on_load:
+            tilemap.bake_all()
+        return tilemap
+
+    def get_tile(self, col: int, row: int) -> int:
+        if 0 <= col < self.width and 0 <= row < self.height:
+            return self.tiles[row * self.width + col]
+        return EMPTY_TILE
+
+    def set_tile(self, col: int, row: int, tile: int) -> None:
+        """Cambia un tile y marca su chunk para re-hornearlo"""
+        if not (0 <= col < self.width and 0 <= row < self.height):
+            return
+        index = row * self.width + col
+        if self.tiles[index] != tile:
+            self.tiles[index] = tile
+            self._dirty_chunks.add((col // self.chunk_size, row // self.chunk_size))
+            self.mark_dirty()
+
+    def get_pixel_rect(self) -> pygame.Rect:
+        """Área del mundo que ocupa el mapa completo"""
+        return pygame.Rect(int(self.position[0]), int(self.position[1]),
+                           self.width * self.tile_size, self.height * self.tile_size)
+
+    def get_bounds(self) -> pygame.Rect:
+        """El mapa completo: para el culling y los rectángulos sucios al editar un tile"""
+        return self.get_pixel_rect()
+
+    def set_render_scale(self, scale: float) -> None:
+        """Re-hornea los chunks a la resolución de salida"""
+        if scale == self.render_scale:
+            return
+        self.render_scale = scale
+        if self._chunks:
+            self._dirty_chunks.update(self._chunks.keys())
+
+    def get_texture(self, tile: int) -> Optional[str]:
+        return self.tileset.get(tile, self.default_texture)
+
+    def bake_all(self) -> None:
+        """Hornea todos los chunks (normalmente al cargar el nivel)"""
+        self._dirty_chunks.clear()
+        for cy in range(self.chunks_y):
+            for cx in range(self.chunks_x):
+                self._chunks[(cx, cy)] = self._bake_chunk(cx, cy)
+
+    def _edge(self, index: int) -> int:
+        """Borde del tile index (columna o fila) en píxeles de salida, relativo al
+        origen del mapa. Se redondea la posición exacta y no el tamaño del tile,
+        así que con escalas no enteras los tiles no se desvían de los sprites"""
+        return round(index * self.tile_size * self.render_scale)
+
+    def _bake_chunk(self, cx: int, cy: int) -> Optional[Tuple[pygame.Surface, Tuple[int, int]]]:
+        """Pinta los tiles de un chunk en una única superficie recortada"""
+        size = self.chunk_size
+        col0, row0 = cx * size, cy * size
+        cols = min(size, self.width - col0)
+        rows = min(size, self.height - row0)
+        # Bordes de cada tile relativos al chunk; los tamaños pueden variar en un píxel
+        xs = [self._edge(col0 + x) - self._edge(col0) for x in range(cols + 1)]
+        ys = [self._edge(row0 + y) - self._edge(row0) for y in range(rows + 1)]
+
+        assets = get_asset_manager()
+        sprites: Dict[Tuple[int, int, int], Optional[pygame.Surface]] = {}
+        blits: List[Tuple[pygame.Surface, Tuple[int, int]]] = []
+        for y in range(rows):
+            base = (row0 + y) * self.width + col0
+            height = max(1, ys[y + 1] - ys[y])
+            for x in range(cols):
+                tile = self.tiles[base + x]
+                if tile == EMPTY_TILE:
+                    continue
+                key = (tile, max(1, xs[x + 1] - xs[x]), height)
+                if key not in sprites:
+                    texture = self.get_texture(tile)
+                    sprites[key] = (assets.get_scaled(texture, key[1:])
+                                    if texture is not None else None)
+                sprite = sprites[key]
+                if sprite is None:
+                    continue
+                blits.append((sprite, (xs[x], ys[y])))
+
+        if not blits:
+            return None
+        # Recortar al rectángulo ocupado: un suelo de una fila no necesita un chunk entero
+        rects = [pygame.Rect(dest, sprite.get_size()) for sprite, dest in blits]
+        bounds = rects[0].unionall(rects)
+        surface = pygame.Surface(bounds.size, pygame.SRCALPHA)
+        surface.blits([(sprite, (x - bounds.x, y - bounds.y)) for sprite, (x, y) in blits],
+                      doreturn=False)
+        return surface, bounds.topleft
+
+    def _rebake_dirty(self) -> None:
+        for key in self._dirty_chunks:
+            self._chunks[key] = self._bake_chunk(*key)
+        self._dirty_chunks.clear()
+
+    def get_visible_chunks(self, view: pygame.Rect) -> Iterable[Tuple[int, int]]:
+        """Devuelve las coordenadas de los chunks que intersectan la vista"""
+        chunk_pixels = self.chunk_size * self.tile_size
+        left = view.left - self.position[0]
+        top = view.top - self.position[1]
+        cx0 = max(0, int(left // chunk_pixels))
+        cy0 = max(0, int(top // chunk_pixels))
+        cx1 = min(self.chunks_x - 1, int((left + view.width) // chunk_pixels))
+        cy1 = min(self.chunks_y - 1, int((top + view.height) // chunk_pixels))
+        for cy in range(cy0, cy1 + 1):
+            for cx in range(cx0, cx1 + 1):
+                yield cx, cy
+
+    def _get_drawn_view(self, surface: pygame.Surface, offset: Tuple[float, float]) -> pygame.Rect:
+        """La vista en coordenadas del mundo es el área de dibujo sin la traslación"""
+        render_scale = self.render_scale
+        clip = surface.get_clip()
+        return pygame.Rect(int((clip.x - offset[0]) / render_scale),
+                           int((clip.y - offset[1]) / render_scale),
+                           int(clip.width / render_scale) + 1,
+                           int(clip.height / render_scale) + 1)
+
+    def render(self, surface: pygame.Surface, offset: Tuple[float, float] = (0, 0),
+               alpha: float = 1.0) -> None:
+        if not self.visible:
+            return
+        if self._dirty_chunks:
+            self._rebake_dirty()
+
+        render_scale = self.render_scale
+        size = self.chunk_size
+        origin_x = self.position[0] * render_scale + offset[0]
+        origin_y = self.position[1] * render_scale + offset[1]
+        blits = []
+        for key in self.get_visible_chunks(self._get_drawn_view(surface, offset)):
+            chunk = self._chunks.get(key)
+            if chunk is not None:
+                chunk_surface, (dx, dy) = chunk
+                blits.append((chunk_surface, (origin_x + self._edge(key[0] * size) + dx,
+                                              origin_y + self._edge(key[1] * size) + dy)))
+        surface.blits(blits, doreturn=False)
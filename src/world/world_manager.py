@@ -1,28 +1,88 @@
+import pygame
+from typing import Hashable, List, Optional, Tuple
+from .spatial_hash import SpatialHash
+from .level_format import Level, load_any
+
 class World:
-    def __init__(self, name, world_data):
+    def __init__(self, name, world_data, cell_size: int = 256):
         self.name = name
-        self.entities = []
+        # dict como conjunto ordenado: inserción y borrado en O(1)
+        self.entities = {}
+        self.spatial_index = SpatialHash(cell_size)
         self.world_loaded = self.load_world_data(world_data)
         
-    def load_world_data(self, world_data):
-        """Carga los datos del mundo desde un archivo o fuente de datos"""
-        with open(world_data, 'r') as file:
-            data = file.read()
-        return data.splitlines()
+    def load_world_data(self, world_data) -> Level:
+        """Carga el nivel desde un archivo (.lvl binario, CSV o texto) o un Level ya creado"""
+        if isinstance(world_data, Level):
+            return world_data
+        return load_any(world_data)
         
-    def get_world_data(self):
-        """Devuelve los datos del mundo"""
+    def get_world_data(self) -> Level:
+        """Devuelve el nivel cargado"""
         return self.world_loaded
 
+    @property
+    def width(self) -> int:
+        return self.world_loaded.width
+
+    @property
+    def height(self) -> int:
+        return self.world_loaded.height
+
+    @property
+    def tiles(self):
+        """Rejilla de tiles como array plano de enteros (fila por fila)"""
+        return self.world_loaded.tiles
+
+    def get_tile(self, col: int, row: int) -> int:
+        return self.world_loaded.get_tile(col, row)
+
+    @staticmethod
+    def _get_entity_rect(entity) -> pygame.Rect:
+        """Rectángulo de la entidad; las entidades sin límites se tratan como puntos"""
+        get_bounds = getattr(entity, 'get_bounds', None)
+        bounds = get_bounds() if get_bounds is not None else None
+        if bounds is not None:
+            return bounds
+        x, y = entity.position
+        return pygame.Rect(int(x), int(y), 0, 0)
+
     def add_entity(self, entity):
-        self.entities.append(entity)
+        if entity in self.entities:
+            return
+        self.entities[entity] = None
+        self.spatial_index.insert(entity, self._get_entity_rect(entity))
+        # Las entidades renderizables avisan cuando se mueven
+        if hasattr(entity, 'add_change_listener'):
+            entity.add_change_listener(self.update_entity)
 
     def remove_entity(self, entity):
         if entity in self.entities:
-            self.entities.remove(entity)
+            del self.entities[entity]
+            self.spatial_index.remove(entity)
+            if hasattr(entity, 'remove_change_listener'):
+                entity.remove_change_listener(self.update_entity)
+
+    def update_entity(self, entity):
+        """Actualiza la posición de la entidad en el índice espacial"""
+        if entity in self.entities:
+            self.spatial_index.move(entity, self._get_entity_rect(entity))
 
     def get_entities(self):
-        return self.entities
+        return list(self.entities)
+
+    def query_region(self, rect: pygame.Rect) -> List[Hashable]:
+        """Entidades que intersectan el rectángulo"""
+        return list(self.spatial_index.query_rect(rect))
+
+    def query_radius(self, center: Tuple[float, float], radius: float) -> List[Hashable]:
+        """Entidades a menos de radius del centro"""
+        return self.spatial_index.query_radius(center, radius)
+
+    def find_nearest(self, point: Tuple[float, float], max_distance: Optional[float] = None,
+                     predicate=None):
+        """Entidad más cercana al punto (o None)"""
+        return self.spatial_index.nearest(point, max_distance, predicate)
 
     def __str__(self):
-        return f"World: {self.name}, Entities: {len(self.entities)}"
\ No newline at end of file
+        return f"World: {self.name}, Entities: {len(self.entities)}"
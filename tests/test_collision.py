@@ -0,0 +1,55 @@
+from src.world.collision import ONE_WAY, TileCollider
+from src.world.level_format import level_from_rows
+
+class Point:
+    def __init__(self, position):
+        self.position = position
+
+def test_lands_inside_stack_of_one_way_tiles():
+    # Plataformas de un sentido en las filas 2 y 3
+    level = level_from_rows(["0000", "0000", "2222", "2222", "0000"])
+    collider = TileCollider(level, tile_size=10, one_way_tiles={2})
+    entity = Point((5, 23))
+    body = collider.add_body(entity, size=(4, 4))
+    collider.move(body, 0, 10)
+    assert entity.position == (5, 28)
+    assert body.on_ground
+
+def test_one_way_rects_are_one_row_high():
+    level = level_from_rows(["2222", "2222", "1111", "1111"])
+    collider = TileCollider(level, tile_size=10, one_way_tiles={2})
+    rects = collider.merged.rects()
+    assert all(rect.height == 1 for rect in rects if rect.kind == ONE_WAY)
+    assert [rect.height for rect in rects if rect.kind != ONE_WAY] == [2]
+
+def test_diagonal_move_stops_on_top_of_corner():
+    level = level_from_rows(["000", "010", "000"])
+    collider = TileCollider(level, tile_size=10)
+    entity = Point((5, 5))
+    body = collider.add_body(entity, size=(4, 4))
+    # En x pasa por encima del tile; en y cae sobre su esquina
+    assert collider.move(body, 10, 10) == (10, 3)
+    assert entity.position == (15, 8)
+    assert body.on_ground
+
+def test_fast_mover_stops_at_thin_wall():
+    level = level_from_rows(["0001000"])
+    collider = TileCollider(level, tile_size=10)
+    entity = Point((5, 5))
+    body = collider.add_body(entity, size=(4, 4))
+    # Cruza varios tiles en un solo paso y para en la pared, sin atravesarla
+    assert collider.move(body, 50, 0) == (23, 0)
+    assert entity.position == (28, 5)
+
+def test_drop_through_one_way_platform():
+    level = level_from_rows(["0000", "2222", "0000", "1111"])
+    collider = TileCollider(level, tile_size=10, one_way_tiles={2})
+    entity = Point((5, 5))
+    body = collider.add_body(entity, size=(4, 4))
+    collider.move(body, 0, 10)
+    assert entity.position == (5, 8)
+    assert body.on_ground
+    body.drop_through = True
+    collider.move(body, 0, 30)
+    assert entity.position == (5, 28)
+    assert body.on_ground
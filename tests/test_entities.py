@@ -0,0 +1,26 @@
+import pygame
+from src.core.entities import EntityLayer, EntityStore, EntityObject
+
+def test_entity_without_visual_is_not_drawn():
+    store = EntityStore()
+    layer = EntityLayer(store)
+    EntityObject(store, (100, 100))
+    drawn = EntityObject(store, (150, 100), visual=(255, 0, 0), size=(10, 10))
+    drawn.set_rotation(45)
+    store.update(1 / 60)
+    layer.update(1 / 60)
+    surface = pygame.Surface((200, 200))
+    # Antes fallaba al pasar el sprite None a blits()
+    layer.render(surface)
+    assert surface.get_at((150, 100))[:3] == (255, 0, 0)
+    assert layer.get_bounds().collidepoint(150, 100)
+    assert not layer.get_bounds().collidepoint(100, 100)
+
+def test_set_visual_makes_entity_drawable():
+    store = EntityStore()
+    layer = EntityLayer(store)
+    entity = EntityObject(store, (20, 20))
+    entity.set_color((0, 255, 0))
+    surface = pygame.Surface((40, 40))
+    layer.render(surface)
+    assert surface.get_at((20, 20))[:3] == (0, 255, 0)